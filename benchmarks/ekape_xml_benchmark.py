@@ -0,0 +1,87 @@
+# benchmarks/ekape_xml_benchmark.py
+"""
+축산물이력제 XML 파싱 마이크로 벤치마크
+
+fixtures/ekape/*.xml 응답을 기존 방식(response.text 디코딩 + ET.fromstring 트리 생성)과
+services.ekape_xml.parse_trace_items(바이트 증분 파싱 + 필요한 필드만 추출)로 파싱하여
+응답 1건당 CPU 시간과 최대 메모리 할당량을 비교한다.
+
+측정 결과 (2000회 반복, 합성 fixture 기준 - 실제 응답 녹화본 아님):
+- CPU 시간은 줄지 않는다. 증분 파싱이 같거나 조금 느리다 (option_2 63.5 → 69.6µs, option_1 26.7 → 32.3µs)
+- 최대 할당량은 item이 여러 개인 응답에서만 줄어든다 (option_2 29.4 → 25.6KB, 약 13%).
+  데이터 없음/오류 응답처럼 작은 응답은 오히려 약 1KB 늘어난다
+- 즉 이득은 속도가 아니라 큰 응답의 최대 메모리와 캐시에 남는 item 크기(사용 필드만 보관)이다.
+  측정 차이가 실행마다 흔들리는 수준이므로 수치는 매번 다시 측정해서 볼 것
+
+실행: python -m benchmarks.ekape_xml_benchmark [반복 횟수]
+"""
+
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.ekape_xml import parse_trace_items  # noqa: E402
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "ekape"
+
+
+def legacy_parse(body: bytes):
+    """기존 파서 (routers/livestock_trace.py 변경 전 로직)"""
+    root = ET.fromstring(body.decode("utf-8"))
+    header = root.find('header')
+    if header is not None:
+        result_code = header.find('resultCode')
+        if result_code is not None and result_code.text != "00":
+            return None
+    items = root.find('.//items')
+    if items is None:
+        return []
+    item_list = []
+    for item in items.findall('item'):
+        item_data = {}
+        for element in item:
+            if element.text:
+                item_data[element.tag] = element.text.strip()
+        item_list.append(item_data)
+    return item_list
+
+
+def cpu_per_call_us(parse, body: bytes, iterations: int) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        parse(body)
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def peak_alloc_kb(parse, body: bytes) -> float:
+    tracemalloc.start()
+    parse(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main(iterations: int = 2000) -> None:
+    print(f"{'fixture':<18}{'bytes':>7}{'legacy µs':>12}{'stream µs':>12}{'legacy KB':>12}{'stream KB':>12}")
+    for path in sorted(FIXTURE_DIR.glob("*.xml")):
+        body = path.read_bytes()
+        legacy = legacy_parse(body)
+        streamed = parse_trace_items(body)
+        # 추출 결과가 기존 파서 결과의 부분집합인지 확인 (사용하는 필드만 남김)
+        assert (legacy is None) == (streamed is None), path.name
+        for old_item, new_item in zip(legacy or [], streamed or []):
+            assert all(old_item.get(key) == value for key, value in new_item.items()), path.name
+
+        print(f"{path.stem:<18}{len(body):>7}"
+              f"{cpu_per_call_us(legacy_parse, body, iterations):>12.1f}"
+              f"{cpu_per_call_us(parse_trace_items, body, iterations):>12.1f}"
+              f"{peak_alloc_kb(legacy_parse, body):>12.1f}"
+              f"{peak_alloc_kb(parse_trace_items, body):>12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
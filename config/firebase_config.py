@@ -1,5 +1,6 @@
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, firestore_async
+import asyncio
 import os
 import json
 from dotenv import load_dotenv
@@ -65,3 +66,22 @@ def get_firestore_client():
         raise ValueError("Firebase가 초기화되지 않았습니다.")
     return db
 
+# 비동기 Firestore 클라이언트 (async 엔드포인트 전용, 최초 사용 시 생성)
+_async_db = None
+
+def get_async_firestore_client():
+    """비동기 Firestore 클라이언트(AsyncClient) 반환 - 이벤트 루프를 막지 않음"""
+    global _async_db
+    if db is None:
+        raise ValueError("Firebase가 초기화되지 않았습니다.")
+    if _async_db is None:
+        _async_db = firestore_async.client()
+    return _async_db
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    동기 Firestore 호출을 스레드풀에서 실행
+    
+    async 엔드포인트에서 아직 AsyncClient로 옮기지 않은 동기 서비스 메서드를 호출할 때 사용
+    """
+    return await asyncio.to_thread(func, *args, **kwargs)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import warnings
 from fastapi import FastAPI, Request, HTTPException
@@ -10,7 +11,9 @@ from dotenv import load_dotenv
 import uvicorn
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 import atexit
+from typing import Optional
 
 # Firestore positional arguments 경고 무시
 warnings.filterwarnings("ignore", message="Detected filter using positional arguments*")
@@ -42,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Flutter 모바일 앱 및 CORS 디버깅 미들웨어
@@ -174,6 +178,12 @@ def get_token_statistics():
     from services.firebase_user_service import FirebaseUserService
     return FirebaseUserService.get_token_statistics()
 
+@app.get("/admin/user-stats", summary="사용자 통계 조회")
+def get_user_statistics_by_auth_type():
+    """인증 타입별 활성 사용자 수 조회 (관리자용)"""
+    from services.firebase_user_service import FirebaseUserService
+    return FirebaseUserService.get_user_count_by_auth_type()
+
 @app.post("/admin/cleanup-tokens", summary="토큰 정리 실행")
 def cleanup_tokens():
     """만료된/오래된 토큰 정리 실행 (관리자용)"""
@@ -191,6 +201,65 @@ def revoke_user_tokens(user_id: str):
         "revoked_count": revoked_count
     }
 
+@app.get("/admin/cache-stats", summary="캐시 통계 조회")
+def get_cache_statistics():
+    """젖소 디렉터리 / 인증 사용자 / 축산물이력제 캐시 적중/미스 및 동시 요청 합치기 통계 조회 (관리자용)"""
+    from services.cow_directory_cache import cow_directory_cache
+    from services.auth_user_cache import auth_user_cache
+    from services.livestock_trace_cache import livestock_trace_cache
+    from services.singleflight import livestock_trace_flight
+    return {
+        "cow_directory": cow_directory_cache.stats(),
+        "auth_user": auth_user_cache.stats(),
+        "livestock_trace": livestock_trace_cache.stats(),
+        "livestock_trace_coalescing": livestock_trace_flight.stats()
+    }
+
+@app.get("/admin/job-stats", summary="백그라운드 작업 통계")
+def get_job_statistics():
+    """백그라운드 작업(축산물이력 전체 조회, 젖소 일괄 등록) 실행/대기/보관 현황 조회 (관리자용)"""
+    from services.jobs import job_manager
+    return job_manager.stats()
+
+@app.get("/admin/rag-index-stats", summary="챗봇 RAG 색인 통계")
+def get_rag_index_statistics():
+    """RAG 색인 지문/청크 수/생성 시간 및 첫 질문 처리 시간 조회 (관리자용)"""
+    from services.rag_index import rag_index
+    return rag_index.stats()
+
+@app.get("/admin/chatbot-router-stats", summary="챗봇 질문 분류 통계")
+def get_chatbot_router_statistics():
+    """로컬 사전 분류 비율, LLM 기준 정확도, 절약된 분류 시간 추정치 조회 (관리자용)"""
+    from services.chatbot_route_classifier import route_classifier
+    return route_classifier.stats()
+
+@app.get("/admin/chatbot-llm-stats", summary="챗봇 LLM 호출 통계")
+def get_chatbot_llm_statistics():
+    """공유 LLM 클라이언트/체인 생성 현황과 체인별 호출 수, 평균 지연 시간 조회 (관리자용)"""
+    from services.llm_registry import llm_registry
+    return llm_registry.stats()
+
+@app.get("/admin/password-hash-stats", summary="비밀번호 해싱 작업 풀 통계")
+def get_password_hash_statistics():
+    """bcrypt 전용 작업 풀의 대기열/처리 시간 통계 조회 (관리자용)"""
+    from services.password_hasher import password_hasher
+    return password_hasher.stats()
+
+@app.get("/admin/http-pool-stats", summary="외부 API 연결 풀 통계")
+def get_http_pool_statistics():
+    """외부 API별 요청 수/지연 시간/연결 풀 사용량 조회 (관리자용)"""
+    from services.http_clients import http_clients
+    return http_clients.stats()
+
+@app.post("/admin/rebuild-farm-stats", summary="농장 통계 카운터 재계산")
+def rebuild_farm_stats(farm_id: Optional[str] = None):
+    """farm_stats 카운터를 처음부터 다시 계산 (farm_id 생략 시 전체 농장, 관리자용)"""
+    from services.farm_stats_service import FarmStatsService
+    if farm_id:
+        FarmStatsService.rebuild_farm_stats(farm_id)
+        return {"success": True, "rebuilt_farms": 1, "failed_farms": 0}
+    return {"success": True, **FarmStatsService.rebuild_all_farm_stats()}
+
 # 자동 토큰 정리를 위한 스케줄러 설정
 def auto_cleanup_tokens_scheduled():
     """스케줄러용 자동 토큰 정리 함수"""
@@ -201,6 +270,14 @@ def auto_cleanup_tokens_scheduled():
     except Exception as e:
         print(f"[SCHEDULER ERROR] 자동 토큰 정리 실패: {str(e)}")
 
+def refresh_admin_statistics_scheduled():
+    """스케줄러에서 실행되는 관리자 통계 스냅샷 갱신 함수"""
+    try:
+        from services.firebase_user_service import FirebaseUserService
+        FirebaseUserService.refresh_admin_statistics()
+    except Exception as e:
+        print(f"[SCHEDULER ERROR] 관리자 통계 갱신 실패: {str(e)}")
+
 def setup_scheduler():
     """토큰 정리 스케줄러 설정"""
     scheduler = BackgroundScheduler()
@@ -211,6 +288,13 @@ def setup_scheduler():
         id='token_cleanup',
         name='자동 토큰 정리'
     )
+    # 관리자 통계 스냅샷 주기적 갱신 (스냅샷 유효 시간보다 짧게)
+    scheduler.add_job(
+        refresh_admin_statistics_scheduled,
+        IntervalTrigger(minutes=int(os.getenv("ADMIN_STATS_REFRESH_MINUTES", "5"))),
+        id='admin_stats_refresh',
+        name='관리자 통계 갱신'
+    )
     scheduler.start()
     print("🕰️ 자동 토큰 정리 스케줄러 시작됨 (매일 자정 실행)")
     atexit.register(lambda: scheduler.shutdown())
@@ -220,9 +304,19 @@ async def startup_event():
     """앱 시작 시 실행되는 이벤트"""
     print("🚀 BlackCows 백엔드 서버 시작 중...")
     setup_scheduler()
+    from services.http_clients import http_clients
+    http_clients.start()
+    from services.jobs import job_manager
+    await asyncio.to_thread(job_manager.fail_orphaned)
     print("✅ 서버 초기화 완료!")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """앱 종료 시 실행되는 이벤트"""
     print("🛑 BlackCows 백엔드 서버 종료 중...")
+    from services.jobs import job_manager
+    await job_manager.shutdown()
+    from services.http_clients import http_clients
+    await http_clients.aclose()
+    from services.llm_registry import llm_registry
+    await llm_registry.aclose()
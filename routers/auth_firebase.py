@@ -10,7 +10,8 @@ from schemas.user import (
 )
 from services.firebase_user_service import FirebaseUserService, ACCESS_TOKEN_EXPIRE_MINUTES
 from datetime import timedelta, datetime
-from config.firebase_config import get_firestore_client
+from config.firebase_config import get_firestore_client, run_blocking
+from services.auth_user_cache import auth_user_cache
 from pydantic import BaseModel
 from typing import Optional
 import traceback
@@ -41,40 +42,42 @@ async def mock_social_login(mock_request: dict):
             profile_image=None
         )
         
-        # 기존 사용자 확인
-        existing_user = FirebaseUserService._find_user_by_social_id(
-            social_info.social_id, 
-            AuthType(auth_type)
-        )
-        
-        current_time = datetime.utcnow()
-        
-        if existing_user:
-            # 기존 사용자 로그인
-            db.collection('users').document(existing_user["id"]).update({
-                "last_login": current_time,
-                "updated_at": current_time
-            })
-            existing_user["last_login"] = current_time
-            user_data = existing_user
-            is_new_user = False
-        else:
+        def _login_or_create_user():
+            """기존 사용자 로그인 기록 또는 신규 사용자 생성 (Firestore 동기 호출 - 스레드에서 실행)"""
+            existing_user = FirebaseUserService._find_user_by_social_id(
+                social_info.social_id, 
+                AuthType(auth_type)
+            )
+            
+            current_time = datetime.utcnow()
+            
+            if existing_user:
+                # 기존 사용자 로그인
+                db.collection('users').document(existing_user["id"]).update({
+                    "last_login": current_time,
+                    "updated_at": current_time
+                })
+                existing_user["last_login"] = current_time
+                auth_user_cache.invalidate_user(existing_user)
+                return existing_user, False
+            
             # 신규 사용자 생성
             from services.social_auth_service import SocialAuthService
             username = social_info.name
             user_id = SocialAuthService.generate_unique_user_id(social_info, AuthType(auth_type))
             farm_nickname = f"{username}의 목장 ({auth_type} 테스트)"
             
-            user_data = FirebaseUserService.create_user(
+            return FirebaseUserService.create_user(
                 username=username,
                 user_id=user_id,
                 email=social_info.email,
-                password=None,
+                hashed_password=None,
                 farm_nickname=farm_nickname,
                 auth_type=AuthType(auth_type),
                 social_id=social_info.social_id
-            )
-            is_new_user = True
+            ), True
+        
+        user_data, is_new_user = await run_blocking(_login_or_create_user)
         
         # 토큰 생성
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -82,7 +85,7 @@ async def mock_social_login(mock_request: dict):
             data={"sub": user_data["user_id"], "user_uuid": user_data["id"]},
             expires_delta=access_token_expires
         )
-        refresh_token = FirebaseUserService.create_refresh_token(user_data["id"])
+        refresh_token = await run_blocking(FirebaseUserService.create_refresh_token, user_data["id"])
         
         return {
             "access_token": access_token,
@@ -120,11 +123,14 @@ async def mock_social_login(mock_request: dict):
 
 async def register_user(user_data: UserCreate):
     """일반 회원가입 - 이메일 + 비밀번호"""
-    user = FirebaseUserService.create_user(
+    # bcrypt 해싱은 전용 작업 풀에서 실행 (대기 중 요청 스레드를 점유하지 않음)
+    hashed_password = await FirebaseUserService.get_password_hash(user_data.password)
+    user = await run_blocking(
+        FirebaseUserService.create_user,
         username=user_data.username,            # 사용자 이름/실명
         user_id=user_data.user_id,              # 로그인용 아이디
         email=user_data.email,                  # 이메일
-        password=user_data.password,            # 비밀번호
+        hashed_password=hashed_password,        # 해시된 비밀번호
         farm_nickname=user_data.farm_nickname,  # 목장 별명
         auth_type=AuthType.EMAIL                # 명시적으로 이메일 인증 타입 설정
     )
@@ -174,7 +180,7 @@ async def social_login(login_request: SocialLoginRequest):
         )
         
         # 리프레시 토큰 생성
-        refresh_token = FirebaseUserService.create_refresh_token(user_data["id"])
+        refresh_token = await run_blocking(FirebaseUserService.create_refresh_token, user_data["id"])
         
         # 사용자 정보 응답 구성
         user_response = UserResponse(
@@ -214,14 +220,14 @@ async def social_login(login_request: SocialLoginRequest):
             response_model=TokenResponse,
             summary="일반 로그인",
             description="이메일 회원가입한 사용자의 아이디와 비밀번호로 로그인합니다. 액세스 토큰을 발급받습니다.")
-def login_user(user_data: UserLogin):
+async def login_user(user_data: UserLogin):
     """일반 로그인 - user_id로 로그인"""
     # 디버깅을 위한 로그 추가
     print(f"[DEBUG] 로그인 요청 데이터: {user_data.dict()}")
     print(f"[DEBUG] user_id: '{user_data.user_id}', password: '{user_data.password}'")
     print(f"[DEBUG] user_id 타입: {type(user_data.user_id)}, password 타입: {type(user_data.password)}")
     
-    user = FirebaseUserService.authenticate_user(user_data.user_id, user_data.password)
+    user = await FirebaseUserService.authenticate_user(user_data.user_id, user_data.password)
     
     if not user:
         raise HTTPException(
@@ -238,7 +244,7 @@ def login_user(user_data: UserLogin):
     )
     
     # 리프레시 토큰 생성
-    refresh_token = FirebaseUserService.create_refresh_token(user["id"])
+    refresh_token = await run_blocking(FirebaseUserService.create_refresh_token, user["id"])
     
     # 사용자 정보 (비밀번호 제외)
     user_response = UserResponse(
@@ -383,7 +389,8 @@ def find_user_id_by_name_and_email(request: FindUserIdRequest):
 async def request_password_reset(request: PasswordResetRequest):
     """비밀번호 재설정 요청 - 이메일 계정만"""
     try:
-        user = FirebaseUserService.verify_user_for_password_reset(
+        user = await run_blocking(
+            FirebaseUserService.verify_user_for_password_reset,
             request.username, 
             request.user_id, 
             request.email
@@ -495,7 +502,7 @@ def verify_reset_token(request: dict):
 @router.post("/reset-password",
             summary="비밀번호 재설정",
             description="재설정 토큰을 사용하여 새로운 비밀번호로 변경합니다.")
-def reset_password(request: PasswordResetConfirm):
+async def reset_password(request: PasswordResetConfirm):
     """비밀번호 재설정 (간단 버전)"""
     try:
         # JWT 토큰 검증으로 사용자 정보 가져오기
@@ -515,7 +522,7 @@ def reset_password(request: PasswordResetConfirm):
                 )
             
             # 사용자 존재 확인
-            user = FirebaseUserService.get_user_by_id(user_uuid)
+            user = await run_blocking(FirebaseUserService.get_user_by_id, user_uuid)
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -539,14 +546,15 @@ def reset_password(request: PasswordResetConfirm):
         db = get_firestore_client()
         
         # 새 비밀번호 해시화
-        hashed_password = FirebaseUserService.get_password_hash(request.new_password)
+        hashed_password = await FirebaseUserService.get_password_hash(request.new_password)
         
         # Firebase DB에서 사용자 비밀번호 업데이트
-        db.collection('users').document(user_uuid).update({
+        await run_blocking(db.collection('users').document(user_uuid).update, {
             "hashed_password": hashed_password,
             "updated_at": datetime.utcnow(),
             "password_changed_at": datetime.utcnow()
         })
+        auth_user_cache.invalidate_user(user)
         
         return {
             "success": True,
@@ -665,7 +673,7 @@ def login_with_reset_token(request: TemporaryTokenLogin):
 @router.post("/change-password",
             summary="비밀번호 변경",
             description="비밀번호 재설정 토큰으로 로그인한 사용자의 비밀번호를 변경합니다.")
-def change_password(
+async def change_password(
     request: ChangePasswordRequest,
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
@@ -674,7 +682,7 @@ def change_password(
         token = credentials.credentials
         
         # 비밀번호 재설정 전용 토큰 검증
-        user = FirebaseUserService.verify_password_reset_access_token(token)
+        user = await run_blocking(FirebaseUserService.verify_password_reset_access_token, token)
         
         # 비밀번호 변경
         from config.firebase_config import get_firestore_client
@@ -682,25 +690,29 @@ def change_password(
         db = get_firestore_client()
         
         # 새 비밀번호 해시화
-        hashed_password = FirebaseUserService.get_password_hash(request.new_password)
-        
-        # Firebase DB에서 사용자 비밀번호 업데이트
-        db.collection('users').document(user["id"]).update({
-            "hashed_password": hashed_password,
-            "updated_at": datetime.utcnow(),
-            "password_changed_at": datetime.utcnow()
-        })
-        
-        # 기존 리프레시 토큰들 모두 무효화 (보안 강화)
-        refresh_tokens_ref = db.collection('refresh_tokens').where('user_id', '==', user["id"])
-        refresh_tokens = refresh_tokens_ref.get()
-        
-        for token_doc in refresh_tokens:
-            db.collection('refresh_tokens').document(token_doc.id).update({
-                "is_active": False,
-                "deactivated_at": datetime.utcnow(),
-                "deactivated_reason": "password_changed"
+        hashed_password = await FirebaseUserService.get_password_hash(request.new_password)
+        
+        def _save_password_and_revoke_tokens():
+            # Firebase DB에서 사용자 비밀번호 업데이트
+            db.collection('users').document(user["id"]).update({
+                "hashed_password": hashed_password,
+                "updated_at": datetime.utcnow(),
+                "password_changed_at": datetime.utcnow()
             })
+            auth_user_cache.invalidate_user(user)
+            
+            # 기존 리프레시 토큰들 모두 무효화 (보안 강화)
+            refresh_tokens_ref = db.collection('refresh_tokens').where('user_id', '==', user["id"])
+            refresh_tokens = refresh_tokens_ref.get()
+            
+            for token_doc in refresh_tokens:
+                db.collection('refresh_tokens').document(token_doc.id).update({
+                    "is_active": False,
+                    "deactivated_at": datetime.utcnow(),
+                    "deactivated_reason": "password_changed"
+                })
+        
+        await run_blocking(_save_password_and_revoke_tokens)
         
         return {
             "success": True,
@@ -748,6 +760,7 @@ def update_farm_name(
         }
         
         db.collection('users').document(user["id"]).update(update_data)
+        auth_user_cache.invalidate_user(user)
         
         # 업데이트된 사용자 정보 가져오기
         updated_user_doc = db.collection('users').document(user["id"]).get()
@@ -793,7 +806,7 @@ def update_farm_name(
 @router.delete("/delete-account",
               summary="회원탈퇴",
               description="사용자 계정과 모든 관련 데이터를 완전히 삭제합니다.")
-def delete_account(
+async def delete_account(
     request: DeleteAccountRequest,
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
@@ -802,10 +815,10 @@ def delete_account(
         token = credentials.credentials
         
         # 일반 액세스 토큰 검증 (로그인된 사용자)
-        user = FirebaseUserService.verify_access_token(token)
+        user = await run_blocking(FirebaseUserService.verify_access_token, token)
         
         # 계정 삭제 실행
-        result = FirebaseUserService.delete_user_account(
+        result = await FirebaseUserService.delete_user_account(
             user, 
             request.password, 
             request.confirmation
@@ -1,6 +1,9 @@
 # routers/chatbot_router.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import json
 from schemas.chatbot_schema import (
     AskRequest, AskResponse,
     CreateChatRoomRequest, ChatRoomList,
@@ -21,12 +24,55 @@ async def ask_question(data: AskRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# 1-1. 질문 → 답변 토큰 스트리밍 (Server-Sent Events) & 완료 시 저장
+@router.post("/ask/stream")
+async def ask_question_stream(data: AskRequest):
+    """
+    답변을 생성되는 대로 SSE로 전송
+
+    - event: token → {"text": 토큰}
+    - event: done → {"answer": 전체 답변} (질문/답변 저장 완료 후 전송)
+    - event: error → {"detail": 오류 메시지} (응답 헤더 전송 후 발생한 오류, 저장하지 않음)
+    """
+    return StreamingResponse(
+        _answer_events(data),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 프록시(nginx) 버퍼링 없이 바로 전달
+        }
+    )
+
+
+async def _answer_events(data: AskRequest):
+    tokens = []
+    try:
+        async for token in chatbot_service.stream_user_question(data):
+            tokens.append(token)
+            yield _sse_event("token", {"text": token})
+    except Exception as e:
+        print(f"[ERROR] 챗봇 스트리밍 답변 실패: {str(e)}")
+        yield _sse_event("error", {"detail": "답변 생성 중 오류가 발생했습니다."})
+        return
+    yield _sse_event("done", {"answer": "".join(tokens)})
+
+
+def _sse_event(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
 # 2. 사용자 채팅방 목록 조회
 @router.get("/rooms/{user_id}", response_model=ChatRoomList)
-def get_chat_rooms(user_id: str):
+def get_chat_rooms(
+    user_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None
+):
     try:
-        chats = chatbot_service.get_user_chat_rooms(user_id)
-        return ChatRoomList(chats=chats)
+        chats, next_cursor = chatbot_service.get_user_chat_rooms(user_id, limit, cursor)
+        return ChatRoomList(chats=chats, next_cursor=next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -56,10 +102,16 @@ def update_chat_room_name(chat_id: str, data: UpdateChatRoomNameRequest):
 
 # 5. 채팅방 내 대화 이력 조회
 @router.get("/history/{chat_id}", response_model=ChatHistoryResponse)
-def get_chat_history(chat_id: str):
+def get_chat_history(
+    chat_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None
+):
     try:
-        messages = chatbot_service.get_chat_history(chat_id)
-        return ChatHistoryResponse(chat_id=chat_id, messages=messages)
+        messages, next_cursor = chatbot_service.get_chat_history(chat_id, limit, cursor)
+        return ChatHistoryResponse(chat_id=chat_id, messages=messages, next_cursor=next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -78,7 +130,7 @@ def delete_chat_room(chat_id: str):
 @router.delete("/rooms/expired/auto")
 def delete_expired_chat_rooms():
     try:
-        chatbot_service.delete_old_chat_rooms()
-        return {"detail": "14일 이상된 채팅방이 삭제되었습니다."}
+        result = chatbot_service.delete_old_chat_rooms()
+        return {"detail": "14일 이상된 채팅방이 삭제되었습니다.", "deleted_count": result["deleted"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from typing import List, Optional
 from schemas.cow import CowCreate, CowResponse, CowUpdate
 from services.cow_firebase_service import CowFirebaseService
@@ -7,9 +7,13 @@ from schemas.cow import CowDetailUpdate, CowDetailResponse
 from schemas.livestock_cow import (
     CowRegisterFromLivestockTrace, 
     RegistrationStatusResponse, 
-    LivestockTraceRegistrationResponse
+    LivestockTraceRegistrationResponse,
+    BulkCowRegisterFromLivestockTrace,
+    BulkRegistrationJobResponse
 )
 from services.livestock_cow_service import LivestockCowService
+from services.bulk_cow_registration import BulkCowRegistrationService
+from services.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
@@ -26,9 +30,18 @@ def register_cow_legacy(
 @router.get("/", 
            response_model=List[CowResponse],
            summary="젖소 목록 조회",
-           description="현재 사용자의 농장에 등록된 모든 젖소 목록을 조회합니다.")
+           description="""
+           현재 사용자의 농장에 등록된 젖소 목록을 조회합니다.
+           
+           **페이지네이션 (선택):** limit을 지정하면 해당 개수만 반환하고,
+           다음 페이지가 있으면 `X-Next-Cursor` 응답 헤더로 커서를 전달합니다.
+           다음 요청에 `cursor`로 넘기면 이어서 조회합니다. limit이 없으면 전체 목록을 반환합니다.
+           """)
 def list_cows(
+    response: Response,
     sortDirection: Optional[str] = "DESCENDING",
+    limit: Optional[int] = Query(None, description="페이지 크기 (생략 시 전체)", ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
     """현재 사용자의 농장에 등록된 젖소 목록 조회"""
@@ -39,12 +52,16 @@ def list_cows(
         print(f"[DEBUG] 젖소 목록 조회 시작 - farm_id: {farm_id}, sortDirection: {sortDirection}")
         
         # CowFirebaseService 호출
-        cows = CowFirebaseService.get_cows_by_farm(farm_id)
+        cows, next_cursor = CowFirebaseService.get_cows_page(farm_id, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         
         print(f"[DEBUG] 조회된 젖소 수: {len(cows)}")
         
         return cows
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[ERROR] 젖소 목록 조회 실패: {str(e)}")
         raise HTTPException(
@@ -118,6 +135,62 @@ async def register_cow_from_livestock_trace(
     
     return LivestockTraceRegistrationResponse(**result)
 
+@router.post("/register-from-livestock-trace/bulk",
+            response_model=BulkRegistrationJobResponse,
+            status_code=status.HTTP_202_ACCEPTED,
+            summary="축산물이력제 정보 기반 젖소 일괄 등록",
+            description="""
+            여러 마리의 젖소를 축산물이력제 정보로 한 번에 등록합니다 (최대 500마리).
+            
+            **처리 방식:**
+            1. 즉시 job_id 반환
+            2. 백그라운드에서 중복 확인 → 축산물이력제 병렬 조회 → 배치 저장
+            3. /cows/register-from-livestock-trace/bulk/{job_id}로 진행률과 이표번호별 결과 확인
+            
+            **이표번호별 결과 상태:**
+            - `registered`: 등록 완료
+            - `already_registered`: 이미 등록된 이표번호
+            - `not_found`: 축산물이력제에서 정보를 찾을 수 없음 (수동 등록 필요)
+            - `manual_registration_required`: 축산물이력제 장애로 조회하지 못함 (수동 등록 필요)
+            - `failed`: 센서 번호 중복 또는 저장 실패
+            """)
+async def register_cows_from_livestock_trace_bulk(
+    bulk_data: BulkCowRegisterFromLivestockTrace,
+    current_user: dict = Depends(get_current_user)
+):
+    """축산물이력제 정보 기반 젖소 일괄 등록 작업 시작"""
+    cows = [cow.dict() for cow in bulk_data.cows]
+    job = await BulkCowRegistrationService.start_job(cows, current_user)
+    
+    return BulkRegistrationJobResponse(
+        success=True,
+        message=f"{len(cows)}마리 일괄 등록을 시작했습니다",
+        job_id=job["job_id"],
+        status=job["status"],
+        total=len(cows),
+        check_status_url=f"/cows/register-from-livestock-trace/bulk/{job['job_id']}"
+    )
+
+@router.get("/register-from-livestock-trace/bulk/{job_id}",
+           summary="젖소 일괄 등록 진행 상황 조회",
+           description="일괄 등록 작업의 진행률과 이표번호별 등록 결과를 조회합니다.")
+async def get_bulk_registration_status(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """젖소 일괄 등록 작업 상태 조회"""
+    return await BulkCowRegistrationService.get_job(job_id, current_user)
+
+@router.delete("/register-from-livestock-trace/bulk/{job_id}",
+              summary="젖소 일괄 등록 취소",
+              description="진행 중인 일괄 등록 작업을 취소합니다. 이미 저장된 젖소는 그대로 유지됩니다.")
+async def cancel_bulk_registration(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """젖소 일괄 등록 작업 취소"""
+    return await BulkCowRegistrationService.cancel_job(job_id, current_user)
+
 # ===== 기존 젖소 관리 API =====
 
 @router.post("/manual", 
@@ -269,59 +342,20 @@ def get_farm_statistics(current_user: dict = Depends(get_current_user)):
     farm_id = current_user.get("farm_id")
     
     try:
-        from config.firebase_config import get_firestore_client
-        db = get_firestore_client()
-        
-        # 전체 젖소 수 (안전한 처리)
-        total_cows = 0
-        try:
-            total_cows = len((db.collection('cows')
-                             .where('farm_id', '==', farm_id)
-                             .where('is_active', '==', True)
-                             .get()))
-        except Exception as total_error:
-            print(f"[WARNING] 전체 젖소 수 조회 실패: {str(total_error)}")
-            total_cows = 0
+        from services.farm_stats_service import FarmStatsService
         
-        # 건강상태별 통계 (안전한 처리)
-        health_stats = {}
-        for status in ["normal", "warning", "danger"]:
-            try:
-                count = len((db.collection('cows')
-                            .where('farm_id', '==', farm_id)
-                            .where('health_status', '==', status)
-                            .where('is_active', '==', True)
-                            .get()))
-                health_stats[status] = count
-            except Exception as health_error:
-                print(f"[WARNING] 건강상태 통계 조회 실패 ({status}): {str(health_error)}")
-                health_stats[status] = 0
+        # 농장 통계 카운터 문서 한 번 읽기
+        cow_stats = FarmStatsService.get_farm_stats(farm_id).get("cows", {})
+        health_counts = cow_stats.get("health", {})
+        breeding_counts = cow_stats.get("breeding", {})
         
-        # 번식상태별 통계 (안전한 처리)
-        breeding_stats = {}
-        for status in ["calf", "heifer", "pregnant", "lactating", "dry", "breeding"]:
-            try:
-                count = len((db.collection('cows')
-                            .where('farm_id', '==', farm_id)
-                            .where('breeding_status', '==', status)
-                            .where('is_active', '==', True)
-                            .get()))
-                breeding_stats[status] = count
-            except Exception as breeding_error:
-                print(f"[WARNING] 번식상태 통계 조회 실패 ({status}): {str(breeding_error)}")
-                breeding_stats[status] = 0
-        
-        # 축산물이력제 연동 통계 추가 (안전한 처리)
-        livestock_trace_registered = 0
-        try:
-            livestock_trace_registered = len((db.collection('cows')
-                                            .where('farm_id', '==', farm_id)
-                                            .where('registered_from_livestock_trace', '==', True)
-                                            .where('is_active', '==', True)
-                                            .get()))
-        except Exception as livestock_error:
-            print(f"[WARNING] 축산물이력제 통계 조회 실패: {str(livestock_error)}")
-            livestock_trace_registered = 0
+        total_cows = cow_stats.get("total", 0)
+        health_stats = {s: health_counts.get(s, 0) for s in ["normal", "warning", "danger"]}
+        breeding_stats = {
+            s: breeding_counts.get(s, 0)
+            for s in ["calf", "heifer", "pregnant", "lactating", "dry", "breeding"]
+        }
+        livestock_trace_registered = cow_stats.get("livestock_trace", 0)
         
         return {
             "total_cows": total_cows,
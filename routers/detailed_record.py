@@ -1,6 +1,6 @@
 # routers/detailed_record.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from typing import List, Optional
 from datetime import datetime
 from schemas.detailed_record import (
@@ -10,7 +10,9 @@ from schemas.detailed_record import (
     TreatmentRecordCreate, DetailedRecordResponse, DetailedRecordSummary, 
     DetailedRecordType, DetailedRecordUpdate
 )
-from services.detailed_record_service import DetailedRecordService
+from services.detailed_record_service import DetailedRecordService, summary_fields
+from services.cow_loader import CowLoader
+from services.pagination import NEXT_CURSOR_HEADER, paginate_query
 from routers.auth_firebase import get_current_user
 
 router = APIRouter()
@@ -57,14 +59,19 @@ def create_milking_record(
            description="특정 젖소의 착유 기록만 필터링하여 조회")
 def get_cow_milking_records(
     cow_id: str,
+    response: Response,
     limit: int = Query(50, description="조회할 기록 수 제한", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
-    """젖소별 착유 기록 조회"""
+    """젖소별 착유 기록 조회 (다음 페이지 커서는 X-Next-Cursor 헤더로 전달)"""
     farm_id = current_user.get("farm_id")
-    return DetailedRecordService.get_detailed_records_by_cow(
-        cow_id, farm_id, DetailedRecordType.MILKING, limit
+    records, next_cursor = DetailedRecordService.get_detailed_records_page(
+        cow_id, farm_id, DetailedRecordType.MILKING, limit, cursor
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return records
 
 # 최근 착유 기록 조회 (농장 전체)
 @router.get("/milking/recent", 
@@ -86,17 +93,24 @@ def get_recent_milking_records(
                         .where('farm_id', '==', farm_id)
                         .where('record_type', '==', DetailedRecordType.MILKING.value)
                         .where('is_active', '==', True)
+                        .select(summary_fields(DetailedRecordType.MILKING))
                         .order_by('record_date', direction='DESCENDING')
                         .limit(limit)
                         .get())
         
+        record_list = [record_doc.to_dict() for record_doc in records_query]
+        
+        # 젖소 정보는 한 번의 배치 조회로 가져옴
+        cow_loader = CowLoader(farm_id).prime(record.get("cow_id") for record in record_list)
+        
         records = []
-        for record_doc in records_query:
-            record_data = record_doc.to_dict()
-            
+        for record_data in record_list:
             # 젖소 정보 조회
             try:
-                cow_info = DetailedRecordService._get_cow_info(record_data["cow_id"], farm_id)
+                cow_info = cow_loader.get(record_data["cow_id"]) or {
+                    "name": "알 수 없음",
+                    "ear_tag_number": "N/A"
+                }
                 
                 # 착유량 정보 추출
                 key_values = {}
@@ -530,9 +544,13 @@ def create_treatment_record(
             - 착유 기록만 조회: `?record_type=milking`
             - 건강 기록만 조회: `?record_type=health_check`
             - 번식 기록만 조회: `?record_type=breeding`
+            
+            **페이지네이션:** 다음 페이지가 있으면 `X-Next-Cursor` 응답 헤더로 커서를 전달합니다.
+            다음 요청에 `cursor`로 넘기면 이어서 조회합니다.
             """)
 def get_cow_detailed_records(
     cow_id: str,
+    response: Response,
     record_type: Optional[DetailedRecordType] = Query(
         None, 
         description="""
@@ -559,11 +577,18 @@ def get_cow_detailed_records(
         **미입력시 모든 기록 타입을 조회합니다.**
         """
     ),
+    limit: int = Query(100, description="페이지 크기", ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
     """특정 젖소의 상세 기록 목록 조회"""
     farm_id = current_user.get("farm_id")
-    return DetailedRecordService.get_detailed_records_by_cow(cow_id, farm_id, record_type)
+    records, next_cursor = DetailedRecordService.get_detailed_records_page(
+        cow_id, farm_id, record_type, limit, cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return records
 
 @router.get("/{record_id}", 
             response_model=DetailedRecordResponse,
@@ -864,38 +889,32 @@ def get_cow_records_summary(
     """젖소별 기록 요약"""
     try:
         from config.firebase_config import get_firestore_client
+        from services.firestore_aggregation import count_queries
         from datetime import datetime, timedelta
         
         db = get_firestore_client()
         farm_id = current_user.get("farm_id")
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        # record_date는 YYYY-MM-DD 문자열로 저장되므로 문자열로 비교
+        thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).strftime('%Y-%m-%d')
         
-        # 각 기록 유형별 총 개수
-        total_counts = {}
-        for record_type in DetailedRecordType:
-            count = len((db.collection('cow_detailed_records')
-                        .where('cow_id', '==', cow_id)
-                        .where('farm_id', '==', farm_id)
-                        .where('record_type', '==', record_type.value)
-                        .where('is_active', '==', True)
-                        .get()))
-            total_counts[record_type.value] = count
-        
-        # 최근 30일 기록 개수
-        recent_count = len((db.collection('cow_detailed_records')
-                           .where('cow_id', '==', cow_id)
-                           .where('farm_id', '==', farm_id)
-                           .where('record_type', '==', record_type.value)
-                           .where('is_active', '==', True)
-                           .where('record_date', '>=', thirty_days_ago)
-                           .get()))
-        
-        # 전체 기록 개수
-        total_records = len((db.collection('cow_detailed_records')
-                           .where('cow_id', '==', cow_id)
-                           .where('farm_id', '==', farm_id)
-                           .where('is_active', '==', True)
-                           .get()))
+        cow_records = (db.collection('cow_detailed_records')
+                      .where('cow_id', '==', cow_id)
+                      .where('farm_id', '==', farm_id)
+                      .where('is_active', '==', True))
+        
+        # 기록 유형별 개수, 최근 30일, 전체 개수를 count() 집계 쿼리로 동시에 조회
+        queries = {
+            record_type.value: cow_records.where('record_type', '==', record_type.value)
+            for record_type in DetailedRecordType
+        }
+        queries["_recent"] = cow_records.where('record_date', '>=', thirty_days_ago)
+        queries["_total"] = cow_records
+        
+        counts = count_queries(queries)
+        
+        total_counts = {record_type.value: counts[record_type.value] for record_type in DetailedRecordType}
+        recent_count = counts["_recent"]
+        total_records = counts["_total"]
         
         return {
             "cow_id": cow_id,
@@ -918,7 +937,9 @@ def get_cow_records_summary(
             description="특정 젖소의 모든 건강 관련 기록을 조회합니다. 건강검진, 백신접종, 치료 기록을 포함합니다.")
 def get_cow_health_records(
     cow_id: str,
+    response: Response,
     limit: int = Query(100, description="조회할 기록 수 제한", ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
     """🔧 특정 젖소의 모든 건강 관련 기록 조회 (건강검진, 백신접종, 치료) - 500 오류 해결"""
@@ -945,57 +966,52 @@ def get_cow_health_records(
             DetailedRecordType.TREATMENT.value
         ]
         
+        # 건강 관련 유형을 한 번의 'in' 쿼리로 조회 (record_date 내림차순 커서 페이지네이션)
+        query = (db.collection('cow_detailed_records')
+                .where('cow_id', '==', cow_id)
+                .where('farm_id', '==', farm_id)
+                .where('record_type', 'in', health_types)
+                .where('is_active', '==', True)
+                .select(summary_fields(*health_types)))
+        records, next_cursor = paginate_query(query, 'record_date', 'DESCENDING', limit, cursor)
+        
         all_records = []
-        for record_type in health_types:
+        for record in records:
             try:
-                records = (db.collection('cow_detailed_records')
-                          .where('cow_id', '==', cow_id)
-                          .where('farm_id', '==', farm_id)
-                          .where('record_type', '==', record_type)
-                          .where('is_active', '==', True)
-                          .order_by('record_date', direction='DESCENDING')
-                          .limit(limit)
-                          .get())
+                data = record.to_dict()
                 
-                for record in records:
-                    try:
-                        data = record.to_dict()
-                        
-                        # 키 값 추출 (안전하게)
-                        key_values = DetailedRecordService._extract_key_values(
-                            data.get("record_type", ""), 
-                            data.get("record_data", {})
-                        )
-                        
-                        # 수정된 부분: 필수 필드에 기본값 제공
-                        all_records.append(DetailedRecordSummary(
-                            id=data.get("id", ""),
-                            cow_id=data.get("cow_id", cow_id),
-                            cow_name=cow_info.get("name", "알 수 없음"),  # 기본값 제공
-                            cow_ear_tag_number=cow_info.get("ear_tag_number", "N/A"),  # 기본값 제공
-                            record_type=DetailedRecordType(data.get("record_type", "other")),
-                            record_date=data.get("record_date", ""),
-                            title=data.get("title", "제목 없음"),
-                            description=data.get("description"),  # Optional
-                            key_values=key_values or {},  # 기본값 제공
-                            created_at=data.get("created_at", datetime.utcnow()),
-                            updated_at=data.get("updated_at", datetime.utcnow())
-                        ))
-                    except Exception as record_error:
-                        # 개별 기록 처리 실패 시 로그만 남기고 계속 진행
-                        print(f"[WARNING] 건강 기록 처리 실패 (ID: {record.id}): {str(record_error)}")
-                        continue
-                        
-            except Exception as type_error:
-                # 특정 타입 조회 실패 시 로그만 남기고 계속 진행
-                print(f"[WARNING] 건강 기록 타입 조회 실패 ({record_type}): {str(type_error)}")
+                # 키 값 추출 (안전하게)
+                key_values = DetailedRecordService._extract_key_values(
+                    data.get("record_type", ""), 
+                    data.get("record_data", {})
+                )
+                
+                # 수정된 부분: 필수 필드에 기본값 제공
+                all_records.append(DetailedRecordSummary(
+                    id=data.get("id", ""),
+                    cow_id=data.get("cow_id", cow_id),
+                    cow_name=cow_info.get("name", "알 수 없음"),  # 기본값 제공
+                    cow_ear_tag_number=cow_info.get("ear_tag_number", "N/A"),  # 기본값 제공
+                    record_type=DetailedRecordType(data.get("record_type", "other")),
+                    record_date=data.get("record_date", ""),
+                    title=data.get("title", "제목 없음"),
+                    description=data.get("description"),  # Optional
+                    key_values=key_values or {},  # 기본값 제공
+                    created_at=data.get("created_at", datetime.utcnow()),
+                    updated_at=data.get("updated_at", datetime.utcnow())
+                ))
+            except Exception as record_error:
+                # 개별 기록 처리 실패 시 로그만 남기고 계속 진행
+                print(f"[WARNING] 건강 기록 처리 실패 (ID: {record.id}): {str(record_error)}")
                 continue
         
-        # 날짜순 정렬 (최신순)
-        all_records.sort(key=lambda x: x.record_date, reverse=True)
-        
-        return all_records[:limit]
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return all_records
         
+    except HTTPException:
+        # 잘못된 커서 등 요청 오류는 그대로 전달
+        raise
     except Exception as e:
         # 전체 실패 시에도 빈 배열 반환 (500 오류 방지)
         print(f"[ERROR] 건강 기록 조회 전체 실패: {str(e)}")
@@ -1007,7 +1023,9 @@ def get_cow_health_records(
             description="특정 젖소의 모든 착유 기록을 조회합니다. 착유량, 착유 시간, 유성분 정보 등을 포함합니다.")
 def get_cow_all_milking_records(
     cow_id: str,
+    response: Response,
     limit: int = Query(100, description="조회할 기록 수 제한", ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
     """특정 젖소의 모든 착유 기록 조회"""
@@ -1016,14 +1034,13 @@ def get_cow_all_milking_records(
         db = get_firestore_client()
         farm_id = current_user.get("farm_id")
         
-        records = (db.collection('cow_detailed_records')
-                  .where('cow_id', '==', cow_id)
-                  .where('farm_id', '==', farm_id)
-                  .where('record_type', '==', DetailedRecordType.MILKING.value)
-                  .where('is_active', '==', True)
-                  .order_by('record_date', direction='DESCENDING')
-                  .limit(limit)
-                  .get())
+        query = (db.collection('cow_detailed_records')
+                .where('cow_id', '==', cow_id)
+                .where('farm_id', '==', farm_id)
+                .where('record_type', '==', DetailedRecordType.MILKING.value)
+                .where('is_active', '==', True)
+                .select(summary_fields(with_key_values=False)))
+        records, next_cursor = paginate_query(query, 'record_date', 'DESCENDING', limit, cursor)
         
         result = []
         for record in records:
@@ -1039,8 +1056,12 @@ def get_cow_all_milking_records(
                 updated_at=data["updated_at"]
             ))
         
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1054,7 +1075,9 @@ def get_cow_all_milking_records(
             description="특정 젖소의 모든 번식 관련 기록을 조회합니다. 발정, 인공수정, 임신감정, 분만 기록을 포함합니다.")
 def get_cow_breeding_records(
     cow_id: str,
+    response: Response,
     limit: int = Query(100, description="조회할 기록 수 제한", ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
     """🐮 특정 젖소의 모든 번식 관련 기록 조회 (발정, 인공수정, 임신감정, 분만)"""
@@ -1080,52 +1103,48 @@ def get_cow_breeding_records(
             DetailedRecordType.CALVING.value
         ]
         
-        all_records = []
+        # 번식 관련 유형을 한 번의 'in' 쿼리로 조회 (record_date 내림차순 커서 페이지네이션)
+        query = (db.collection('cow_detailed_records')
+                .where('cow_id', '==', cow_id)
+                .where('farm_id', '==', farm_id)
+                .where('record_type', 'in', breeding_types)
+                .where('is_active', '==', True)
+                .select(summary_fields(*breeding_types)))
+        records, next_cursor = paginate_query(query, 'record_date', 'DESCENDING', limit, cursor)
 
-        for record_type in breeding_types:
+        all_records = []
+        for record in records:
             try:
-                records = (db.collection('cow_detailed_records')
-                          .where('cow_id', '==', cow_id)
-                          .where('farm_id', '==', farm_id)
-                          .where('record_type', '==', record_type)
-                          .where('is_active', '==', True)
-                          .order_by('record_date', direction='DESCENDING')
-                          .limit(limit)
-                          .get())
-                
-                for record in records:
-                    try:
-                        data = record.to_dict()
-                        print(f"[DEBUG] 🔍 불러온 {record_type} raw data:", data)
+                data = record.to_dict()
 
-                        key_values = DetailedRecordService._extract_key_values(
-                            data.get("record_type", ""),
-                            data.get("record_data", {})
-                        )
+                key_values = DetailedRecordService._extract_key_values(
+                    data.get("record_type", ""),
+                    data.get("record_data", {})
+                )
 
-                        all_records.append(DetailedRecordSummary(
-                            id=data.get("id", ""),
-                            cow_id=data.get("cow_id", cow_id),
-                            cow_name=cow_info.get("name", "알 수 없음"),
-                            cow_ear_tag_number=cow_info.get("ear_tag_number", "N/A"),
-                            record_type=DetailedRecordType(data.get("record_type", "other")),
-                            record_date=data.get("record_date", ""),
-                            title=data.get("title", "제목 없음"),
-                            description=data.get("description", ""),
-                            key_values=key_values or {},
-                            created_at=data.get("created_at", datetime.utcnow()),
-                            updated_at=data.get("updated_at", datetime.utcnow())
-                        ))
-                    except Exception as record_error:
-                        print(f"[WARNING] 번식 기록 처리 실패 (ID: {record.id}): {str(record_error)}")
-                        continue
-            except Exception as type_error:
-                print(f"[WARNING] 번식 기록 타입 조회 실패 ({record_type}): {str(type_error)}")
+                all_records.append(DetailedRecordSummary(
+                    id=data.get("id", ""),
+                    cow_id=data.get("cow_id", cow_id),
+                    cow_name=cow_info.get("name", "알 수 없음"),
+                    cow_ear_tag_number=cow_info.get("ear_tag_number", "N/A"),
+                    record_type=DetailedRecordType(data.get("record_type", "other")),
+                    record_date=data.get("record_date", ""),
+                    title=data.get("title", "제목 없음"),
+                    description=data.get("description", ""),
+                    key_values=key_values or {},
+                    created_at=data.get("created_at", datetime.utcnow()),
+                    updated_at=data.get("updated_at", datetime.utcnow())
+                ))
+            except Exception as record_error:
+                print(f"[WARNING] 번식 기록 처리 실패 (ID: {record.id}): {str(record_error)}")
                 continue
         
-        all_records.sort(key=lambda x: x.record_date, reverse=True)
-        return all_records[:limit]
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return all_records
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[ERROR] 번식 기록 전체 조회 실패: {str(e)}")
         return []
@@ -1137,7 +1156,9 @@ def get_cow_breeding_records(
             description="특정 젖소의 모든 사료급여 기록을 조회합니다. 사료 종류, 급여량, 급여 시간 등을 포함합니다.")
 def get_cow_feed_records(
     cow_id: str,
+    response: Response,
     limit: int = Query(100, description="조회할 기록 수 제한", ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
     """특정 젖소의 모든 사료급여 기록 조회 - 500 오류 해결"""
@@ -1157,14 +1178,13 @@ def get_cow_feed_records(
                 "ear_tag_number": "N/A"
             }
         
-        records = (db.collection('cow_detailed_records')
-                  .where('cow_id', '==', cow_id)
-                  .where('farm_id', '==', farm_id)
-                  .where('record_type', '==', DetailedRecordType.FEED.value)
-                  .where('is_active', '==', True)
-                  .order_by('record_date', direction='DESCENDING')
-                  .limit(limit)
-                  .get())
+        query = (db.collection('cow_detailed_records')
+                .where('cow_id', '==', cow_id)
+                .where('farm_id', '==', farm_id)
+                .where('record_type', '==', DetailedRecordType.FEED.value)
+                .where('is_active', '==', True)
+                .select(summary_fields(DetailedRecordType.FEED)))
+        records, next_cursor = paginate_query(query, 'record_date', 'DESCENDING', limit, cursor)
         
         result = []
         for record in records:
@@ -1196,8 +1216,12 @@ def get_cow_feed_records(
                 print(f"[WARNING] 사료급여 기록 처리 실패 (ID: {record.id}): {str(record_error)}")
                 continue
         
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         # 전체 실패 시에도 빈 배열 반환 (500 오류 방지)
         print(f"[ERROR] 사료급여 기록 조회 전체 실패: {str(e)}")
@@ -1210,7 +1234,9 @@ def get_cow_feed_records(
             description="특정 젖소의 모든 체중측정 기록을 조회합니다. 측정 체중, 측정 날짜, 체형점수 등을 포함합니다.")
 def get_cow_weight_records(
     cow_id: str,
+    response: Response,
     limit: int = Query(100, description="조회할 기록 수 제한", ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
     """🔧 특정 젖소의 체중측정 기록 조회 - 500 오류 방지 포함"""
@@ -1230,14 +1256,13 @@ def get_cow_weight_records(
             }
 
         # 기록 불러오기
-        records = (db.collection('cow_detailed_records')
-                  .where('cow_id', '==', cow_id)
-                  .where('farm_id', '==', farm_id)
-                  .where('record_type', '==', DetailedRecordType.WEIGHT.value)
-                  .where('is_active', '==', True)
-                  .order_by('record_date', direction='DESCENDING')
-                  .limit(limit)
-                  .get())
+        query = (db.collection('cow_detailed_records')
+                .where('cow_id', '==', cow_id)
+                .where('farm_id', '==', farm_id)
+                .where('record_type', '==', DetailedRecordType.WEIGHT.value)
+                .where('is_active', '==', True)
+                .select(summary_fields(DetailedRecordType.WEIGHT)))
+        records, next_cursor = paginate_query(query, 'record_date', 'DESCENDING', limit, cursor)
 
         result = []
         for record in records:
@@ -1267,8 +1292,12 @@ def get_cow_weight_records(
                 print(f"[WARNING] 체중 기록 처리 실패 (ID: {record.id}): {str(record_error)}")
                 continue
 
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[ERROR] 체중 기록 조회 전체 실패: {str(e)}")
         return []  # ❗빈 리스트 반환해서 500 방지
@@ -1311,7 +1340,9 @@ def get_cow_weight_records(
             """)
 def get_cow_all_records(
     cow_id: str,
+    response: Response,
     limit: int = Query(100, description="조회할 기록 수 제한 (최대 200개)", ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     record_type: Optional[DetailedRecordType] = Query(
         None, 
         description="""
@@ -1363,9 +1394,9 @@ def get_cow_all_records(
         if record_type:
             query = query.where('record_type', '==', record_type.value)
         
-        records = (query.order_by('record_date', direction='DESCENDING')
-                  .limit(limit)
-                  .get())
+        records, next_cursor = paginate_query(
+            query.select(summary_fields(with_key_values=False)), 'record_date', 'DESCENDING', limit, cursor
+        )
         
         result = []
         for record in records:
@@ -1381,8 +1412,12 @@ def get_cow_all_records(
                 updated_at=data["updated_at"]
             ))
         
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
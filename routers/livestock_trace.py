@@ -1,17 +1,38 @@
 # routers/livestock_trace.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel, validator
-from typing import Optional, List, Dict, Any
-import httpx
-import xml.etree.ElementTree as ET
+from typing import Optional, List, Dict, Any, Callable
+from urllib.parse import urlparse
+import asyncio
 import os
 from datetime import datetime, timedelta
 
 from routers.auth_firebase import get_current_user
+from services.ekape_xml import parse_trace_items
+from services.http_clients import http_clients
+from services.livestock_cow_service import TRACE_UNAVAILABLE_MESSAGE
+from services.jobs import job_manager
+from services.livestock_trace_cache import livestock_trace_cache
+from services.singleflight import livestock_trace_flight
 
 router = APIRouter()
 
+# 축산물이력제 조회 옵션 (optionNo → 이름)
+TRACE_OPTIONS = {
+    "1": "기본 정보",
+    "2": "농장 정보",
+    "3": "도축 정보",
+    "4": "포장 정보",
+    "5": "백신 정보",
+    "6": "질병 정보",
+    "7": "검사 정보"
+}
+
+# 호스트별 동시 호출 수 제한 (옵션 1~7을 동시에 조회할 때 API 서버 보호)
+EKAPE_MAX_CONCURRENCY = int(os.getenv("EKAPE_MAX_CONCURRENCY", "4"))
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
 class LivestockTraceRequest(BaseModel):
     ear_tag_number: str
     
@@ -154,44 +175,14 @@ async def get_livestock_trace_info(
             farm_registrations=[]
         )
         
-        # 1. 기본 개체정보 조회 (optionNo=1)
-        basic_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "1")
-        if basic_info:
-            response_data.basic_info = _parse_basic_info(basic_info, ear_tag_number)
-        
-        # 2. 출생 등 신고정보 조회 (optionNo=2) - 여러 농장 이력
-        farm_registrations = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "2")
-        if farm_registrations:
-            response_data.farm_registrations = _parse_farm_registrations(farm_registrations)
-        
-        # 3. 도축정보 조회 (optionNo=3)
-        slaughter_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "3")
-        if slaughter_info:
-            response_data.slaughter_info = _parse_slaughter_info(slaughter_info)
-        
-        # 4. 포장정보 조회 (optionNo=4)
-        packaging_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "4")
-        if packaging_info:
-            response_data.packaging_info = _parse_packaging_info(packaging_info)
-        
-        # 5. 구제역백신 정보 조회 (optionNo=5)
-        vaccination_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "5")
-        if vaccination_info:
-            response_data.vaccination_info = _parse_vaccination_info(vaccination_info)
-        
-        # 6. 질병정보 조회 (optionNo=6)
-        health_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "6")
-        if health_info:
-            response_data.health_inspection = _parse_health_info(health_info)
-        
-        # 7. 브루셀라 정보 조회 (optionNo=7)
-        brucella_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "7")
-        if brucella_info:
-            response_data.brucella_info = _parse_brucella_info(brucella_info)
-            response_data.tuberculosis_info = _parse_tuberculosis_info(brucella_info)
+        # 옵션 1~7 (기본/신고/도축/포장/구제역백신/질병/브루셀라) 동시 조회
+        option_results = await _fetch_all_options(base_url, service_key, ear_tag_number)
+        for option_no, items in option_results.items():
+            _apply_option_data(response_data, option_no, items, ear_tag_number)
         
-        # 기본 정보가 없으면 데이터를 찾을 수 없는 것으로 판단
+        # 기본 정보가 없으면 데이터를 찾을 수 없는 것으로 판단 (축산물이력제 장애 중이면 503)
         if not response_data.basic_info:
+            _raise_if_trace_unavailable()
             response_data.success = False
             response_data.message = "축산물이력제에서 해당 이표번호의 정보를 찾을 수 없습니다"
         
@@ -205,19 +196,102 @@ async def get_livestock_trace_info(
             detail=f"축산물이력정보 조회 중 오류가 발생했습니다: {str(e)}"
         )
 
+def _raise_if_trace_unavailable() -> None:
+    """축산물이력제 차단기가 열려 있으면 503 (수동 등록 안내)"""
+    if not http_clients.available("ekape"):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=TRACE_UNAVAILABLE_MESSAGE
+        )
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    """호출 대상 호스트별 동시 호출 제한 세마포어"""
+    host = urlparse(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(EKAPE_MAX_CONCURRENCY)
+    return _host_semaphores[host]
+
+async def _fetch_all_options(
+    base_url: str,
+    service_key: str,
+    ear_tag_number: str,
+    option_nos: Optional[List[str]] = None,
+    on_complete: Optional[Callable[[str, Optional[List[Dict]]], None]] = None
+) -> Dict[str, Optional[List[Dict]]]:
+    """
+    여러 옵션을 동시에 조회 (호스트별 동시 호출 수 제한 적용)
+    
+    on_complete(option_no, items)는 각 옵션 조회가 끝나는 즉시 호출된다
+    전체 소요 시간은 옵션별 합계가 아니라 가장 느린 옵션 기준
+    """
+    option_nos = option_nos or list(TRACE_OPTIONS)
+    
+    async def _fetch(option_no: str):
+        items = await _fetch_livestock_data(base_url, service_key, ear_tag_number, option_no)
+        if on_complete:
+            on_complete(option_no, items)
+        return option_no, items
+    
+    results = await asyncio.gather(*(_fetch(option_no) for option_no in option_nos))
+    return dict(results)
+
+def _apply_option_data(response_data: LivestockTraceResponse, option_no: str, items: Optional[List[Dict]], ear_tag_number: str) -> bool:
+    """옵션별 조회 결과를 응답 모델에 반영 (데이터가 있으면 True)"""
+    if not items:
+        return False
+    
+    if option_no == "1":
+        response_data.basic_info = _parse_basic_info(items, ear_tag_number)
+    elif option_no == "2":
+        response_data.farm_registrations = _parse_farm_registrations(items)
+    elif option_no == "3":
+        response_data.slaughter_info = _parse_slaughter_info(items)
+    elif option_no == "4":
+        response_data.packaging_info = _parse_packaging_info(items)
+    elif option_no == "5":
+        response_data.vaccination_info = _parse_vaccination_info(items)
+    elif option_no == "6":
+        response_data.health_inspection = _parse_health_info(items)
+    elif option_no == "7":
+        response_data.brucella_info = _parse_brucella_info(items)
+        response_data.tuberculosis_info = _parse_tuberculosis_info(items)
+    return True
+
 async def _fetch_livestock_data(base_url: str, service_key: str, ear_tag_number: str, option_no: str) -> Optional[List[Dict]]:
-    """축산물이력제 API 호출 - corpNo 파라미터 제거"""
+    """축산물이력제 API 호출 - (이표번호, optionNo) 단위 캐시 + 동시 요청 합치기 적용"""
+    cached, items = await livestock_trace_cache.aget(ear_tag_number, option_no)
+    if cached:
+        return items or None
+    
+    # 차단기가 열려 있으면 세마포어 대기 없이 바로 실패
+    if not http_clients.available("ekape"):
+        return None
+    
+    async def _load():
+        async with _host_semaphore(base_url):
+            items = await _fetch_livestock_data_unbounded(base_url, service_key, ear_tag_number, option_no)
+        
+        # 정상 응답만 캐시 (데이터 없음은 짧은 TTL로 캐시, 오류 응답은 캐시하지 않음)
+        if items is not None:
+            await livestock_trace_cache.aset(ear_tag_number, option_no, items)
+        return items
+    
+    # 같은 (이표번호, optionNo)를 조회 중인 요청이 있으면 그 결과를 함께 사용
+    items = await livestock_trace_flight.do((ear_tag_number, option_no), _load)
+    return items or None
+
+async def _fetch_livestock_data_unbounded(base_url: str, service_key: str, ear_tag_number: str, option_no: str) -> Optional[List[Dict]]:
+    """
+    축산물이력제 API 단건 호출 (동시 호출 제한/캐시는 _fetch_livestock_data에서 적용)
+    
+    Returns:
+        아이템 목록, 정상 응답이지만 데이터가 없으면 빈 목록, 오류면 None
+    """
     try:
-        # URL을 직접 구성하여 이중 인코딩 방지
         import urllib.parse
         
-        # 환경변수의 API 키가 이미 인코딩된 상태인지 확인하고 디코딩
-        if '%' in service_key:
-            # 이미 인코딩된 키라면 디코딩
-            decoded_service_key = urllib.parse.unquote(service_key)
-            print(f"API 키 디코딩됨: {service_key[:20]}... -> {decoded_service_key[:20]}...")
-        else:
-            decoded_service_key = service_key
+        # 환경변수의 API 키가 이미 인코딩된 상태라면 디코딩 (이중 인코딩 방지)
+        decoded_service_key = urllib.parse.unquote(service_key) if '%' in service_key else service_key
         
         params = {
             "serviceKey": decoded_service_key,
@@ -225,68 +299,18 @@ async def _fetch_livestock_data(base_url: str, service_key: str, ear_tag_number:
             "optionNo": option_no
         }
         
-        print(f"API 호출 - URL: {base_url}")
-        print(f"API 호출 - Params: {params}")
+        # 요청 URL/파라미터에는 서비스 키가 포함되므로 로그에 남기지 않음
+        response = await http_clients.get("ekape", base_url, params=params)
         
-        # 에러가 발생할 때만 로그 출력하도록 수정
+        if response.status_code != 200:
+            print(f"[WARNING] 축산물이력제 API 호출 실패 (optionNo={option_no}): 상태 코드 {response.status_code}")
+            return None
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(base_url, params=params, timeout=8.0)
-            
-            print(f"응답 상태 코드: {response.status_code}")
-            print(f"최종 요청 URL: {response.url}")
-            print(f"응답 내용 (처음 500자): {response.text[:500]}")
-            
-            if response.status_code != 200:
-                print(f"API 호출 실패 - 상태 코드: {response.status_code}")
-                return None
-            
-            # XML 파싱
-            try:
-                root = ET.fromstring(response.text)
-            except ET.ParseError as e:
-                print(f"XML 파싱 오류: {str(e)}")
-                return None
-            
-            # 응답 상태 확인
-            header = root.find('header')
-            if header is not None:
-                result_code = header.find('resultCode')
-                result_msg = header.find('resultMsg')
-                if result_code is not None:
-                    print(f"API 결과 코드: {result_code.text}")
-                    if result_msg is not None:
-                        print(f"API 결과 메시지: {result_msg.text}")
-                    
-                    if result_code.text != "00":
-                        print(f"API 호출 오류 (optionNo={option_no}):")
-                        return None
-            
-            # 데이터 추출
-            items = root.find('.//items')
-            if items is None:
-                print("items 요소를 찾을 수 없습니다")
-                return None
-                
-            item_elements = items.findall('item')
-            if len(item_elements) == 0:
-                print("item 요소가 없습니다")
-                return None
-            
-            # 모든 item을 리스트로 반환
-            item_list = []
-            for item in item_elements:
-                item_data = {}
-                for element in item:
-                    if element.text:  # 빈 값이 아닌 경우만 추가
-                        item_data[element.tag] = element.text.strip()
-                item_list.append(item_data)
-                
-            print(f"파싱된 아이템 수: {len(item_list)}")
-            if item_list:
-                print(f"첫 번째 아이템 키: {list(item_list[0].keys())}")
-            
-            return item_list
+        # 응답 바이트를 바로 파싱 (결과코드 오류면 None, 데이터 없음이면 빈 목록)
+        items = parse_trace_items(response.content)
+        if items is None:
+            print(f"[WARNING] 축산물이력제 API 결과 오류 (optionNo={option_no})")
+        return items
             
     except Exception as e:
         print(f"API 호출 오류 (optionNo={option_no}): {str(e)}")
@@ -490,6 +514,7 @@ async def quick_livestock_check(
         basic_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "1")
         
         if not basic_info:
+            _raise_if_trace_unavailable()
             return {
                 "success": False,
                 "message": "축산물이력제에서 해당 이표번호의 정보를 찾을 수 없습니다",
@@ -529,12 +554,9 @@ async def quick_livestock_check(
              """)
 async def async_livestock_trace_info(
     ear_tag_number: str,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     """비동기 전체정보 조회"""
-    import uuid
-    
     # 이표번호 검증
     if len(ear_tag_number) != 12 or not ear_tag_number.isdigit():
         raise HTTPException(
@@ -542,14 +564,15 @@ async def async_livestock_trace_info(
             detail="이표번호는 12자리 숫자여야 합니다"
         )
     
-    task_id = str(uuid.uuid4())
-    
     # 백그라운드 작업 시작
-    background_tasks.add_task(
-        _process_full_livestock_data, 
-        task_id, 
-        ear_tag_number
+    job = await job_manager.submit(
+        "livestock_trace",
+        _process_full_livestock_data,
+        ear_tag_number,
+        owner=current_user.get("id"),
+        initial={"ear_tag_number": ear_tag_number}
     )
+    task_id = job["job_id"]
     
     return {
         "success": True,
@@ -569,9 +592,9 @@ async def get_livestock_trace_status(
     current_user: dict = Depends(get_current_user)
 ):
     """조회 작업 상태 확인"""
-    # 메모리에 저장된 작업 결과 확인 (실제로는 Redis나 DB 사용 권장)
-    if task_id in _task_results:
-        return _task_results[task_id]
+    job = await job_manager.get(task_id, owner=current_user.get("id"))
+    if job is not None:
+        return {**job, "task_id": task_id}
     
     return {
         "success": False,
@@ -580,20 +603,32 @@ async def get_livestock_trace_status(
         "status": "not_found"
     }
 
-# 작업 결과 저장을 위한 메모리 딕셔너리 (실제로는 Redis 사용 권장)
-_task_results = {}
+@router.delete("/livestock-trace-status/{task_id}",
+               summary="축산물이력정보 조회 작업 취소",
+               description="진행 중인 비동기 조회 작업을 취소합니다.")
+async def cancel_livestock_trace_task(
+    task_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """조회 작업 취소"""
+    job = await job_manager.cancel(task_id, owner=current_user.get("id"))
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 작업을 찾을 수 없습니다"
+        )
+    return {**job, "task_id": task_id}
 
 async def _process_full_livestock_data(task_id: str, ear_tag_number: str):
     """백그라운드에서 전체 데이터 처리"""
     try:
         # 진행상황 업데이트
-        _task_results[task_id] = {
-            "success": True,
-            "status": "processing",
-            "message": "전체 정보를 수집 중입니다...",
-            "progress": 10,
-            "ear_tag_number": ear_tag_number
-        }
+        job_manager.update(
+            task_id,
+            status="processing",
+            message="전체 정보를 수집 중입니다...",
+            progress=10
+        )
         
         service_key = os.getenv("LIVESTOCK_TRACE_API_DECODING_KEY")
         base_url = "http://data.ekape.or.kr/openapi-data/service/user/animalTrace/traceNoSearch"
@@ -605,73 +640,42 @@ async def _process_full_livestock_data(task_id: str, ear_tag_number: str):
             farm_registrations=[]
         )
         
-        # 1. 기본 개체정보 (20%)
-        basic_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "1")
-        if basic_info:
-            response_data.basic_info = _parse_basic_info(basic_info, ear_tag_number)
-        
-        _task_results[task_id]["progress"] = 20
-        _task_results[task_id]["message"] = "기본 정보 수집 완료"
-        
-        # 2. 농장 등록 정보 (40%)
-        farm_registrations = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "2")
-        if farm_registrations:
-            response_data.farm_registrations = _parse_farm_registrations(farm_registrations)
-        
-        _task_results[task_id]["progress"] = 40
-        _task_results[task_id]["message"] = "농장 정보 수집 완료"
+        # 옵션 1~7 동시 조회 - 옵션이 끝날 때마다 진행률 갱신 (각각 실패해도 계속 진행)
+        completed = []
         
-        # 3-7. 나머지 정보들 (각각 실패해도 계속 진행)
-        option_names = {
-            "3": ("도축 정보", 60),
-            "4": ("포장 정보", 70), 
-            "5": ("백신 정보", 80),
-            "6": ("질병 정보", 90),
-            "7": ("검사 정보", 100)
-        }
-        
-        for option_no, (name, progress) in option_names.items():
+        def _on_option_complete(option_no: str, info: Optional[List[Dict]]):
             try:
-                info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, option_no)
-                if info:
-                    if option_no == "3":
-                        response_data.slaughter_info = _parse_slaughter_info(info)
-                    elif option_no == "4":
-                        response_data.packaging_info = _parse_packaging_info(info)
-                    elif option_no == "5":
-                        response_data.vaccination_info = _parse_vaccination_info(info)
-                    elif option_no == "6":
-                        response_data.health_inspection = _parse_health_info(info)
-                    elif option_no == "7":
-                        response_data.brucella_info = _parse_brucella_info(info)
-                        response_data.tuberculosis_info = _parse_tuberculosis_info(info)
-                
-                _task_results[task_id]["progress"] = progress
-                _task_results[task_id]["message"] = f"{name} 수집 완료"
-                
+                _apply_option_data(response_data, option_no, info, ear_tag_number)
             except Exception as e:
                 print(f"Option {option_no} 조회 실패: {str(e)} - 계속 진행")
-                continue
+            completed.append(option_no)
+            job_manager.update(
+                task_id,
+                progress=10 + 90 * len(completed) // len(TRACE_OPTIONS),
+                message=f"{TRACE_OPTIONS[option_no]} 수집 완료"
+            )
+        
+        await _fetch_all_options(base_url, service_key, ear_tag_number, on_complete=_on_option_complete)
         
         # 최종 결과 저장
-        _task_results[task_id] = {
-            "success": True,
-            "status": "completed",
-            "message": "전체 정보 수집 완료",
-            "progress": 100,
-            "data": response_data,
-            "ear_tag_number": ear_tag_number
-        }
+        job_manager.update(
+            task_id,
+            success=True,
+            status="completed",
+            message="전체 정보 수집 완료",
+            progress=100,
+            data=response_data
+        )
         
     except Exception as e:
-        _task_results[task_id] = {
-            "success": False,
-            "status": "failed", 
-            "message": f"오류가 발생했습니다: {str(e)}",
-            "progress": 0,
-            "error": str(e),
-            "ear_tag_number": ear_tag_number
-        }
+        job_manager.update(
+            task_id,
+            success=False,
+            status="failed",
+            message=f"오류가 발생했습니다: {str(e)}",
+            progress=0,
+            error=str(e)
+        )
 
 # ===== 개발/테스트용 인증 없는 엔드포인트 =====
 
@@ -741,7 +745,7 @@ async def test_quick_check_no_auth(ear_tag_number: str):
              
              **작동 방식:**
              1. 즉시 task_id 반환 (응답 시간: ~100ms)
-             2. 백그라운드에서 7개 옵션 순차 조회 (소요 시간: 10-30초)
+             2. 백그라운드에서 7개 옵션 동시 조회 (소요 시간: 가장 느린 옵션 기준)
              3. /test-status-no-auth/{task_id}로 진행상황 실시간 확인
              
              **장점:**
@@ -749,13 +753,8 @@ async def test_quick_check_no_auth(ear_tag_number: str):
              - 일부 API 실패해도 나머지 정보 수집 계속
              - 실시간 진행률 표시 가능
              """)
-async def test_async_livestock_trace_no_auth(
-    ear_tag_number: str,
-    background_tasks: BackgroundTasks
-):
+async def test_async_livestock_trace_no_auth(ear_tag_number: str):
     """개발 테스트용 - 인증 없는 비동기 전체정보 조회"""
-    import uuid
-    
     # 이표번호 검증
     if len(ear_tag_number) != 12 or not ear_tag_number.isdigit():
         return {
@@ -765,14 +764,14 @@ async def test_async_livestock_trace_no_auth(
             "test_mode": True
         }
     
-    task_id = str(uuid.uuid4())
-    
     # 백그라운드 작업 시작
-    background_tasks.add_task(
-        _process_full_livestock_data_test, 
-        task_id, 
-        ear_tag_number
+    job = await job_manager.submit(
+        "livestock_trace_test",
+        _process_full_livestock_data_test,
+        ear_tag_number,
+        initial={"ear_tag_number": ear_tag_number, "test_mode": True}
     )
+    task_id = job["job_id"]
     
     return {
         "success": True,
@@ -794,15 +793,14 @@ async def test_async_livestock_trace_no_auth(
             - processing: 진행 중 (progress: 0-100)
             - completed: 완료 (data 포함)
             - failed: 실패 (error 포함)
+            - cancelled: 취소됨
             - not_found: 작업 없음
             """)
 async def test_get_livestock_trace_status_no_auth(task_id: str):
-    """개발 테스트용 - 조회 작업 상태 확인"""
-    # 메모리에 저장된 작업 결과 확인
-    if task_id in _task_results:
-        result = _task_results[task_id].copy()
-        result["test_mode"] = True
-        return result
+    """개발 테스트용 - 조회 작업 상태 확인 (테스트 모드로 시작한 작업만)"""
+    job = await job_manager.get(task_id)
+    if job is not None and job.get("kind") == "livestock_trace_test":
+        return {**job, "task_id": task_id, "test_mode": True}
     
     return {
         "success": False,
@@ -816,15 +814,13 @@ async def _process_full_livestock_data_test(task_id: str, ear_tag_number: str):
     """테스트용 백그라운드에서 전체 데이터 처리"""
     try:
         # 진행상황 업데이트
-        _task_results[task_id] = {
-            "success": True,
-            "status": "processing",
-            "message": "전체 정보를 수집 중입니다... (테스트 모드)",
-            "progress": 10,
-            "ear_tag_number": ear_tag_number,
-            "test_mode": True,
-            "start_time": datetime.now().isoformat()
-        }
+        job_manager.update(
+            task_id,
+            status="processing",
+            message="전체 정보를 수집 중입니다... (테스트 모드)",
+            progress=10,
+            start_time=datetime.now().isoformat()
+        )
         
         service_key = os.getenv("LIVESTOCK_TRACE_API_DECODING_KEY")
         base_url = "http://data.ekape.or.kr/openapi-data/service/user/animalTrace/traceNoSearch"
@@ -836,96 +832,53 @@ async def _process_full_livestock_data_test(task_id: str, ear_tag_number: str):
             farm_registrations=[]
         )
         
-        # 1. 기본 개체정보 (20%)
-        basic_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "1")
-        if basic_info:
-            response_data.basic_info = _parse_basic_info(basic_info, ear_tag_number)
-        
-        _task_results[task_id]["progress"] = 20
-        _task_results[task_id]["message"] = "기본 정보 수집 완료 (테스트 모드)"
-        
-        # 2. 농장 등록 정보 (40%)
-        farm_registrations = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "2")
-        if farm_registrations:
-            response_data.farm_registrations = _parse_farm_registrations(farm_registrations)
-        
-        _task_results[task_id]["progress"] = 40
-        _task_results[task_id]["message"] = "농장 정보 수집 완료 (테스트 모드)"
-        
-        # 3-7. 나머지 정보들 (각각 실패해도 계속 진행)
-        option_names = {
-            "3": ("도축 정보", 60),
-            "4": ("포장 정보", 70), 
-            "5": ("백신 정보", 80),
-            "6": ("질병 정보", 90),
-            "7": ("검사 정보", 100)
-        }
-        
+        # 옵션 1~7 동시 조회 - 옵션이 끝날 때마다 진행률 갱신 (각각 실패해도 계속 진행)
         collected_info = {}
+        completed = []
         
-        for option_no, (name, progress) in option_names.items():
+        def _on_option_complete(option_no: str, info: Optional[List[Dict]]):
+            name = TRACE_OPTIONS[option_no]
             try:
-                print(f"[테스트] {name} 수집 시작... (옵션 {option_no})")
-                info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, option_no)
-                
-                if info:
-                    if option_no == "3":
-                        response_data.slaughter_info = _parse_slaughter_info(info)
-                        collected_info["slaughter"] = "수집됨"
-                    elif option_no == "4":
-                        response_data.packaging_info = _parse_packaging_info(info)
-                        collected_info["packaging"] = "수집됨"
-                    elif option_no == "5":
-                        response_data.vaccination_info = _parse_vaccination_info(info)
-                        collected_info["vaccination"] = "수집됨"
-                    elif option_no == "6":
-                        response_data.health_inspection = _parse_health_info(info)
-                        collected_info["health"] = "수집됨"
-                    elif option_no == "7":
-                        response_data.brucella_info = _parse_brucella_info(info)
-                        response_data.tuberculosis_info = _parse_tuberculosis_info(info)
-                        collected_info["brucella"] = "수집됨"
-                        collected_info["tuberculosis"] = "수집됨"
-                else:
-                    collected_info[name] = "데이터 없음"
-                
-                _task_results[task_id]["progress"] = progress
-                _task_results[task_id]["message"] = f"{name} 수집 완료 (테스트 모드)"
-                _task_results[task_id]["collected_info"] = collected_info
-                
-                print(f"[테스트] {name} 수집 완료 ({progress}%)")
-                
+                collected_info[name] = "수집됨" if _apply_option_data(response_data, option_no, info, ear_tag_number) else "데이터 없음"
             except Exception as e:
                 print(f"[테스트] Option {option_no} 조회 실패: {str(e)} - 계속 진행")
                 collected_info[name] = f"수집 실패: {str(e)}"
-                continue
+            completed.append(option_no)
+            progress = 10 + 90 * len(completed) // len(TRACE_OPTIONS)
+            job_manager.update(
+                task_id,
+                progress=progress,
+                message=f"{name} 수집 완료 (테스트 모드)",
+                collected_info=collected_info
+            )
+            print(f"[테스트] {name} 수집 완료 ({progress}%)")
+        
+        await _fetch_all_options(base_url, service_key, ear_tag_number, on_complete=_on_option_complete)
         
         # 최종 결과 저장
-        _task_results[task_id] = {
-            "success": True,
-            "status": "completed",
-            "message": "전체 정보 수집 완료 (테스트 모드)",
-            "progress": 100,
-            "data": response_data,
-            "ear_tag_number": ear_tag_number,
-            "test_mode": True,
-            "collected_info": collected_info,
-            "end_time": datetime.now().isoformat()
-        }
+        job_manager.update(
+            task_id,
+            success=True,
+            status="completed",
+            message="전체 정보 수집 완료 (테스트 모드)",
+            progress=100,
+            data=response_data,
+            collected_info=collected_info,
+            end_time=datetime.now().isoformat()
+        )
         
         print(f"[테스트] 비동기 작업 완료 - task_id: {task_id}")
         
     except Exception as e:
-        _task_results[task_id] = {
-            "success": False,
-            "status": "failed", 
-            "message": f"오류가 발생했습니다: {str(e)} (테스트 모드)",
-            "progress": 0,
-            "error": str(e),
-            "ear_tag_number": ear_tag_number,
-            "test_mode": True,
-            "end_time": datetime.now().isoformat()
-        }
+        job_manager.update(
+            task_id,
+            success=False,
+            status="failed",
+            message=f"오류가 발생했습니다: {str(e)} (테스트 모드)",
+            progress=0,
+            error=str(e),
+            end_time=datetime.now().isoformat()
+        )
         print(f"[테스트] 비동기 작업 실패 - task_id: {task_id}, error: {str(e)}")
 
 @router.get("/test-no-auth/{ear_tag_number}",
@@ -976,48 +929,51 @@ async def test_livestock_trace_no_auth(ear_tag_number: str):
             "farm_registrations": []
         }
         
-        # 1. 기본 개체정보 조회 (optionNo=1)
-        basic_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "1")
+        # 옵션 1~7 동시 조회
+        option_results = await _fetch_all_options(base_url, service_key, ear_tag_number)
+        
+        # 1. 기본 개체정보 (optionNo=1)
+        basic_info = option_results.get("1")
         if basic_info:
             response_data["basic_info"] = _parse_basic_info(basic_info, ear_tag_number)
         else:
             response_data["basic_info"] = None
         
-        # 2. 출생 등 신고정보 조회 (optionNo=2)
-        farm_registrations = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "2")
+        # 2. 출생 등 신고정보 (optionNo=2)
+        farm_registrations = option_results.get("2")
         if farm_registrations:
             response_data["farm_registrations"] = _parse_farm_registrations(farm_registrations)
         
-        # 3. 도축정보 조회 (optionNo=3)
-        slaughter_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "3")
+        # 3. 도축정보 (optionNo=3)
+        slaughter_info = option_results.get("3")
         if slaughter_info:
             response_data["slaughter_info"] = _parse_slaughter_info(slaughter_info)
         else:
             response_data["slaughter_info"] = None
         
-        # 4. 포장정보 조회 (optionNo=4)
-        packaging_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "4")
+        # 4. 포장정보 (optionNo=4)
+        packaging_info = option_results.get("4")
         if packaging_info:
             response_data["packaging_info"] = _parse_packaging_info(packaging_info)
         else:
             response_data["packaging_info"] = None
         
-        # 5. 구제역백신 정보 조회 (optionNo=5)
-        vaccination_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "5")
+        # 5. 구제역백신 정보 (optionNo=5)
+        vaccination_info = option_results.get("5")
         if vaccination_info:
             response_data["vaccination_info"] = _parse_vaccination_info(vaccination_info)
         else:
             response_data["vaccination_info"] = None
         
-        # 6. 질병정보 조회 (optionNo=6)
-        health_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "6")
+        # 6. 질병정보 (optionNo=6)
+        health_info = option_results.get("6")
         if health_info:
             response_data["health_inspection"] = _parse_health_info(health_info)
         else:
             response_data["health_inspection"] = None
         
-        # 7. 브루셀라 정보 조회 (optionNo=7)
-        brucella_info = await _fetch_livestock_data(base_url, service_key, ear_tag_number, "7")
+        # 7. 브루셀라 정보 (optionNo=7)
+        brucella_info = option_results.get("7")
         if brucella_info:
             response_data["brucella_info"] = _parse_brucella_info(brucella_info)
             response_data["tuberculosis_info"] = _parse_tuberculosis_info(brucella_info)
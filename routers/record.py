@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from typing import List, Optional
 from schemas.record import (
     RecordResponse, RecordSummary, RecordUpdate, RecordType,
     BreedingRecordCreate, DiseaseRecordCreate, StatusChangeRecordCreate, OtherRecordCreate
 )
 from services.record_firebase_service import RecordFirebaseService
+from services.pagination import NEXT_CURSOR_HEADER
 from routers.auth_firebase import get_current_user
 
 router = APIRouter()
@@ -49,13 +50,21 @@ def create_other_record(
 @router.get("/cow/{cow_id}", response_model=List[RecordSummary])
 def get_cow_records(
     cow_id: str,
+    response: Response,
     record_type: Optional[RecordType] = Query(None, description="기록 유형 필터"),
+    limit: int = Query(50, description="조회 개수 제한", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
-    """특정 젖소의 기록 목록 조회 - 500 오류 해결"""
+    """특정 젖소의 기록 목록 조회 - 500 오류 해결 (다음 페이지 커서는 X-Next-Cursor 헤더로 전달)"""
     try:
         farm_id = current_user.get("farm_id")
-        return RecordFirebaseService.get_records_by_cow(cow_id, farm_id, record_type)
+        records, next_cursor = RecordFirebaseService.get_records_page_by_cow(cow_id, farm_id, record_type, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return records
+    except HTTPException:
+        raise
     except Exception as e:
         # 전체 실패 시에도 빈 배열 반환 (500 오류 방지)
         print(f"[ERROR] 젖소 기록 조회 전체 실패 (cow_id: {cow_id}): {str(e)}")
@@ -64,14 +73,21 @@ def get_cow_records(
 # 농장의 모든 기록 조회
 @router.get("/", response_model=List[RecordSummary])
 def get_farm_records(
+    response: Response,
     record_type: Optional[RecordType] = Query(None, description="기록 유형 필터"),
     limit: int = Query(50, description="조회 개수 제한", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
-    """농장의 모든 기록 조회 - 500 오류 해결"""
+    """농장의 모든 기록 조회 - 500 오류 해결 (다음 페이지 커서는 X-Next-Cursor 헤더로 전달)"""
     try:
         farm_id = current_user.get("farm_id")
-        return RecordFirebaseService.get_all_records_by_farm(farm_id, record_type, limit)
+        records, next_cursor = RecordFirebaseService.get_records_page_by_farm(farm_id, record_type, limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return records
+    except HTTPException:
+        raise
     except Exception as e:
         # 전체 실패 시에도 빈 배열 반환 (500 오류 방지)
         print(f"[ERROR] 농장 기록 조회 전체 실패 (farm_id: {current_user.get('farm_id')}): {str(e)}")
@@ -129,33 +145,26 @@ def get_record_statistics(current_user: dict = Depends(get_current_user)):
     
     try:
         from config.firebase_config import get_firestore_client
+        from services.farm_stats_service import FarmStatsService
+        from services.firestore_aggregation import count_query
+        from datetime import datetime, timedelta
         db = get_firestore_client()
         
-        # 기록 유형별 통계 (안전한 처리)
-        record_stats = {}
-        for record_type in ["breeding", "disease", "status_change", "other"]:
-            try:
-                count = len((db.collection('cow_records')
-                            .where('farm_id', '==', farm_id)
-                            .where('record_type', '==', record_type)
-                            .where('is_active', '==', True)
-                            .get()))
-                record_stats[record_type] = count
-            except Exception as type_error:
-                # 개별 타입 조회 실패 시 0으로 설정
-                print(f"[WARNING] 기록 타입 통계 조회 실패 ({record_type}): {str(type_error)}")
-                record_stats[record_type] = 0
+        # 기록 유형별 통계 - 농장 통계 카운터 문서에서 조회
+        record_counts = FarmStatsService.get_farm_stats(farm_id).get("basic_records", {})
+        record_stats = {
+            record_type: record_counts.get(record_type, 0)
+            for record_type in ["breeding", "disease", "status_change", "other"]
+        }
         
-        # 최근 30일 기록 수 (안전한 처리)
+        # 최근 30일 기록 수 (기간 조건이라 카운터 대신 count() 집계 사용, 안전한 처리)
         recent_records_count = 0
         try:
-            from datetime import datetime, timedelta
             thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            recent_records_count = len((db.collection('cow_records')
-                                      .where('farm_id', '==', farm_id)
-                                      .where('created_at', '>=', thirty_days_ago)
-                                      .where('is_active', '==', True)
-                                      .get()))
+            recent_records_count = count_query(db.collection('cow_records')
+                                               .where('farm_id', '==', farm_id)
+                                               .where('created_at', '>=', thirty_days_ago)
+                                               .where('is_active', '==', True))
         except Exception as recent_error:
             print(f"[WARNING] 최근 기록 통계 조회 실패: {str(recent_error)}")
             recent_records_count = 0
@@ -7,6 +7,7 @@ from schemas.user import (
 )
 from services.sns_auth_service import SNSAuthService
 from services.firebase_user_service import FirebaseUserService, ACCESS_TOKEN_EXPIRE_MINUTES
+from config.firebase_config import run_blocking
 from datetime import timedelta
 import uuid
 
@@ -24,7 +25,7 @@ async def google_login(id_token: str, farm_nickname: str = None):
         sns_data = SNSAuthService.verify_google_token(id_token)
         
         # 사용자 생성 또는 조회
-        user = SNSAuthService.create_or_get_sns_user(sns_data, farm_nickname)
+        user = await run_blocking(SNSAuthService.create_or_get_sns_user, sns_data, farm_nickname)
         
         # 액세스 토큰 생성
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -34,7 +35,7 @@ async def google_login(id_token: str, farm_nickname: str = None):
         )
         
         # 리프레시 토큰 생성
-        refresh_token = FirebaseUserService.create_refresh_token(user["id"])
+        refresh_token = await run_blocking(FirebaseUserService.create_refresh_token, user["id"])
         
         # 사용자 정보 응답
         user_response = UserResponse(
@@ -81,7 +82,7 @@ async def delete_sns_account(
         token = credentials.credentials
         
         # 액세스 토큰 검증
-        user = FirebaseUserService.verify_access_token(token)
+        user = await run_blocking(FirebaseUserService.verify_access_token, token)
         
         # SNS 사용자인지 확인
         if not user.get("login_type") or user.get("login_type") == "email":
@@ -98,7 +99,8 @@ async def delete_sns_account(
             )
         
         # 계정 삭제 실행
-        result = SNSAuthService.delete_sns_user_account(
+        result = await run_blocking(
+            SNSAuthService.delete_sns_user_account,
             user, 
             request.sns_provider.value, 
             request.sns_token
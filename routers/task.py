@@ -1,10 +1,11 @@
 # routers/task.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from typing import List, Optional
 from datetime import date
 from schemas.task import *
 from services.task_service import TaskService
+from services.pagination import NEXT_CURSOR_HEADER
 from routers.auth_firebase import get_current_user
 
 router = APIRouter(tags=["할일 관리"])
@@ -62,22 +63,28 @@ def create_task(
            - 특정 젖소 할일만 조회
            """)
 def get_tasks(
+    response: Response,
     status_filter: Optional[TaskStatus] = Query(None, description="상태 필터"),
     priority_filter: Optional[TaskPriority] = Query(None, description="우선순위 필터"),
     category_filter: Optional[TaskCategory] = Query(None, description="카테고리 필터"),
     cow_id_filter: Optional[str] = Query(None, description="젖소 ID 필터"),
     limit: int = Query(50, description="조회 개수 제한", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
     current_user: dict = Depends(get_current_user)
 ):
-    """할일 목록 조회"""
-    return TaskService.get_tasks(
+    """할일 목록 조회 (다음 페이지 커서는 X-Next-Cursor 헤더로 전달)"""
+    tasks, next_cursor = TaskService.get_tasks_page(
         current_user, 
         status_filter, 
         priority_filter, 
         category_filter, 
         cow_id_filter, 
-        limit
+        limit,
+        cursor
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return tasks
 
 @router.get("/today",
            response_model=List[TaskSummary],
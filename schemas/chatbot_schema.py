@@ -32,6 +32,7 @@ class ChatRoom(BaseModel):
 # 채팅방 목록 응답
 class ChatRoomList(BaseModel):
     chats: List[ChatRoom]
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (없으면 마지막 페이지)
 
 # 채팅 메시지
 class ChatMessage(BaseModel):
@@ -43,3 +44,4 @@ class ChatMessage(BaseModel):
 class ChatHistoryResponse(BaseModel):
     chat_id: str
     messages: List[ChatMessage]
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (없으면 마지막 페이지)
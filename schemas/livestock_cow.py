@@ -1,7 +1,7 @@
 # schemas/livestock_cow.py
 
 from pydantic import BaseModel, validator
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 class CowRegisterFromLivestockTrace(BaseModel):
@@ -45,4 +45,28 @@ class LivestockTraceRegistrationResponse(BaseModel):
     message: str
     cow_id: Optional[str] = None
     cow_info: Optional[Dict[str, Any]] = None
-    livestock_trace_data: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    livestock_trace_data: Optional[Dict[str, Any]] = None
+
+# 일괄 등록 한 번에 받을 수 있는 최대 젖소 수
+BULK_REGISTRATION_MAX_ITEMS = 500
+
+class BulkCowRegisterFromLivestockTrace(BaseModel):
+    """축산물이력제 정보 기반 젖소 일괄 등록 요청 스키마"""
+    cows: List[CowRegisterFromLivestockTrace]    # 등록할 젖소 목록
+    
+    @validator('cows')
+    def validate_cows(cls, v):
+        if not v:
+            raise ValueError('등록할 젖소가 없습니다')
+        if len(v) > BULK_REGISTRATION_MAX_ITEMS:
+            raise ValueError(f'한 번에 최대 {BULK_REGISTRATION_MAX_ITEMS}마리까지 등록할 수 있습니다')
+        return v
+
+class BulkRegistrationJobResponse(BaseModel):
+    """젖소 일괄 등록 작업 시작 응답 스키마"""
+    success: bool
+    message: str
+    job_id: str
+    status: str
+    total: int
+    check_status_url: str
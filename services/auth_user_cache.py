@@ -0,0 +1,113 @@
+# services/auth_user_cache.py
+
+from collections import OrderedDict
+from typing import Dict, Optional
+import os
+import threading
+import time
+
+
+class AuthUserCache:
+    """
+    인증 사용자 캐시 (JWT sub(user_id) → 사용자 문서)
+
+    - 모든 인증 요청마다 발생하던 users 컬렉션 조회를 짧은 TTL 동안 생략한다
+    - 최대 항목 수를 넘으면 가장 오래 사용하지 않은 사용자부터 제거 (LRU)
+    - 프로필 수정, 비밀번호 변경, 토큰 무효화, 계정 삭제/비활성화 시 명시적으로 무효화해야 한다
+    - 무효화는 현재 워커의 캐시에만 적용되므로 다른 uvicorn 워커에는 최대 ttl_seconds 동안 이전 문서가 남는다
+    """
+
+    def __init__(self, ttl_seconds: int = 60, max_users: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._users: "OrderedDict[str, tuple]" = OrderedDict()  # user_id → (적재 시각, 사용자 문서)
+        self._ids: Dict[str, str] = {}  # 문서 ID(uuid) → user_id
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[Dict]:
+        """캐시된 사용자 조회 (없거나 만료되면 None)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry and now - entry[0] < self.ttl_seconds:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+                # 호출 측에서 수정해도 캐시가 오염되지 않도록 복사본 반환
+                return dict(entry[1])
+            if entry:
+                self._remove(user_id)
+            self.misses += 1
+            return None
+
+    def put(self, user: Dict) -> None:
+        """사용자 문서 저장 (user_id 기준)"""
+        user_id = user.get("user_id") if user else None
+        if not user_id or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._users[user_id] = (time.monotonic(), dict(user))
+            self._users.move_to_end(user_id)
+            if user.get("id"):
+                self._ids[user["id"]] = user_id
+            while len(self._users) > self.max_users:
+                oldest_user_id, (_, oldest_user) = self._users.popitem(last=False)
+                self._drop_id(oldest_user_id, oldest_user)
+                self.evictions += 1
+
+    def invalidate(self, user_id: Optional[str] = None, user_uuid: Optional[str] = None) -> None:
+        """user_id(로그인 아이디) 또는 문서 ID(uuid)로 사용자 무효화"""
+        with self._lock:
+            if user_uuid and not user_id:
+                user_id = self._ids.get(user_uuid)
+            if user_id and user_id in self._users:
+                self._remove(user_id)
+                self.invalidations += 1
+
+    def invalidate_user(self, user: Optional[Dict]) -> None:
+        """사용자 문서로 무효화"""
+        if user:
+            self.invalidate(user.get("user_id"), user.get("id"))
+
+    def clear(self) -> None:
+        """전체 캐시 비우기"""
+        with self._lock:
+            self._users.clear()
+            self._ids.clear()
+
+    def stats(self) -> Dict:
+        """캐시 크기 산정용 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "users_cached": len(self._users),
+                "max_users": self.max_users,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _remove(self, user_id: str) -> None:
+        """항목 제거 (락을 잡은 상태에서 호출)"""
+        entry = self._users.pop(user_id, None)
+        if entry:
+            self._drop_id(user_id, entry[1])
+
+    def _drop_id(self, user_id: str, user: Dict) -> None:
+        """uuid 역색인 정리 (락을 잡은 상태에서 호출)"""
+        user_uuid = user.get("id")
+        if user_uuid and self._ids.get(user_uuid) == user_id:
+            del self._ids[user_uuid]
+
+
+# 전역 캐시 인스턴스
+auth_user_cache = AuthUserCache(
+    ttl_seconds=int(os.getenv("AUTH_USER_CACHE_TTL", "60")),
+    max_users=int(os.getenv("AUTH_USER_CACHE_MAX_USERS", "10000"))
+)
@@ -0,0 +1,265 @@
+# services/bulk_cow_registration.py
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from fastapi import HTTPException, status
+from config.firebase_config import get_async_firestore_client
+from services.bulk_delete import BATCH_LIMIT
+from services.cow_directory_cache import cow_directory_cache
+from services.farm_stats_service import FarmStatsService
+from services.http_clients import http_clients
+from services.livestock_cow_service import LivestockCowService, TRACE_UNAVAILABLE_MESSAGE
+from services.jobs import job_manager
+import asyncio
+import os
+import time
+import uuid
+
+# Firestore 'in' 조건에 넣을 수 있는 최대 값 수
+IN_QUERY_LIMIT = 30
+# 축산물이력제 동시 조회 수 / 초당 최대 조회 수
+BULK_TRACE_CONCURRENCY = int(os.getenv("BULK_TRACE_CONCURRENCY", "4"))
+BULK_TRACE_RATE_PER_SECOND = float(os.getenv("BULK_TRACE_RATE_PER_SECOND", "10"))
+# 배치 하나에 담을 젖소 수 (농장 통계 카운터 쓰기 1건 포함)
+COWS_PER_BATCH = BATCH_LIMIT - 1
+
+
+class _RateLimiter:
+    """요청 간격을 일정하게 유지하는 간단한 비동기 속도 제한기"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class BulkCowRegistrationService:
+    """
+    축산물이력제 정보 기반 젖소 일괄 등록 (농장 초기 등록용)
+
+    1. 요청 내 중복 / 기존 등록 여부를 'in' 조회로 한꺼번에 확인
+    2. 축산물이력제 정보를 동시 조회 수와 초당 조회 수를 제한하여 병렬 조회
+    3. 젖소 문서와 농장 통계 카운터를 배치 단위로 커밋
+    각 이표번호의 결과와 진행률은 작업 관리자(job_manager)의 작업 상태로 조회한다.
+    """
+
+    @staticmethod
+    async def start_job(cows: List[Dict], user: Dict) -> Dict:
+        """일괄 등록 작업 등록 (농장 단위로 조회/취소 가능)"""
+        return await job_manager.submit(
+            "bulk_cow_registration",
+            BulkCowRegistrationService.run_job,
+            cows,
+            user,
+            owner=user.get("farm_id"),
+            initial={
+                "message": "일괄 등록 대기 중입니다",
+                "total": len(cows),
+                "registered": 0,
+                "failed": 0,
+                "results": {}
+            }
+        )
+
+    @staticmethod
+    async def get_job(job_id: str, user: Dict) -> Dict:
+        """작업 상태 조회 (다른 농장의 작업은 조회 불가)"""
+        job = await job_manager.get(job_id, owner=user.get("farm_id"))
+        if job is None or job.get("kind") != "bulk_cow_registration":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="해당 일괄 등록 작업을 찾을 수 없습니다"
+            )
+        return job
+
+    @staticmethod
+    async def cancel_job(job_id: str, user: Dict) -> Dict:
+        """작업 취소 (이미 저장된 배치는 되돌리지 않음)"""
+        await BulkCowRegistrationService.get_job(job_id, user)
+        return await job_manager.cancel(job_id, owner=user.get("farm_id"))
+
+    @staticmethod
+    async def run_job(job_id: str, cows: List[Dict], user: Dict) -> None:
+        """일괄 등록 처리 (백그라운드 작업)"""
+        results: Dict[str, Dict] = {}
+        started = time.monotonic()
+        try:
+            db = get_async_firestore_client()
+            farm_id = user.get("farm_id")
+            job_manager.update(job_id, message="중복 여부를 확인 중입니다", progress=5)
+
+            # 1. 요청 내 중복 및 기존 등록 여부 확인
+            candidates = BulkCowRegistrationService._drop_request_duplicates(cows, results)
+            existing_tags = await BulkCowRegistrationService._find_existing(
+                db, 'ear_tag_number', [cow["ear_tag_number"] for cow in candidates]
+            )
+            existing_sensors = await BulkCowRegistrationService._find_existing(
+                db, 'sensor_number', [cow["sensor_number"] for cow in candidates if cow.get("sensor_number")], farm_id
+            )
+            remaining = []
+            for cow in candidates:
+                tag = cow["ear_tag_number"]
+                if tag in existing_tags:
+                    same_farm = existing_tags[tag].get("farm_id") == farm_id
+                    results[tag] = {
+                        "status": "already_registered",
+                        "message": f"이표번호 '{tag}'는 이미 {'등록되어' if same_farm else '다른 농장에서 등록되어'} 있습니다"
+                    }
+                elif cow.get("sensor_number") and cow["sensor_number"] in existing_sensors:
+                    results[tag] = {"status": "failed", "message": f"센서 번호 '{cow['sensor_number']}'는 이미 사용 중입니다"}
+                else:
+                    remaining.append(cow)
+            job_manager.update(job_id, message="축산물이력제 정보를 조회 중입니다", progress=10, results=results)
+
+            # 2. 축산물이력제 병렬 조회 (진행률 10% → 80%)
+            trace_data = await BulkCowRegistrationService._fetch_trace_data(job_id, remaining)
+            documents = []
+            current_time = datetime.utcnow()
+            for cow in remaining:
+                tag = cow["ear_tag_number"]
+                livestock_data = trace_data.get(tag)
+                if not livestock_data or not livestock_data.get("basic_info"):
+                    if not http_clients.available("ekape"):
+                        results[tag] = {"status": "manual_registration_required", "message": TRACE_UNAVAILABLE_MESSAGE}
+                    else:
+                        results[tag] = {"status": "not_found", "message": "축산물이력제에서 젖소 정보를 찾을 수 없습니다"}
+                    continue
+                cow_data = LivestockCowService._convert_livestock_data_to_cow(
+                    livestock_data, cow["user_provided_name"], cow.get("sensor_number"), cow.get("additional_notes")
+                )
+                documents.append((tag, {
+                    "id": str(uuid.uuid4()),
+                    **cow_data,
+                    "is_favorite": False,
+                    "farm_id": farm_id,
+                    "owner_id": user.get("id"),
+                    "created_at": current_time,
+                    "updated_at": current_time,
+                    "is_active": True,
+                    "livestock_trace_data": livestock_data,
+                    "registered_from_livestock_trace": True,
+                    "livestock_trace_registered_at": current_time
+                }))
+            job_manager.update(job_id, message="젖소 정보를 저장 중입니다", progress=80, results=results)
+
+            # 3. 배치 커밋 (젖소 문서 + 농장 통계 카운터)
+            await BulkCowRegistrationService._write_cows(db, farm_id, documents, results)
+            if documents:
+                cow_directory_cache.invalidate(farm_id)
+
+            registered = sum(1 for result in results.values() if result["status"] == "registered")
+            job_manager.update(
+                job_id,
+                status="completed",
+                message=f"{len(cows)}마리 중 {registered}마리 등록 완료",
+                progress=100,
+                registered=registered,
+                failed=len(results) - registered,
+                results=results,
+                elapsed_seconds=round(time.monotonic() - started, 3),
+                completed_at=datetime.utcnow().isoformat()
+            )
+            print(f"[INFO] 젖소 일괄 등록 완료 (farm_id={farm_id}): {registered}/{len(cows)}마리")
+
+        except Exception as e:
+            print(f"[ERROR] 젖소 일괄 등록 중 오류: {str(e)}")
+            job_manager.update(
+                job_id,
+                success=False,
+                status="failed",
+                message=f"일괄 등록 중 오류가 발생했습니다: {str(e)}",
+                error=str(e),
+                results=results,
+                elapsed_seconds=round(time.monotonic() - started, 3)
+            )
+
+    # ===== 내부 처리 =====
+
+    @staticmethod
+    def _drop_request_duplicates(cows: List[Dict], results: Dict[str, Dict]) -> List[Dict]:
+        """요청 안에서 이표번호/센서 번호가 겹치는 항목 제외 (먼저 나온 항목만 처리)"""
+        seen_tags, seen_sensors, unique = set(), set(), []
+        for cow in cows:
+            tag, sensor = cow["ear_tag_number"], cow.get("sensor_number")
+            if tag in seen_tags:
+                continue
+            seen_tags.add(tag)
+            if sensor and sensor in seen_sensors:
+                results[tag] = {"status": "failed", "message": f"센서 번호 '{sensor}'가 요청 안에서 중복되었습니다"}
+                continue
+            if sensor:
+                seen_sensors.add(sensor)
+            unique.append(cow)
+        return unique
+
+    @staticmethod
+    async def _find_existing(db, field: str, values: List[str], farm_id: Optional[str] = None) -> Dict[str, Dict]:
+        """활성 젖소 중 field 값이 values에 있는 문서 ('in' 조회를 나눠서 동시 실행)"""
+        if not values:
+            return {}
+
+        async def _query(chunk: List[str]):
+            query = db.collection('cows').where('is_active', '==', True)
+            if farm_id:
+                query = query.where('farm_id', '==', farm_id)
+            query = query.where(field, 'in', chunk).select([field, 'farm_id'])
+            return await query.get()
+
+        chunks = [values[i:i + IN_QUERY_LIMIT] for i in range(0, len(values), IN_QUERY_LIMIT)]
+        snapshots = await asyncio.gather(*(_query(chunk) for chunk in chunks))
+        existing = {}
+        for docs in snapshots:
+            for doc in docs:
+                data = doc.to_dict()
+                existing[data.get(field)] = data
+        return existing
+
+    @staticmethod
+    async def _fetch_trace_data(job_id: str, cows: List[Dict]) -> Dict[str, Optional[Dict]]:
+        """축산물이력제 기본정보 병렬 조회 (동시 조회 수 + 초당 조회 수 제한)"""
+        semaphore = asyncio.Semaphore(BULK_TRACE_CONCURRENCY)
+        limiter = _RateLimiter(BULK_TRACE_RATE_PER_SECOND)
+        trace_data: Dict[str, Optional[Dict]] = {}
+
+        async def _fetch(tag: str):
+            async with semaphore:
+                await limiter.wait()
+                trace_data[tag] = await LivestockCowService._fetch_livestock_trace_data(tag)
+            job_manager.update(job_id, progress=10 + 70 * len(trace_data) // len(cows))
+
+        await asyncio.gather(*(_fetch(cow["ear_tag_number"]) for cow in cows))
+        return trace_data
+
+    @staticmethod
+    async def _write_cows(db, farm_id: str, documents: List[tuple], results: Dict[str, Dict]) -> None:
+        """(이표번호, 젖소 문서) 목록을 배치 단위로 커밋 (배치마다 농장 통계 카운터를 함께 반영)"""
+        for i in range(0, len(documents), COWS_PER_BATCH):
+            chunk = documents[i:i + COWS_PER_BATCH]
+            try:
+                batch = db.batch()
+                for _, document in chunk:
+                    batch.set(db.collection('cows').document(document["id"]), document)
+                deltas = FarmStatsService.merge_deltas(*(FarmStatsService.cow_deltas(document) for _, document in chunk))
+                FarmStatsService.add_to_batch(batch, farm_id, deltas, db)
+                await batch.commit()
+                for tag, document in chunk:
+                    results[tag] = {
+                        "status": "registered",
+                        "message": "등록 완료",
+                        "cow_id": document["id"],
+                        "name": document["name"]
+                    }
+            except Exception as e:
+                print(f"[WARNING] 젖소 일괄 등록 배치 커밋 실패 ({len(chunk)}마리): {str(e)}")
+                for tag, _ in chunk:
+                    results[tag] = {"status": "failed", "message": f"저장 실패: {str(e)}"}
@@ -0,0 +1,125 @@
+# services/bulk_delete.py
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+from config.firebase_config import get_firestore_client
+import time
+
+# Firestore WriteBatch 한 번에 담을 수 있는 최대 작업 수
+BATCH_LIMIT = 500
+# 동시에 커밋할 배치 수
+MAX_PARALLEL_COMMITS = 4
+
+
+def _commit_chunks(db, refs: List, max_parallel: int) -> Dict:
+    """문서 참조 목록을 500개 단위 WriteBatch로 나눠 병렬 커밋 (커밋에 성공한 참조는 committed로 반환)"""
+    chunks = [refs[i:i + BATCH_LIMIT] for i in range(0, len(refs), BATCH_LIMIT)]
+
+    def _commit(chunk):
+        try:
+            batch = db.batch()
+            for ref in chunk:
+                batch.delete(ref)
+            batch.commit()
+            return chunk, 0
+        except Exception as e:
+            print(f"[WARNING] 배치 삭제 실패 ({len(chunk)}건): {str(e)}")
+            return [], len(chunk)
+
+    if len(chunks) == 1:
+        results = [_commit(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(chunks))) as executor:
+            results = list(executor.map(_commit, chunks))
+
+    committed = [ref for chunk, _ in results for ref in chunk]
+    return {
+        "deleted": len(committed),
+        "failed": sum(failed for _, failed in results),
+        "batches": len(chunks),
+        "committed": committed
+    }
+
+
+def delete_refs(
+    refs: Iterable,
+    label: str = "documents",
+    max_parallel: int = MAX_PARALLEL_COMMITS,
+    db=None
+) -> Dict:
+    """
+    이미 조회한 문서 참조들을 배치로 삭제
+
+    Returns:
+        {"label", "deleted", "failed", "batches", "committed", "elapsed_seconds"}
+        committed: 커밋에 성공한 문서 참조 목록 (실패한 배치의 참조는 포함하지 않음)
+    """
+    db = db or get_firestore_client()
+    started = time.monotonic()
+    refs = list(refs)
+    result = _commit_chunks(db, refs, max_parallel) if refs else {"deleted": 0, "failed": 0, "batches": 0, "committed": []}
+    result = {"label": label, **result, "elapsed_seconds": round(time.monotonic() - started, 3)}
+    if refs:
+        print(f"[INFO] 일괄 삭제 완료 ({label}): {result['deleted']}건 삭제, {result['failed']}건 실패")
+    return result
+
+
+def delete_query(
+    query,
+    label: str = "documents",
+    select_fields: Optional[List[str]] = None,
+    on_page: Optional[Callable[[List], None]] = None,
+    on_deleted: Optional[Callable[[List], None]] = None,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+    max_parallel: int = MAX_PARALLEL_COMMITS,
+    db=None
+) -> Dict:
+    """
+    쿼리에 해당하는 모든 문서를 페이지 단위로 조회하며 배치 삭제
+
+    - 한 페이지(최대 500 x max_parallel건)를 읽고 500건 단위 배치를 병렬 커밋한 뒤 다음 페이지를 읽는다
+    - 삭제된 문서는 다음 조회에서 빠지므로 커서 없이 같은 쿼리를 반복한다 (부등호 필터 쿼리도 그대로 사용 가능)
+    - select_fields: 삭제 전에 읽어야 할 필드 (기본값은 문서 ID만 조회)
+    - on_page(docs): 페이지를 삭제하기 전에 호출 (하위 컬렉션 정리 등)
+    - on_deleted(docs): 페이지 커밋 후 실제로 삭제된 문서만 전달 (카운터 감소 등 집계용)
+    - on_progress(progress): 페이지 삭제 후 누적 진행 상황 전달
+
+    Returns:
+        {"label", "deleted", "failed", "batches", "elapsed_seconds"}
+    """
+    db = db or get_firestore_client()
+    started = time.monotonic()
+    page_size = BATCH_LIMIT * max_parallel
+    # 빈 select()는 전체 필드를 반환하므로 필드가 없으면 문서 ID만 조회
+    page_query = query.select(select_fields or ["__name__"]).limit(page_size)
+
+    progress = {"label": label, "deleted": 0, "failed": 0, "batches": 0}
+    while True:
+        docs = list(page_query.stream())
+        if not docs:
+            break
+
+        if on_page:
+            on_page(docs)
+
+        page_result = _commit_chunks(db, [doc.reference for doc in docs], max_parallel)
+        if on_deleted and page_result["committed"]:
+            committed_paths = {ref.path for ref in page_result["committed"]}
+            on_deleted([doc for doc in docs if doc.reference.path in committed_paths])
+        for key in ("deleted", "failed", "batches"):
+            progress[key] += page_result[key]
+
+        if on_progress:
+            on_progress(dict(progress))
+        else:
+            print(f"[INFO] 일괄 삭제 진행 중 ({label}): {progress['deleted']}건 삭제")
+
+        # 마지막 페이지이거나 이번 페이지를 하나도 지우지 못했으면 종료 (무한 반복 방지)
+        if len(docs) < page_size or page_result["deleted"] == 0:
+            break
+
+    progress["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    if progress["deleted"] or progress["failed"]:
+        print(f"[INFO] 일괄 삭제 완료 ({label}): {progress['deleted']}건 삭제, "
+              f"{progress['failed']}건 실패, {progress['elapsed_seconds']}초")
+    return progress
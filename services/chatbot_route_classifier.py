@@ -0,0 +1,154 @@
+# services/chatbot_route_classifier.py
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+import os
+import random
+import re
+import threading
+
+# 로컬 분류 결과를 그대로 사용할 최소 신뢰도 (미만이면 LLM 분류)
+ROUTER_LOCAL_CONFIDENCE = float(os.getenv("ROUTER_LOCAL_CONFIDENCE", "0.75"))
+# 로컬 분류로 처리한 질문 중 LLM 분류와 비교(정확도 측정)할 비율
+ROUTER_SHADOW_RATE = float(os.getenv("ROUTER_SHADOW_RATE", "0.05"))
+# 근거가 적은 질문의 신뢰도를 낮추기 위한 사전값 (점수 합에 더함)
+EVIDENCE_PRIOR = 1.0
+
+ROUTES = ("rag", "cow_info", "general", "irrelevant")
+
+# 경로별 (정규식, 가중치) - classify_route_with_llm 프롬프트의 분류 기준과 예시를 옮긴 것
+ROUTE_PATTERNS: Dict[str, List[Tuple[str, float]]] = {
+    "cow_info": [
+        (r"\b\d{12}\b", 5.0),                                # 이표번호 (소 정보 노드는 이표번호로 조회)
+        (r"\d+\s*번\s*(소|젖소|개체)", 3.0),                   # "103번 소"
+        (r"(우리|내|저희)\s*(소|젖소|농장|목장|송아지)", 2.0),
+        (r"(등록된|키우는)\s*(소|젖소)", 2.0),
+        (r"(소|젖소)들?\s*(누구|몇\s*마리|목록)", 2.0),
+        (r"(어제|오늘|최근|지난주)\s*.*(분만|착유|발정|치료|접종)한", 2.0),
+        (r"기록", 1.0),
+    ],
+    "rag": [
+        (r"젖소|낙농|홀스타인|송아지|육성우|건유|착유기|원유|유방염|체세포|반추|조사료|TMR|유지방|유단백|유량", 2.0),
+        (r"착유|우유|발정|분만|사료|번식|수정|임신|백신|질병|축사|목초|사양|급여", 1.0),
+        (r"주기|원리|방법|이유|증상|예방|관리법|뜻|이란|란\s*무엇|역사|정책|기준", 1.0),
+    ],
+    "general": [
+        (r"^\s*(안녕|하이|hello|hi)\b|안녕하세요", 3.0),
+        (r"고마워|고맙|감사합니다|감사해", 3.0),
+        (r"(너|넌|당신)\s*(누구|뭐야|이름)|소담이", 3.0),
+        (r"이전\s*질문|아까\s*(뭐|질문)|방금\s*뭐", 3.0),
+        (r"귀엽|좋아해|사랑해|심심|ㅎㅎ|ㅋㅋ", 2.0),
+    ],
+    "irrelevant": [
+        (r"로또|주식|코인|비트코인|부동산|연예인|아이돌|게임|축구|야구|영화|드라마", 3.0),
+        (r"점심|저녁\s*메뉴|맛집|여행|날씨", 2.0),
+        (r"뭐\s*먹", 1.0),
+    ],
+}
+
+_COMPILED = {
+    route: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in patterns]
+    for route, patterns in ROUTE_PATTERNS.items()
+}
+
+
+@dataclass
+class RouteDecision:
+    """로컬 분류 결과"""
+    route: str
+    confidence: float
+    scores: Dict[str, float]
+
+    @property
+    def confident(self) -> bool:
+        return self.confidence >= ROUTER_LOCAL_CONFIDENCE
+
+
+class RouteClassifier:
+    """
+    챗봇 질문 경로 로컬 사전 분류기
+
+    - 경로별 키워드/정규식 가중치 합으로 점수를 내고 신뢰도 = 최고 점수 / (점수 합 + 사전값)으로 계산한다
+    - 신뢰도가 ROUTER_LOCAL_CONFIDENCE 이상이면 LLM 분류 호출을 생략한다
+    - 로컬로 처리한 질문 일부를 백그라운드에서 LLM으로도 분류하여 일치율(정확도)을 집계하고,
+      생략한 LLM 호출 수 × 평균 LLM 분류 시간으로 절약 시간을 추정한다
+    """
+
+    def __init__(self, shadow_rate: float = 0.05):
+        self.shadow_rate = shadow_rate
+        self._lock = threading.Lock()
+        self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="route-shadow")
+        self.local_routes = {route: 0 for route in ROUTES}
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.shadow_checked = 0
+        self.shadow_agreed = 0
+        self.fallback_agreed = 0
+        self.disagreements: Dict[str, int] = {}
+
+    def classify(self, question: str) -> RouteDecision:
+        """로컬 점수 기반 분류"""
+        scores = {route: 0.0 for route in ROUTES}
+        for route, patterns in _COMPILED.items():
+            for pattern, weight in patterns:
+                if pattern.search(question):
+                    scores[route] += weight
+
+        route = max(ROUTES, key=lambda name: scores[name])
+        total = sum(scores.values())
+        confidence = scores[route] / (total + EVIDENCE_PRIOR) if scores[route] > 0 else 0.0
+        return RouteDecision(route=route, confidence=round(confidence, 3), scores=scores)
+
+    def record_local(self, decision: RouteDecision, question: str, llm_classify: Callable[[str], str]) -> None:
+        """로컬 분류 사용 기록 (일부는 LLM 분류와 비교)"""
+        with self._lock:
+            self.local_routes[decision.route] += 1
+        if self.shadow_rate > 0 and random.random() < self.shadow_rate:
+            self._shadow_executor.submit(self._shadow_check, decision.route, question, llm_classify)
+
+    def record_llm(self, decision: RouteDecision, llm_route: str, seconds: float) -> None:
+        """LLM 분류 사용 기록 (신뢰도가 낮았던 로컬 추정과의 일치 여부 포함)"""
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+            if decision.route == llm_route:
+                self.fallback_agreed += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            local_total = sum(self.local_routes.values())
+            avg_llm_ms = self.llm_seconds / self.llm_calls * 1000 if self.llm_calls else None
+            return {
+                "confidence_threshold": ROUTER_LOCAL_CONFIDENCE,
+                "local_decisions": local_total,
+                "local_by_route": dict(self.local_routes),
+                "llm_calls": self.llm_calls,
+                "local_rate": round(local_total / (local_total + self.llm_calls), 4) if local_total + self.llm_calls else 0.0,
+                "avg_llm_classify_ms": round(avg_llm_ms, 1) if avg_llm_ms is not None else None,
+                "estimated_saved_seconds": round(local_total * avg_llm_ms / 1000, 1) if avg_llm_ms is not None else None,
+                # 로컬 분류 결과를 LLM 분류 기준으로 검증한 정확도
+                "shadow_checked": self.shadow_checked,
+                "shadow_accuracy": round(self.shadow_agreed / self.shadow_checked, 4) if self.shadow_checked else None,
+                "disagreements": dict(self.disagreements),
+                # 신뢰도가 낮아 LLM으로 넘긴 질문에서 로컬 추정이 맞은 비율 (임계값 조정 참고용)
+                "fallback_guess_accuracy": round(self.fallback_agreed / self.llm_calls, 4) if self.llm_calls else None
+            }
+
+    def _shadow_check(self, local_route: str, question: str, llm_classify: Callable[[str], str]) -> None:
+        try:
+            llm_route = llm_classify(question)
+        except Exception as e:
+            print(f"[WARNING] 질문 분류 비교(LLM) 실패: {str(e)}")
+            return
+        with self._lock:
+            self.shadow_checked += 1
+            if llm_route == local_route:
+                self.shadow_agreed += 1
+            else:
+                key = f"{local_route}->{llm_route}"
+                self.disagreements[key] = self.disagreements.get(key, 0) + 1
+
+
+# 전역 분류기
+route_classifier = RouteClassifier(shadow_rate=ROUTER_SHADOW_RATE)
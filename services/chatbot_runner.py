@@ -1,17 +1,14 @@
 # services/chatbot_runner.py
 
-from typing import TypedDict, Literal, Dict, List, Tuple
+from typing import TypedDict, Literal, Dict, List, Tuple, AsyncIterator, Callable, NamedTuple, Optional
 from langgraph.graph import StateGraph, START, END
 from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import StrOutputParser
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import TextLoader
-import os
+import asyncio
+import time
 from services.detailed_record_service import DetailedRecordService
+from services.llm_registry import llm_registry
+from services.rag_index import rag_index
+from services.chatbot_route_classifier import route_classifier
 from config.firebase_config import get_firestore_client
 import re
 from dotenv import load_dotenv
@@ -19,8 +16,6 @@ from dotenv import load_dotenv
 # 환경 변수 로드
 load_dotenv()
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
 # === 상태 정의 ===
 class DairyChatState(TypedDict):
     user_id: str
@@ -44,9 +39,27 @@ def append_chat_memory(user_id: str, chat_id: str, question: str, answer: str):
 
 # === 질문 분류 노드 ===
 def classify_question_route(state: DairyChatState) -> DairyChatState:
-    prompt = PromptTemplate(
-        input_variables=["question"],
-        template="""
+    question = state["current_question"]
+
+    # 로컬 사전 분류 - 신뢰도가 충분하면 LLM 분류 호출 생략
+    decision = route_classifier.classify(question)
+    if decision.confident:
+        route_classifier.record_local(decision, question, classify_route_with_llm)
+        result = decision.route
+    else:
+        started = time.monotonic()
+        result = classify_route_with_llm(question)
+        route_classifier.record_llm(decision, result, time.monotonic() - started)
+
+    return {
+        **state,
+        "answer_route": result,
+    }
+
+# 질문 분류 프롬프트 (로컬 분류 신뢰도가 낮을 때만 사용)
+CLASSIFY_ROUTE_PROMPT = PromptTemplate(
+    input_variables=["question"],
+    template="""
             당신은 낙농업 분야에 특화된 AI 챗봇 '소담이'입니다.
             사용자의 질문을 다음 네 가지 유형 중 하나로 분류하세요:
 
@@ -77,27 +90,22 @@ def classify_question_route(state: DairyChatState) -> DairyChatState:
             아래 중 하나만 출력하세요: rag / cow_info / general / irrelevant
             그 외 말은 절대 하지 마세요.
             """
-    )
+)
+llm_registry.register_chain("classify_route", CLASSIFY_ROUTE_PROMPT, "classifier")
 
-    llm = ChatOpenAI(temperature=0, model="gpt-4o-mini", openai_api_key=OPENAI_API_KEY)
-    chain = prompt | llm | StrOutputParser()
-    result = chain.invoke({"question": state["current_question"]})
+def classify_route_with_llm(question: str) -> str:
+    result = llm_registry.invoke("classify_route", {"question": question})
     result = result.replace('"', '').replace("'", '').strip().lower()
 
     if result not in {"rag", "cow_info", "general", "irrelevant"}:
         result = "irrelevant"
 
-    return {
-        **state,
-        "answer_route": result,
-    }
+    return result
 
 # === 일반 답변 노드 ===
-def generate_general_response(state: DairyChatState) -> DairyChatState:
-    memory_text = "\n".join(get_chat_memory(state["user_id"], state["chat_id"]))
-    prompt = PromptTemplate(
-        input_variables=["memory", "question"],
-        template="""
+GENERAL_ANSWER_PROMPT = PromptTemplate(
+    input_variables=["memory", "question"],
+    template="""
             당신은 낙농업 도우미 챗봇 '소담이'입니다.
             사용자와 자연스럽게 대화를 이어가며 친근하고 따뜻하게 답변해주세요.
 
@@ -112,53 +120,23 @@ def generate_general_response(state: DairyChatState) -> DairyChatState:
             - 40~70대 사용자도 이해할 수 있도록 어려운 단어나 전문용어 피하기
             - 줄바꿈(\\n), 따옴표, 특수기호 없이 자연스럽게 문장 구성
             """
-    )
-    llm = ChatOpenAI(temperature=0.5, model="gpt-4o-mini", openai_api_key=OPENAI_API_KEY)
-    chain = prompt | llm | StrOutputParser()
-    result = chain.invoke({
-        "memory": memory_text,
-        "question": state["current_question"]
-    })
-
-    append_chat_memory(state["user_id"], state["chat_id"], state["current_question"], result)
+)
+llm_registry.register_chain("general_answer", GENERAL_ANSWER_PROMPT, "general")
 
+def build_general_inputs(state: DairyChatState) -> Dict[str, str]:
+    memory_text = "\n".join(get_chat_memory(state["user_id"], state["chat_id"]))
     return {
-        **state,
-        "current_answer": result
+        "memory": memory_text,
+        "question": state["current_question"]
     }
 
-# === RAG 기반 답변 노드 ===
-_vectordb = None
-def build_or_load_vectordb():
-    global _vectordb
-    if _vectordb:
-        return _vectordb
-
-    persist_dir = "./chroma_dairy_knowledge"
-    embedding = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
-
-    if not os.path.exists(os.path.join(persist_dir, "chroma-collections.parquet")):
-        loader = TextLoader("dairy_farming_wiki.txt", encoding="utf-8")
-        raw_documents = loader.load()
-        splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-        chunks = splitter.split_documents(raw_documents)
-        vectordb = Chroma.from_documents(chunks, embedding, persist_directory=persist_dir)
-    else:
-        vectordb = Chroma(persist_directory=persist_dir, embedding_function=embedding)
-
-    _vectordb = vectordb
-    return vectordb
-
-def generate_rag_response(state: DairyChatState) -> DairyChatState:
-    vectordb = build_or_load_vectordb()
-    memory_text = "\n".join(get_chat_memory(state["user_id"], state["chat_id"]))
-    retriever = vectordb.as_retriever(search_kwargs={"k": 3})
-    docs = retriever.invoke(state["current_question"])
-    context = "\n".join([doc.page_content for doc in docs]) or "※ 참고 문서 없음"
+def generate_general_response(state: DairyChatState) -> DairyChatState:
+    return answer_with_chain("general", state)
 
-    prompt = PromptTemplate(
-        input_variables=["context", "memory", "question"],
-        template="""
+# === RAG 기반 답변 노드 ===
+RAG_ANSWER_PROMPT = PromptTemplate(
+    input_variables=["context", "memory", "question"],
+    template="""
             당신은 낙농업에 특화된 챗봇 '소담이'입니다.
             아래 참고 자료를 먼저 사용해서 답변하세요.
 
@@ -180,29 +158,23 @@ def generate_rag_response(state: DairyChatState) -> DairyChatState:
 
             [답변]
             """
-    )
+)
+llm_registry.register_chain("rag_answer", RAG_ANSWER_PROMPT, "rag")
 
-    llm = ChatOpenAI(temperature=0.3, model="gpt-4o-mini", streaming=True, openai_api_key=OPENAI_API_KEY)
+def build_rag_inputs(state: DairyChatState) -> Dict[str, str]:
     memory_text = "\n".join(get_chat_memory(state["user_id"], state["chat_id"]))
-
-    retriever = vectordb.as_retriever(search_kwargs={"k": 3})
-    docs = retriever.invoke(state["current_question"])
+    # 질문 임베딩/검색은 한 번만 수행 (같은 질문은 캐시 사용)
+    docs = rag_index.retrieve(state["current_question"])
     context = "\n\n".join([doc.page_content for doc in docs]) or "※ 참고할 문서가 없습니다."
-
-    chain = prompt | llm | StrOutputParser()
-    answer = chain.invoke({
+    return {
         "context": context,
         "memory": memory_text,
         "question": state["current_question"]
-    })
-
-    append_chat_memory(state["user_id"], state["chat_id"], state["current_question"], answer)
-
-    return {
-        **state,
-        "current_answer": answer
     }
 
+def generate_rag_response(state: DairyChatState) -> DairyChatState:
+    return answer_with_chain("rag", state)
+
 # === 농장 데이터 노드 (예시)
 def extract_ear_tag_number(question: str) -> str | None:
     # 12자리 이표번호 추출
@@ -306,6 +278,38 @@ def handle_irrelevant_question(state: DairyChatState) -> DairyChatState:
         "current_answer": answer
     }
 
+# === 답변 경로 정의 ===
+class AnswerRoute(NamedTuple):
+    node: str                                                   # 그래프 노드 이름
+    handler: Callable[[DairyChatState], DairyChatState]         # 그래프 노드 함수
+    chain: Optional[str] = None                                 # LLM 답변 경로의 체인 이름
+    build_inputs: Optional[Callable[[DairyChatState], Dict[str, str]]] = None
+
+# 분류 결과 → 답변 경로 (그래프 조건부 엣지와 스트리밍 답변이 모두 이 표를 사용)
+ANSWER_ROUTES: Dict[str, AnswerRoute] = {
+    "general": AnswerRoute("generate_general_answer", generate_general_response, "general_answer", build_general_inputs),
+    "rag": AnswerRoute("generate_rag_answer", generate_rag_response, "rag_answer", build_rag_inputs),
+    "cow_info": AnswerRoute("generate_cow_info_answer", generate_farmdata_response),
+    "irrelevant": AnswerRoute("handle_irrelevant_question", handle_irrelevant_question),
+}
+
+def answer_with_chain(route: str, state: DairyChatState) -> DairyChatState:
+    """LLM 답변 경로 노드: 체인을 한 번에 실행"""
+    answer_route = ANSWER_ROUTES[route]
+    started = time.monotonic()
+    answer = llm_registry.invoke(answer_route.chain, answer_route.build_inputs(state))
+    finish_chain_answer(route, state, answer, time.monotonic() - started)
+    return {
+        **state,
+        "current_answer": answer
+    }
+
+def finish_chain_answer(route: str, state: DairyChatState, answer: str, elapsed: float) -> None:
+    """LLM 답변 완료 처리 (대화 메모리 추가, RAG 첫 질문 지연 기록)"""
+    append_chat_memory(state["user_id"], state["chat_id"], state["current_question"], answer)
+    if route == "rag":
+        rag_index.record_first_question(elapsed)
+
 # === 라우팅 조건 함수
 def route_by_answer_type(state: DairyChatState) -> str:
     return state["answer_route"]
@@ -313,33 +317,54 @@ def route_by_answer_type(state: DairyChatState) -> str:
 # === LangGraph 정의
 builder = StateGraph(DairyChatState)
 builder.add_node("classify_question_route", classify_question_route)
-builder.add_node("generate_general_answer", generate_general_response)
-builder.add_node("generate_rag_answer", generate_rag_response)
-builder.add_node("generate_cow_info_answer", generate_farmdata_response)
-builder.add_node("handle_irrelevant_question", handle_irrelevant_question)
+for answer_route in ANSWER_ROUTES.values():
+    builder.add_node(answer_route.node, answer_route.handler)
+    builder.add_edge(answer_route.node, END)
 
 builder.add_edge(START, "classify_question_route")
 builder.add_conditional_edges("classify_question_route", route_by_answer_type, {
-    "general": "generate_general_answer",
-    "rag": "generate_rag_answer",
-    "cow_info": "generate_cow_info_answer",
-    "irrelevant": "handle_irrelevant_question",
+    route: answer_route.node for route, answer_route in ANSWER_ROUTES.items()
 })
-builder.add_edge("generate_general_answer", END)
-builder.add_edge("generate_rag_answer", END)
-builder.add_edge("generate_cow_info_answer", END)
-builder.add_edge("handle_irrelevant_question", END)
 
 sodamsodam_graph = builder.compile()
 
-# === 외부에서 호출되는 비동기 메인 함수 ===
-async def run_chatbot_graph(user_id: str, chat_id: str, question: str) -> str:
-    state = DairyChatState(
+def new_chat_state(user_id: str, chat_id: str, question: str) -> DairyChatState:
+    return DairyChatState(
         user_id=user_id,
         chat_id=chat_id,
         current_question=question,
         current_answer="",
         answer_route=""
     )
+
+# === 외부에서 호출되는 비동기 메인 함수 ===
+async def run_chatbot_graph(user_id: str, chat_id: str, question: str) -> str:
+    state = new_chat_state(user_id, chat_id, question)
     result = await sodamsodam_graph.ainvoke(state)
-    return result["current_answer"]
\ No newline at end of file
+    return result["current_answer"]
+
+async def stream_chatbot_graph(user_id: str, chat_id: str, question: str) -> AsyncIterator[str]:
+    """
+    그래프와 같은 경로 표(ANSWER_ROUTES)로 답변하되 LLM 답변은 토큰 단위로 바로 전달
+
+    - 질문 분류 / 문서 검색 등 동기 작업은 스레드에서 실행한다
+    - 체인이 있는 경로(rag / general)는 체인을 스트리밍하고, 완료 후 노드와 같은 완료 처리를 한다
+    - 나머지 경로(cow_info / irrelevant)는 노드를 그대로 실행하여 답변 전체를 한 번에 전달한다
+    """
+    state = await asyncio.to_thread(classify_question_route, new_chat_state(user_id, chat_id, question))
+    route = state["answer_route"]
+    answer_route = ANSWER_ROUTES[route]
+
+    if answer_route.chain is None:
+        result = await asyncio.to_thread(answer_route.handler, state)
+        yield result["current_answer"]
+        return
+
+    started = time.monotonic()
+    inputs = await asyncio.to_thread(answer_route.build_inputs, state)
+    tokens: List[str] = []
+    async for token in llm_registry.astream(answer_route.chain, inputs):
+        tokens.append(token)
+        yield token
+
+    finish_chain_answer(route, state, "".join(tokens), time.monotonic() - started)
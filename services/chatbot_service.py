@@ -1,11 +1,14 @@
 # services/chatbot_service.py
 
 from datetime import datetime, timedelta
-from config.firebase_config import get_firestore_client
+from config.firebase_config import get_firestore_client, get_async_firestore_client
 from firebase_admin import firestore
 from langchain_core.runnables import RunnableConfig
-from services.chatbot_runner import run_chatbot_graph
+from services.chatbot_runner import run_chatbot_graph, stream_chatbot_graph
 from schemas.chatbot_schema import AskRequest, ChatMessage, ChatRoom
+from services.bulk_delete import delete_query
+from services.pagination import paginate_query
+from typing import AsyncIterator, Optional
 import uuid
 
 
@@ -20,30 +23,53 @@ async def handle_user_question(data: AskRequest) -> str:
         question=data.question
     )
 
-    chat_ref = db.collection("chat_rooms").document(data.chat_id)
-    messages_ref = chat_ref.collection("messages")
+    await save_question_and_answer(data.chat_id, data.question, answer)
+
+    return answer
+
+
+# 1-1. 토큰 스트리밍 답변 + 완료 시 응답 저장
+async def stream_user_question(data: AskRequest) -> AsyncIterator[str]:
+    """답변 토큰을 생성되는 대로 전달하고, 스트림이 끝까지 완료된 경우에만 질문/답변 저장"""
+    asked_at = datetime.utcnow()
+    tokens = []
+    async for token in stream_chatbot_graph(
+        user_id=data.user_id,
+        chat_id=data.chat_id,
+        question=data.question
+    ):
+        tokens.append(token)
+        yield token
+
+    await save_question_and_answer(data.chat_id, data.question, "".join(tokens), asked_at)
+
+
+async def save_question_and_answer(chat_id: str, question: str, answer: str, asked_at: Optional[datetime] = None):
+    # 비동기 클라이언트로 질문/답변을 한 번의 배치로 저장 (이벤트 루프 블로킹 방지)
+    async_db = get_async_firestore_client()
+    messages_ref = async_db.collection("chat_rooms").document(chat_id).collection("messages")
 
     now = datetime.utcnow()
-    messages_ref.add({
+    batch = async_db.batch()
+    batch.set(messages_ref.document(), {
         "role": "user",
-        "content": data.question,
-        "timestamp": now
+        "content": question,
+        "timestamp": asked_at or now
     })
-    messages_ref.add({
+    batch.set(messages_ref.document(), {
         "role": "assistant",
         "content": answer,
         "timestamp": now
     })
-
-    return answer
+    await batch.commit()
 
 
-# 2. 채팅방 목록 조회
-def get_user_chat_rooms(user_id: str) -> list[ChatRoom]:
-    rooms = db.collection("chat_rooms") \
-        .where("user_id", "==", user_id) \
-        .order_by("created_at", direction=firestore.Query.DESCENDING) \
-        .stream()
+# 2. 채팅방 목록 조회 (limit 지정 시 created_at 내림차순 커서 페이지네이션)
+def get_user_chat_rooms(user_id: str, limit: Optional[int] = None, cursor: Optional[str] = None) -> tuple[list[ChatRoom], Optional[str]]:
+    rooms, next_cursor = paginate_query(
+        db.collection("chat_rooms").where("user_id", "==", user_id),
+        "created_at", firestore.Query.DESCENDING, limit, cursor
+    )
 
     return [
         ChatRoom(
@@ -52,7 +78,7 @@ def get_user_chat_rooms(user_id: str) -> list[ChatRoom]:
             created_at=room.to_dict()["created_at"]
         )
         for room in rooms
-    ]
+    ], next_cursor
 
 
 # 3. 새 채팅방 생성
@@ -84,13 +110,12 @@ def update_chat_room_name(chat_id: str, name: str) -> bool:
         return False
 
 
-# 5. 특정 채팅방의 메시지 불러오기
-def get_chat_history(chat_id: str) -> list[ChatMessage]:
-    messages = db.collection("chat_rooms") \
-        .document(chat_id) \
-        .collection("messages") \
-        .order_by("timestamp") \
-        .stream()
+# 5. 특정 채팅방의 메시지 불러오기 (limit 지정 시 timestamp 오름차순 커서 페이지네이션)
+def get_chat_history(chat_id: str, limit: Optional[int] = None, cursor: Optional[str] = None) -> tuple[list[ChatMessage], Optional[str]]:
+    messages, next_cursor = paginate_query(
+        db.collection("chat_rooms").document(chat_id).collection("messages"),
+        "timestamp", firestore.Query.ASCENDING, limit, cursor
+    )
 
     return [
         ChatMessage(
@@ -99,16 +124,15 @@ def get_chat_history(chat_id: str) -> list[ChatMessage]:
             timestamp=msg.to_dict()["timestamp"]
         )
         for msg in messages
-    ]
+    ], next_cursor
 
 
 # 6. 채팅방 및 메시지 삭제
 def delete_chat_room(chat_id: str) -> bool:
     chat_ref = db.collection("chat_rooms").document(chat_id)
 
-    messages = chat_ref.collection("messages").stream()
-    for msg in messages:
-        msg.reference.delete()
+    # 메시지는 500건 단위 배치로 일괄 삭제
+    delete_query(chat_ref.collection("messages"), label=f"chat_rooms/{chat_id}/messages")
 
     chat_ref.delete()
 
@@ -118,9 +142,14 @@ def delete_chat_room(chat_id: str) -> bool:
 # 7. 14일 지난 채팅방 자동 삭제
 def delete_old_chat_rooms():
     limit_date = datetime.utcnow() - timedelta(days=14)
-    old_chats = db.collection("chat_rooms") \
-        .where("created_at", "<", limit_date) \
-        .stream()
 
-    for chat in old_chats:
-        delete_chat_room(chat.id)
\ No newline at end of file
+    # 채팅방별 메시지를 먼저 지운 뒤 채팅방 문서를 배치로 일괄 삭제
+    def _delete_messages(chat_docs):
+        for chat in chat_docs:
+            delete_query(chat.reference.collection("messages"), label=f"chat_rooms/{chat.id}/messages")
+
+    return delete_query(
+        db.collection("chat_rooms").where("created_at", "<", limit_date),
+        label="expired chat_rooms",
+        on_page=_delete_messages
+    )
\ No newline at end of file
@@ -0,0 +1,162 @@
+# services/circuit_breaker.py
+
+from collections import deque
+from typing import Dict
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 외부 API 호출을 하지 않음"""
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} 외부 API 차단기 열림 - 호출 생략")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    외부 API 차단기 (closed → open → half_open → closed)
+
+    - 연속 실패가 failure_threshold에 도달하면 open: recovery_seconds 동안 호출하지 않고 바로 실패
+    - recovery_seconds가 지나면 half_open: 시험 호출 1건만 허용
+    - 시험 호출이 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened_count = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def is_open(self) -> bool:
+        """호출해도 바로 실패할 상태인지 (시험 호출 슬롯은 사용하지 않음)"""
+        return self.state == "open"
+
+    def allow_request(self) -> bool:
+        """호출 허용 여부 (half_open이면 시험 호출 1건만 허용)"""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != "closed":
+                print(f"[INFO] {self.name} 외부 API 차단기 닫힘 (복구 확인)")
+            self._state = "closed"
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            probe_failed = self._probe_in_flight
+            self._probe_in_flight = False
+            if probe_failed or (self._state == "closed" and self._failures >= self.failure_threshold):
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self.opened_count += 1
+                print(f"[WARNING] {self.name} 외부 API 차단기 열림 (연속 실패 {self._failures}회, {self.recovery_seconds}초 후 재시도)")
+
+    def release(self) -> None:
+        """결과 없이 끝난 호출(취소 등)의 시험 호출 슬롯 반환"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_seconds": self.recovery_seconds,
+                "retry_in_seconds": round(max(0.0, self._opened_at + self.recovery_seconds - time.monotonic()), 1) if state == "open" else 0.0,
+                "opened_count": self.opened_count,
+                "rejected": self.rejected
+            }
+
+    def _current_state(self) -> str:
+        """open 상태에서 복구 대기 시간이 지났으면 half_open으로 전환 (락을 잡은 상태에서 호출)"""
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.recovery_seconds:
+            self._state = "half_open"
+        return self._state
+
+
+class AdaptiveTimeout:
+    """
+    최근 응답 시간 분포에 맞춰 조정되는 타임아웃
+
+    최근 window개 성공 응답 시간의 percentile 값 × multiplier를 [minimum, maximum] 범위로 제한하여 사용한다.
+    표본이 min_samples보다 적으면 maximum을 사용한다.
+    타임아웃이 나면 표본을 비워 다시 maximum부터 학습한다 (외부 API가 느려졌는데
+    예전 표본 기준의 짧은 타임아웃으로 계속 실패하여 차단기가 열린 채 남지 않도록).
+    """
+
+    def __init__(self, minimum: float, maximum: float, percentile: float = 0.95, multiplier: float = 2.0,
+                 window: int = 200, min_samples: int = 20):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.resets = 0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def observe_timeout(self, applied: float) -> None:
+        """타임아웃 발생 기록 (maximum보다 짧은 타임아웃이었으면 표본을 비워 maximum으로 복귀)"""
+        with self._lock:
+            self.timeouts += 1
+            if applied < self.maximum and self._samples:
+                self._samples.clear()
+                self.resets += 1
+
+    def current(self) -> float:
+        """현재 적용할 타임아웃 (초)"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return self.maximum
+            latency = self._percentile_value()
+        return min(self.maximum, max(self.minimum, latency * self.multiplier))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            samples = len(self._samples)
+            latency = self._percentile_value() if samples else None
+        return {
+            "samples": samples,
+            f"p{int(self.percentile * 100)}_ms": round(latency * 1000, 1) if latency is not None else None,
+            "timeout_seconds": round(self.current(), 2),
+            "min_seconds": self.minimum,
+            "max_seconds": self.maximum,
+            "timeouts": self.timeouts,
+            "resets": self.resets
+        }
+
+    def _percentile_value(self) -> float:
+        """락을 잡은 상태에서 호출"""
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
@@ -0,0 +1,189 @@
+# services/cow_directory_cache.py
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional
+from config.firebase_config import get_firestore_client
+import os
+import threading
+import time
+
+# 젖소 디렉터리에 보관하는 필드 (이름/이표번호 조회용)
+DIRECTORY_FIELDS = ["id", "name", "ear_tag_number", "health_status", "breeding_status", "is_active"]
+
+
+class CowDirectoryCache:
+    """
+    농장별 젖소 디렉터리 캐시 (cow_id → 이름, 이표번호, 상태)
+
+    - 농장 단위로 한 번에 적재하고 TTL이 지나면 다시 읽는다
+    - 최대 농장 수를 넘으면 가장 오래 사용하지 않은 농장부터 제거 (LRU)
+    - 젖소 생성/수정/삭제 시 해당 농장 항목을 명시적으로 무효화해야 한다
+    - 무효화는 농장별 세대 번호를 올리며, 적재 중에 세대가 바뀌면 적재 결과를 저장하지 않는다
+    - 같은 농장(같은 세대)의 동시 미스는 한 번의 적재를 함께 기다린다
+    - 디렉터리에 없는 젖소는 cows/{cow_id} 문서를 직접 확인한다
+      (다른 워커에서 방금 생성된 젖소는 이 프로세스의 캐시 무효화가 되지 않기 때문)
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_farms: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_farms = max_farms
+        self._farms: "OrderedDict[str, tuple]" = OrderedDict()  # farm_id → (적재 시각, {cow_id: 정보})
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}           # farm_id → 무효화 세대
+        self._loads: Dict[tuple, Future] = {}             # (farm_id, 세대) → 진행 중인 적재
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.coalesced = 0
+        self.stale_loads = 0
+        self.direct_lookups = 0
+        self.direct_found = 0
+
+    def get(self, farm_id: str, cow_id: str) -> Optional[Dict]:
+        """젖소 디렉터리 항목 조회 (디렉터리와 cows 문서 모두에 없으면 None)"""
+        if not farm_id or not cow_id:
+            return None
+        cow = self.get_directory(farm_id).get(cow_id)
+        if cow is not None:
+            return cow
+
+        # 디렉터리 미스 - 다른 워커에서 생성된 젖소일 수 있으므로 문서를 직접 확인
+        with self._lock:
+            generation = self._generations.get(farm_id, 0)
+        cow = self._load_cow(farm_id, cow_id)
+        with self._lock:
+            self.direct_lookups += 1
+            if cow is None:
+                return None
+            self.direct_found += 1
+            entry = self._farms.get(farm_id)
+            if entry and self._generations.get(farm_id, 0) == generation:
+                # 조회 중인 다른 스레드가 있을 수 있으므로 복사본으로 교체
+                self._farms[farm_id] = (entry[0], {**entry[1], cow_id: cow})
+        return cow
+
+    def get_directory(self, farm_id: str) -> Dict[str, Dict]:
+        """농장 전체 젖소 디렉터리 조회 (캐시 미스/만료 시 Firestore에서 적재)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._farms.get(farm_id)
+            if entry and now - entry[0] < self.ttl_seconds:
+                self._farms.move_to_end(farm_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generations.get(farm_id, 0)
+            load_key = (farm_id, generation)
+            pending = self._loads.get(load_key)
+            if pending is None:
+                pending = self._loads[load_key] = Future()
+                is_loader = True
+            else:
+                self.coalesced += 1
+                is_loader = False
+
+        if not is_loader:
+            return pending.result()
+
+        try:
+            directory = self._load_directory(farm_id)
+        except BaseException as e:
+            with self._lock:
+                self._loads.pop(load_key, None)
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._loads.pop(load_key, None)
+            if self._generations.get(farm_id, 0) == generation:
+                self._farms[farm_id] = (now, directory)
+                self._farms.move_to_end(farm_id)
+                while len(self._farms) > self.max_farms:
+                    self._farms.popitem(last=False)
+                    self.evictions += 1
+            else:
+                # 적재 중에 무효화됨 - 쓰기 이전 내용일 수 있으므로 저장하지 않음
+                self.stale_loads += 1
+        pending.set_result(directory)
+        return directory
+
+    def invalidate(self, farm_id: Optional[str]) -> None:
+        """농장 디렉터리 무효화 (젖소 생성/수정/삭제 후 호출)"""
+        if not farm_id:
+            return
+        with self._lock:
+            self._generations[farm_id] = self._generations.get(farm_id, 0) + 1
+            if self._farms.pop(farm_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """전체 캐시 비우기"""
+        with self._lock:
+            self._farms.clear()
+
+    def stats(self) -> Dict:
+        """캐시 크기 산정용 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "farms_cached": len(self._farms),
+                "cows_cached": sum(len(entry[1]) for entry in self._farms.values()),
+                "max_farms": self.max_farms,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "coalesced_misses": self.coalesced,
+                "stale_loads_discarded": self.stale_loads,
+                "direct_lookups": self.direct_lookups,
+                "direct_found": self.direct_found
+            }
+
+    @staticmethod
+    def _load_directory(farm_id: str) -> Dict[str, Dict]:
+        """농장의 젖소 디렉터리를 Firestore에서 한 번에 적재"""
+        db = get_firestore_client()
+        cows_query = (db.collection('cows')
+                     .where('farm_id', '==', farm_id)
+                     .select(DIRECTORY_FIELDS)
+                     .get())
+
+        return {
+            cow_doc.id: CowDirectoryCache._directory_entry(cow_doc.id, farm_id, cow_doc.to_dict())
+            for cow_doc in cows_query
+        }
+
+    @staticmethod
+    def _load_cow(farm_id: str, cow_id: str) -> Optional[Dict]:
+        """젖소 문서 한 건 직접 조회 (다른 농장 젖소면 None)"""
+        db = get_firestore_client()
+        cow_doc = db.collection('cows').document(cow_id).get()
+        if not cow_doc.exists:
+            return None
+        cow_data = cow_doc.to_dict()
+        if cow_data.get("farm_id") != farm_id:
+            return None
+        return CowDirectoryCache._directory_entry(cow_id, farm_id, cow_data)
+
+    @staticmethod
+    def _directory_entry(cow_id: str, farm_id: str, cow_data: Dict) -> Dict:
+        return {
+            "id": cow_id,
+            "farm_id": farm_id,
+            "name": cow_data.get("name", "알 수 없음"),
+            "ear_tag_number": cow_data.get("ear_tag_number", "N/A"),
+            "health_status": cow_data.get("health_status"),
+            "breeding_status": cow_data.get("breeding_status"),
+            "is_active": cow_data.get("is_active", True)
+        }
+
+
+# 전역 캐시 인스턴스
+cow_directory_cache = CowDirectoryCache(
+    ttl_seconds=int(os.getenv("COW_DIRECTORY_CACHE_TTL", "300")),
+    max_farms=int(os.getenv("COW_DIRECTORY_CACHE_MAX_FARMS", "256"))
+)
@@ -1,9 +1,13 @@
 # services/cow_firebase_service.py
 
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from fastapi import HTTPException, status
 from config.firebase_config import get_firestore_client
+from services.cow_directory_cache import cow_directory_cache
+from services.farm_stats_service import FarmStatsService
+from services.bulk_delete import delete_query
+from services.pagination import paginate_query
 from schemas.cow import (
     CowCreate, CowResponse, CowUpdate, HealthStatus, BreedingStatus,
     CowDetailUpdate, CowDetailResponse, Temperament, MilkingBehavior
@@ -70,8 +74,14 @@ class CowFirebaseService:
                 "is_active": True
             }
             
-            # Firestore에 젖소 정보 저장
-            db.collection('cows').document(cow_id).set(cow_document)
+            # Firestore에 젖소 정보 저장 (농장 통계 카운터와 함께 커밋)
+            FarmStatsService.set_with_stats(
+                db.collection('cows').document(cow_id),
+                cow_document,
+                farm_id,
+                FarmStatsService.cow_deltas(cow_document)
+            )
+            cow_directory_cache.invalidate(farm_id)
             
             # 응답 데이터 구성
             return CowResponse(
@@ -102,13 +112,25 @@ class CowFirebaseService:
     
     @staticmethod
     def get_cows_by_farm(farm_id: str, is_active: bool = True) -> List[CowResponse]:
-        """농장별 젖소 목록 조회 - 500 오류 해결"""
+        """농장별 젖소 목록 조회 (전체)"""
+        return CowFirebaseService.get_cows_page(farm_id, is_active=is_active)[0]
+    
+    @staticmethod
+    def get_cows_page(
+        farm_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        is_active: bool = True
+    ) -> Tuple[List[CowResponse], Optional[str]]:
+        """농장별 젖소 목록 페이지 조회 (created_at 내림차순 커서 페이지네이션) - 500 오류 해결"""
+        next_cursor = None
         try:
-            cows_query = (db.collection('cows')
-                         .where('farm_id', '==', farm_id)
-                         .where('is_active', '==', is_active)
-                         .order_by('created_at', direction='DESCENDING')
-                         .get())
+            cows_query, next_cursor = paginate_query(
+                db.collection('cows')
+                  .where('farm_id', '==', farm_id)
+                  .where('is_active', '==', is_active),
+                'created_at', 'DESCENDING', limit, cursor
+            )
             
             cows = []
             for cow_doc in cows_query:
@@ -155,12 +177,15 @@ class CowFirebaseService:
                     print(f"[WARNING] 젖소 처리 실패 (ID: {cow_doc.id}): {str(cow_error)}")
                     continue
             
-            return cows
+            return cows, next_cursor
             
+        except HTTPException:
+            # 잘못된 커서 등 요청 오류는 그대로 전달
+            raise
         except Exception as e:
             # 전체 실패 시에도 빈 배열 반환 (500 오류 방지)
             print(f"[ERROR] 젖소 목록 조회 전체 실패 (farm_id: {farm_id}): {str(e)}")
-            return []
+            return [], None
     
     @staticmethod
     def get_cow_by_id(cow_id: str, farm_id: str) -> Optional[CowResponse]:
@@ -278,8 +303,9 @@ class CowFirebaseService:
             if cow_update.notes is not None:
                 update_data["notes"] = cow_update.notes
             
-            # Firestore 업데이트
-            db.collection('cows').document(cow_id).update(update_data)
+            # Firestore 업데이트 (상태 변경 시 농장 통계 카운터도 함께 이동)
+            FarmStatsService.update_cow_with_stats(cow_id, update_data, farm_id)
+            cow_directory_cache.invalidate(farm_id)
             
             # 업데이트된 젖소 정보 반환
             return CowFirebaseService.get_cow_by_id(cow_id, farm_id)
@@ -306,32 +332,46 @@ class CowFirebaseService:
                     detail="젖소를 찾을 수 없습니다"
                 )
             
-            # 1. 젖소 관련 모든 기록 삭제
-            # 상세 기록 삭제
-            detailed_records_query = (db.collection('cow_detailed_records')
-                                    .where('cow_id', '==', cow_id)
-                                    .where('farm_id', '==', farm_id)
-                                    .get())
+            # 1. 젖소 관련 모든 기록 일괄 삭제 (실제로 커밋된 기록만큼만 농장 통계 카운터 감소)
+            record_deltas = {}
             
-            for record in detailed_records_query:
-                record.reference.delete()
+            def _collect_deltas(section):
+                def _on_deleted(docs):
+                    nonlocal record_deltas
+                    record_deltas = FarmStatsService.merge_deltas(
+                        record_deltas,
+                        *[FarmStatsService.record_deltas(section, doc.to_dict(), -1) for doc in docs]
+                    )
+                return _on_deleted
             
-            # 기본 기록 삭제
-            basic_records_query = (db.collection('cow_records')
-                                 .where('cow_id', '==', cow_id)
-                                 .where('farm_id', '==', farm_id)
-                                 .get())
+            # 상세 기록 삭제
+            detailed_result = delete_query(
+                db.collection('cow_detailed_records')
+                  .where('cow_id', '==', cow_id)
+                  .where('farm_id', '==', farm_id),
+                label="cow_detailed_records",
+                select_fields=["record_type", "is_active"],
+                on_deleted=_collect_deltas("detailed_records")
+            )
             
-            for record in basic_records_query:
-                record.reference.delete()
+            # 기본 기록 삭제
+            basic_result = delete_query(
+                db.collection('cow_records')
+                  .where('cow_id', '==', cow_id)
+                  .where('farm_id', '==', farm_id),
+                label="cow_records",
+                select_fields=["record_type", "is_active"],
+                on_deleted=_collect_deltas("basic_records")
+            )
             
-            # 2. 젖소 정보 완전 삭제
-            db.collection('cows').document(cow_id).delete()
+            # 2. 젖소 정보 완전 삭제 (농장 통계 카운터와 함께 커밋)
+            FarmStatsService.delete_cow_with_stats(cow_id, farm_id, record_deltas)
+            cow_directory_cache.invalidate(farm_id)
             
             return {
                 "message": f"젖소 '{existing_cow.name}' (이표번호: {existing_cow.ear_tag_number})와 관련된 모든 데이터가 완전히 삭제되었습니다",
                 "cow_id": cow_id,
-                "deleted_records_count": len(detailed_records_query) + len(basic_records_query)
+                "deleted_records_count": detailed_result["deleted"] + basic_result["deleted"]
             }
             
         except Exception as e:
@@ -364,6 +404,7 @@ class CowFirebaseService:
                 "is_favorite": new_favorite_status,
                 "updated_at": datetime.utcnow()
             })
+            cow_directory_cache.invalidate(farm_id)
             
             action = "추가" if new_favorite_status else "제거"
             
@@ -447,23 +488,15 @@ class CowFirebaseService:
     def _get_cow_info(cow_id: str, farm_id: str) -> Dict:
         """젖소 기본 정보 조회 (안전한 처리)"""
         try:
-            cow_doc = db.collection('cows').document(cow_id).get()
+            # 농장별 디렉터리 캐시에서 조회 (다른 농장 젖소는 조회되지 않음)
+            cow_data = cow_directory_cache.get(farm_id, cow_id)
             
-            if not cow_doc.exists:
+            if not cow_data:
                 return {
                     "name": "알 수 없음",
                     "ear_tag_number": "N/A"
                 }
             
-            cow_data = cow_doc.to_dict()
-            
-            # 농장 ID 확인 (보안)
-            if cow_data.get("farm_id") != farm_id:
-                return {
-                    "name": "알 수 없음", 
-                    "ear_tag_number": "N/A"
-                }
-            
             return {
                 "name": cow_data.get("name", "알 수 없음"),
                 "ear_tag_number": cow_data.get("ear_tag_number", "N/A")
@@ -544,297 +577,298 @@ class CowFirebaseService:
             print(f"[WARNING] 키 값 추출 실패 (record_type: {record_type}): {str(e)}")
             return {}
 
-# 젖소 상세 정보 업데이트
-@staticmethod
-def update_cow_details(cow_id: str, cow_detail_update: CowDetailUpdate, user: Dict) -> CowDetailResponse:
-    """젖소 상세 정보 업데이트 (수정하기 화면에서 사용)"""
-    try:
-        farm_id = user.get("farm_id")
-        
-        # 기존 젖소 정보 확인
-        existing_cow = CowFirebaseService.get_cow_by_id(cow_id, farm_id)
-        if not existing_cow:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="젖소를 찾을 수 없습니다"
-            )
-        
-        current_time = datetime.utcnow()
-        
-        # 업데이트할 데이터 구성
-        update_data = {
-            "updated_at": current_time,
-            "detail_updated_at": current_time,
-            "has_detailed_info": True  # 상세 정보 입력 플래그
-        }
-        
-        # 기본 정보 업데이트
-        if cow_detail_update.name is not None:
-            update_data["name"] = cow_detail_update.name
-        if cow_detail_update.birthdate is not None:
-            update_data["birthdate"] = cow_detail_update.birthdate
-        if cow_detail_update.sensor_number is not None:
-            update_data["sensor_number"] = cow_detail_update.sensor_number
-        if cow_detail_update.health_status is not None:
-            update_data["health_status"] = cow_detail_update.health_status.value
-        if cow_detail_update.breeding_status is not None:
-            update_data["breeding_status"] = cow_detail_update.breeding_status.value
-        if cow_detail_update.breed is not None:
-            update_data["breed"] = cow_detail_update.breed
-        if cow_detail_update.notes is not None:
-            update_data["notes"] = cow_detail_update.notes
-        
-        # 상세 정보 업데이트
-        detailed_info = {}
-        
-        # 신체 정보
-        if any([cow_detail_update.body_weight, cow_detail_update.body_height, 
-                cow_detail_update.body_length, cow_detail_update.chest_girth, 
-                cow_detail_update.body_condition_score]):
-            detailed_info["body_info"] = {
-                "weight": cow_detail_update.body_weight,
-                "height": cow_detail_update.body_height,
-                "body_length": cow_detail_update.body_length,
-                "chest_girth": cow_detail_update.chest_girth,
-                "body_condition_score": cow_detail_update.body_condition_score
-            }
-        
-        # 생산 정보
-        if any([cow_detail_update.lactation_number, cow_detail_update.milk_yield_record,
-                cow_detail_update.lifetime_milk_yield, cow_detail_update.average_daily_yield]):
-            detailed_info["production_info"] = {
-                "lactation_number": cow_detail_update.lactation_number,
-                "milk_yield_record": cow_detail_update.milk_yield_record,
-                "lifetime_milk_yield": cow_detail_update.lifetime_milk_yield,
-                "average_daily_yield": cow_detail_update.average_daily_yield
-            }
-        
-        # 번식 정보
-        if any([cow_detail_update.first_calving_date, cow_detail_update.last_calving_date,
-                cow_detail_update.total_calves, cow_detail_update.breeding_efficiency]):
-            detailed_info["breeding_info"] = {
-                "first_calving_date": cow_detail_update.first_calving_date,
-                "last_calving_date": cow_detail_update.last_calving_date,
-                "total_calves": cow_detail_update.total_calves,
-                "breeding_efficiency": cow_detail_update.breeding_efficiency
-            }
-        
-        # 건강 정보
-        if any([cow_detail_update.vaccination_status, cow_detail_update.last_health_check,
-                cow_detail_update.chronic_conditions, cow_detail_update.allergy_info]):
-            detailed_info["health_info"] = {
-                "vaccination_status": cow_detail_update.vaccination_status,
-                "last_health_check": cow_detail_update.last_health_check,
-                "chronic_conditions": cow_detail_update.chronic_conditions or [],
-                "allergy_info": cow_detail_update.allergy_info
-            }
-        
-        # 관리 정보
-        if any([cow_detail_update.purchase_date, cow_detail_update.purchase_price,
-                cow_detail_update.current_value, cow_detail_update.insurance_policy,
-                cow_detail_update.special_management]):
-            detailed_info["management_info"] = {
-                "purchase_date": cow_detail_update.purchase_date,
-                "purchase_price": cow_detail_update.purchase_price,
-                "current_value": cow_detail_update.current_value,
-                "insurance_policy": cow_detail_update.insurance_policy,
-                "special_management": cow_detail_update.special_management
-            }
-        
-        # 혈통 정보
-        if any([cow_detail_update.mother_id, cow_detail_update.father_info,
-                cow_detail_update.genetic_info]):
-            detailed_info["pedigree_info"] = {
-                "mother_id": cow_detail_update.mother_id,
-                "father_info": cow_detail_update.father_info,
-                "genetic_info": cow_detail_update.genetic_info
-            }
-        
-        # 사료 정보
-        if any([cow_detail_update.feed_type, cow_detail_update.daily_feed_amount,
-                cow_detail_update.supplement_info]):
-            detailed_info["feed_info"] = {
-                "feed_type": cow_detail_update.feed_type,
-                "daily_feed_amount": cow_detail_update.daily_feed_amount,
-                "supplement_info": cow_detail_update.supplement_info
-            }
-        
-        # 위치 정보
-        if any([cow_detail_update.barn_section, cow_detail_update.stall_number]):
-            detailed_info["location_info"] = {
-                "barn_section": cow_detail_update.barn_section,
-                "stall_number": cow_detail_update.stall_number
-            }
-        
-        # 행동 특성
-        if any([cow_detail_update.temperament, cow_detail_update.milking_behavior,
-                cow_detail_update.retirement_plan]):
-            detailed_info["behavioral_info"] = {
-                "temperament": cow_detail_update.temperament.value if cow_detail_update.temperament else None,
-                "milking_behavior": cow_detail_update.milking_behavior.value if cow_detail_update.milking_behavior else None,
-                "retirement_plan": cow_detail_update.retirement_plan
+    # 젖소 상세 정보 업데이트
+    @staticmethod
+    def update_cow_details(cow_id: str, cow_detail_update: CowDetailUpdate, user: Dict) -> CowDetailResponse:
+        """젖소 상세 정보 업데이트 (수정하기 화면에서 사용)"""
+        try:
+            farm_id = user.get("farm_id")
+            
+            # 기존 젖소 정보 확인
+            existing_cow = CowFirebaseService.get_cow_by_id(cow_id, farm_id)
+            if not existing_cow:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="젖소를 찾을 수 없습니다"
+                )
+            
+            current_time = datetime.utcnow()
+            
+            # 업데이트할 데이터 구성
+            update_data = {
+                "updated_at": current_time,
+                "detail_updated_at": current_time,
+                "has_detailed_info": True  # 상세 정보 입력 플래그
             }
-        
-        # 상세 정보가 있다면 업데이트
-        if detailed_info:
-            update_data["detailed_info"] = detailed_info
-        
-        # Firestore 업데이트
-        db.collection('cows').document(cow_id).update(update_data)
-        
-        # 업데이트된 젖소 상세 정보 반환
-        return CowFirebaseService.get_cow_details_by_id(cow_id, farm_id)
-        
-    except Exception as e:
-        if isinstance(e, HTTPException):
-            raise e
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"젖소 상세 정보 업데이트 중 오류가 발생했습니다: {str(e)}"
-        )
-
-# 젖소 상세 정보 포함 조회
-@staticmethod
-def get_cow_details_by_id(cow_id: str, farm_id: str) -> Optional[CowDetailResponse]:
-    """젖소 상세 정보 포함하여 조회"""
-    try:
-        cow_doc = db.collection('cows').document(cow_id).get()
-        
-        if not cow_doc.exists:
-            return None
-        
-        cow_data = cow_doc.to_dict()
-        
-        # 농장 ID 확인 (보안)
-        if cow_data.get("farm_id") != farm_id:
-            return None
-        
-        # 상세 정보 추출
-        detailed_info = cow_data.get("detailed_info", {})
-        body_info = detailed_info.get("body_info", {})
-        production_info = detailed_info.get("production_info", {})
-        breeding_info = detailed_info.get("breeding_info", {})
-        health_info = detailed_info.get("health_info", {})
-        management_info = detailed_info.get("management_info", {})
-        pedigree_info = detailed_info.get("pedigree_info", {})
-        feed_info = detailed_info.get("feed_info", {})
-        location_info = detailed_info.get("location_info", {})
-        behavioral_info = detailed_info.get("behavioral_info", {})
-        
-        # HealthStatus와 BreedingStatus 안전하게 변환
-        health_status = None
-        if cow_data.get("health_status"):
-            try:
-                health_status = HealthStatus(cow_data["health_status"])
-            except ValueError:
-                print(f"[WARNING] 잘못된 health_status 값: {cow_data['health_status']} (젖소 ID: {cow_data['id']})")
-                health_status = HealthStatus.NORMAL
-        
-        breeding_status = None
-        if cow_data.get("breeding_status"):
-            try:
-                breeding_status = BreedingStatus(cow_data["breeding_status"])
-            except ValueError:
-                print(f"[WARNING] 잘못된 breeding_status 값: {cow_data['breeding_status']} (젖소 ID: {cow_data['id']})")
-                breeding_status = None
-                
-        return CowDetailResponse(
-            # 기본 정보
-            id=cow_data["id"],
-            ear_tag_number=cow_data["ear_tag_number"],
-            name=cow_data["name"],
-            birthdate=cow_data.get("birthdate"),
-            sensor_number=cow_data.get("sensor_number"),
-            health_status=health_status,
-            breeding_status=breeding_status,
-            breed=cow_data.get("breed"),
-            notes=cow_data.get("notes"),
-            is_favorite=cow_data.get("is_favorite", False),
-            farm_id=cow_data["farm_id"],
-            owner_id=cow_data["owner_id"],
-            created_at=cow_data["created_at"],
-            updated_at=cow_data["updated_at"],
-            is_active=cow_data["is_active"],
-            
-            # 상세 정보 메타데이터
-            has_detailed_info=cow_data.get("has_detailed_info", False),
-            detail_updated_at=cow_data.get("detail_updated_at"),
+            
+            # 기본 정보 업데이트
+            if cow_detail_update.name is not None:
+                update_data["name"] = cow_detail_update.name
+            if cow_detail_update.birthdate is not None:
+                update_data["birthdate"] = cow_detail_update.birthdate
+            if cow_detail_update.sensor_number is not None:
+                update_data["sensor_number"] = cow_detail_update.sensor_number
+            if cow_detail_update.health_status is not None:
+                update_data["health_status"] = cow_detail_update.health_status.value
+            if cow_detail_update.breeding_status is not None:
+                update_data["breeding_status"] = cow_detail_update.breeding_status.value
+            if cow_detail_update.breed is not None:
+                update_data["breed"] = cow_detail_update.breed
+            if cow_detail_update.notes is not None:
+                update_data["notes"] = cow_detail_update.notes
+            
+            # 상세 정보 업데이트
+            detailed_info = {}
             
             # 신체 정보
-            body_weight=body_info.get("weight"),
-            body_height=body_info.get("height"),
-            body_length=body_info.get("body_length"),
-            chest_girth=body_info.get("chest_girth"),
-            body_condition_score=body_info.get("body_condition_score"),
+            if any([cow_detail_update.body_weight, cow_detail_update.body_height, 
+                    cow_detail_update.body_length, cow_detail_update.chest_girth, 
+                    cow_detail_update.body_condition_score]):
+                detailed_info["body_info"] = {
+                    "weight": cow_detail_update.body_weight,
+                    "height": cow_detail_update.body_height,
+                    "body_length": cow_detail_update.body_length,
+                    "chest_girth": cow_detail_update.chest_girth,
+                    "body_condition_score": cow_detail_update.body_condition_score
+                }
             
             # 생산 정보
-            lactation_number=production_info.get("lactation_number"),
-            milk_yield_record=production_info.get("milk_yield_record"),
-            lifetime_milk_yield=production_info.get("lifetime_milk_yield"),
-            average_daily_yield=production_info.get("average_daily_yield"),
+            if any([cow_detail_update.lactation_number, cow_detail_update.milk_yield_record,
+                    cow_detail_update.lifetime_milk_yield, cow_detail_update.average_daily_yield]):
+                detailed_info["production_info"] = {
+                    "lactation_number": cow_detail_update.lactation_number,
+                    "milk_yield_record": cow_detail_update.milk_yield_record,
+                    "lifetime_milk_yield": cow_detail_update.lifetime_milk_yield,
+                    "average_daily_yield": cow_detail_update.average_daily_yield
+                }
             
             # 번식 정보
-            first_calving_date=breeding_info.get("first_calving_date"),
-            last_calving_date=breeding_info.get("last_calving_date"),
-            total_calves=breeding_info.get("total_calves"),
-            breeding_efficiency=breeding_info.get("breeding_efficiency"),
+            if any([cow_detail_update.first_calving_date, cow_detail_update.last_calving_date,
+                    cow_detail_update.total_calves, cow_detail_update.breeding_efficiency]):
+                detailed_info["breeding_info"] = {
+                    "first_calving_date": cow_detail_update.first_calving_date,
+                    "last_calving_date": cow_detail_update.last_calving_date,
+                    "total_calves": cow_detail_update.total_calves,
+                    "breeding_efficiency": cow_detail_update.breeding_efficiency
+                }
             
             # 건강 정보
-            vaccination_status=health_info.get("vaccination_status"),
-            last_health_check=health_info.get("last_health_check"),
-            chronic_conditions=health_info.get("chronic_conditions"),
-            allergy_info=health_info.get("allergy_info"),
+            if any([cow_detail_update.vaccination_status, cow_detail_update.last_health_check,
+                    cow_detail_update.chronic_conditions, cow_detail_update.allergy_info]):
+                detailed_info["health_info"] = {
+                    "vaccination_status": cow_detail_update.vaccination_status,
+                    "last_health_check": cow_detail_update.last_health_check,
+                    "chronic_conditions": cow_detail_update.chronic_conditions or [],
+                    "allergy_info": cow_detail_update.allergy_info
+                }
             
             # 관리 정보
-            purchase_date=management_info.get("purchase_date"),
-            purchase_price=management_info.get("purchase_price"),
-            current_value=management_info.get("current_value"),
-            insurance_policy=management_info.get("insurance_policy"),
-            special_management=management_info.get("special_management"),
+            if any([cow_detail_update.purchase_date, cow_detail_update.purchase_price,
+                    cow_detail_update.current_value, cow_detail_update.insurance_policy,
+                    cow_detail_update.special_management]):
+                detailed_info["management_info"] = {
+                    "purchase_date": cow_detail_update.purchase_date,
+                    "purchase_price": cow_detail_update.purchase_price,
+                    "current_value": cow_detail_update.current_value,
+                    "insurance_policy": cow_detail_update.insurance_policy,
+                    "special_management": cow_detail_update.special_management
+                }
             
             # 혈통 정보
-            mother_id=pedigree_info.get("mother_id"),
-            father_info=pedigree_info.get("father_info"),
-            genetic_info=pedigree_info.get("genetic_info"),
+            if any([cow_detail_update.mother_id, cow_detail_update.father_info,
+                    cow_detail_update.genetic_info]):
+                detailed_info["pedigree_info"] = {
+                    "mother_id": cow_detail_update.mother_id,
+                    "father_info": cow_detail_update.father_info,
+                    "genetic_info": cow_detail_update.genetic_info
+                }
             
             # 사료 정보
-            feed_type=feed_info.get("feed_type"),
-            daily_feed_amount=feed_info.get("daily_feed_amount"),
-            supplement_info=feed_info.get("supplement_info"),
+            if any([cow_detail_update.feed_type, cow_detail_update.daily_feed_amount,
+                    cow_detail_update.supplement_info]):
+                detailed_info["feed_info"] = {
+                    "feed_type": cow_detail_update.feed_type,
+                    "daily_feed_amount": cow_detail_update.daily_feed_amount,
+                    "supplement_info": cow_detail_update.supplement_info
+                }
             
             # 위치 정보
-            barn_section=location_info.get("barn_section"),
-            stall_number=location_info.get("stall_number"),
+            if any([cow_detail_update.barn_section, cow_detail_update.stall_number]):
+                detailed_info["location_info"] = {
+                    "barn_section": cow_detail_update.barn_section,
+                    "stall_number": cow_detail_update.stall_number
+                }
             
             # 행동 특성
-            temperament=Temperament(behavioral_info["temperament"]) if behavioral_info.get("temperament") else None,
-            milking_behavior=MilkingBehavior(behavioral_info["milking_behavior"]) if behavioral_info.get("milking_behavior") else None,
-            retirement_plan=behavioral_info.get("retirement_plan")
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"젖소 상세 정보 조회 중 오류가 발생했습니다: {str(e)}"
-        )
+            if any([cow_detail_update.temperament, cow_detail_update.milking_behavior,
+                    cow_detail_update.retirement_plan]):
+                detailed_info["behavioral_info"] = {
+                    "temperament": cow_detail_update.temperament.value if cow_detail_update.temperament else None,
+                    "milking_behavior": cow_detail_update.milking_behavior.value if cow_detail_update.milking_behavior else None,
+                    "retirement_plan": cow_detail_update.retirement_plan
+                }
+            
+            # 상세 정보가 있다면 업데이트
+            if detailed_info:
+                update_data["detailed_info"] = detailed_info
+            
+            # Firestore 업데이트
+            FarmStatsService.update_cow_with_stats(cow_id, update_data, farm_id)
+            cow_directory_cache.invalidate(farm_id)
+            
+            # 업데이트된 젖소 상세 정보 반환
+            return CowFirebaseService.get_cow_details_by_id(cow_id, farm_id)
+            
+        except Exception as e:
+            if isinstance(e, HTTPException):
+                raise e
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"젖소 상세 정보 업데이트 중 오류가 발생했습니다: {str(e)}"
+            )
 
-# 젖소 상세 정보 여부 확인
-@staticmethod
-def check_has_detailed_info(cow_id: str, farm_id: str) -> bool:
-    """젖소가 상세 정보를 가지고 있는지 확인"""
-    try:
-        cow_doc = db.collection('cows').document(cow_id).get()
-        
-        if not cow_doc.exists:
-            return False
-        
-        cow_data = cow_doc.to_dict()
-        
-        # 농장 ID 확인
-        if cow_data.get("farm_id") != farm_id:
-            return False
-        
-        return cow_data.get("has_detailed_info", False)
-        
-    except Exception as e:
-        return False
\ No newline at end of file
+    # 젖소 상세 정보 포함 조회
+    @staticmethod
+    def get_cow_details_by_id(cow_id: str, farm_id: str) -> Optional[CowDetailResponse]:
+        """젖소 상세 정보 포함하여 조회"""
+        try:
+            cow_doc = db.collection('cows').document(cow_id).get()
+            
+            if not cow_doc.exists:
+                return None
+            
+            cow_data = cow_doc.to_dict()
+            
+            # 농장 ID 확인 (보안)
+            if cow_data.get("farm_id") != farm_id:
+                return None
+            
+            # 상세 정보 추출
+            detailed_info = cow_data.get("detailed_info", {})
+            body_info = detailed_info.get("body_info", {})
+            production_info = detailed_info.get("production_info", {})
+            breeding_info = detailed_info.get("breeding_info", {})
+            health_info = detailed_info.get("health_info", {})
+            management_info = detailed_info.get("management_info", {})
+            pedigree_info = detailed_info.get("pedigree_info", {})
+            feed_info = detailed_info.get("feed_info", {})
+            location_info = detailed_info.get("location_info", {})
+            behavioral_info = detailed_info.get("behavioral_info", {})
+            
+            # HealthStatus와 BreedingStatus 안전하게 변환
+            health_status = None
+            if cow_data.get("health_status"):
+                try:
+                    health_status = HealthStatus(cow_data["health_status"])
+                except ValueError:
+                    print(f"[WARNING] 잘못된 health_status 값: {cow_data['health_status']} (젖소 ID: {cow_data['id']})")
+                    health_status = HealthStatus.NORMAL
+            
+            breeding_status = None
+            if cow_data.get("breeding_status"):
+                try:
+                    breeding_status = BreedingStatus(cow_data["breeding_status"])
+                except ValueError:
+                    print(f"[WARNING] 잘못된 breeding_status 값: {cow_data['breeding_status']} (젖소 ID: {cow_data['id']})")
+                    breeding_status = None
+                    
+            return CowDetailResponse(
+                # 기본 정보
+                id=cow_data["id"],
+                ear_tag_number=cow_data["ear_tag_number"],
+                name=cow_data["name"],
+                birthdate=cow_data.get("birthdate"),
+                sensor_number=cow_data.get("sensor_number"),
+                health_status=health_status,
+                breeding_status=breeding_status,
+                breed=cow_data.get("breed"),
+                notes=cow_data.get("notes"),
+                is_favorite=cow_data.get("is_favorite", False),
+                farm_id=cow_data["farm_id"],
+                owner_id=cow_data["owner_id"],
+                created_at=cow_data["created_at"],
+                updated_at=cow_data["updated_at"],
+                is_active=cow_data["is_active"],
+                
+                # 상세 정보 메타데이터
+                has_detailed_info=cow_data.get("has_detailed_info", False),
+                detail_updated_at=cow_data.get("detail_updated_at"),
+                
+                # 신체 정보
+                body_weight=body_info.get("weight"),
+                body_height=body_info.get("height"),
+                body_length=body_info.get("body_length"),
+                chest_girth=body_info.get("chest_girth"),
+                body_condition_score=body_info.get("body_condition_score"),
+                
+                # 생산 정보
+                lactation_number=production_info.get("lactation_number"),
+                milk_yield_record=production_info.get("milk_yield_record"),
+                lifetime_milk_yield=production_info.get("lifetime_milk_yield"),
+                average_daily_yield=production_info.get("average_daily_yield"),
+                
+                # 번식 정보
+                first_calving_date=breeding_info.get("first_calving_date"),
+                last_calving_date=breeding_info.get("last_calving_date"),
+                total_calves=breeding_info.get("total_calves"),
+                breeding_efficiency=breeding_info.get("breeding_efficiency"),
+                
+                # 건강 정보
+                vaccination_status=health_info.get("vaccination_status"),
+                last_health_check=health_info.get("last_health_check"),
+                chronic_conditions=health_info.get("chronic_conditions"),
+                allergy_info=health_info.get("allergy_info"),
+                
+                # 관리 정보
+                purchase_date=management_info.get("purchase_date"),
+                purchase_price=management_info.get("purchase_price"),
+                current_value=management_info.get("current_value"),
+                insurance_policy=management_info.get("insurance_policy"),
+                special_management=management_info.get("special_management"),
+                
+                # 혈통 정보
+                mother_id=pedigree_info.get("mother_id"),
+                father_info=pedigree_info.get("father_info"),
+                genetic_info=pedigree_info.get("genetic_info"),
+                
+                # 사료 정보
+                feed_type=feed_info.get("feed_type"),
+                daily_feed_amount=feed_info.get("daily_feed_amount"),
+                supplement_info=feed_info.get("supplement_info"),
+                
+                # 위치 정보
+                barn_section=location_info.get("barn_section"),
+                stall_number=location_info.get("stall_number"),
+                
+                # 행동 특성
+                temperament=Temperament(behavioral_info["temperament"]) if behavioral_info.get("temperament") else None,
+                milking_behavior=MilkingBehavior(behavioral_info["milking_behavior"]) if behavioral_info.get("milking_behavior") else None,
+                retirement_plan=behavioral_info.get("retirement_plan")
+            )
+            
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"젖소 상세 정보 조회 중 오류가 발생했습니다: {str(e)}"
+            )
+
+    # 젖소 상세 정보 여부 확인
+    @staticmethod
+    def check_has_detailed_info(cow_id: str, farm_id: str) -> bool:
+        """젖소가 상세 정보를 가지고 있는지 확인"""
+        try:
+            cow_doc = db.collection('cows').document(cow_id).get()
+            
+            if not cow_doc.exists:
+                return False
+            
+            cow_data = cow_doc.to_dict()
+            
+            # 농장 ID 확인
+            if cow_data.get("farm_id") != farm_id:
+                return False
+            
+            return cow_data.get("has_detailed_info", False)
+            
+        except Exception as e:
+            return False
\ No newline at end of file
@@ -0,0 +1,81 @@
+# services/cow_loader.py
+
+from typing import Dict, Iterable, List, Optional
+from config.firebase_config import get_firestore_client
+
+
+class CowLoader:
+    """
+    요청 단위 젖소 정보 배치 로더
+
+    목록을 만드는 동안 필요한 cow_id를 모아 두었다가 db.get_all() 한 번으로 조회한다.
+    같은 요청 안에서는 조회 결과(없는 젖소 포함)를 기억해 다시 읽지 않는다.
+    """
+
+    # Firestore get_all 한 번에 넘길 문서 수
+    BATCH_SIZE = 100
+
+    def __init__(self, farm_id: Optional[str] = None, db=None):
+        self.farm_id = farm_id
+        self._db = db
+        self._pending: List[str] = []
+        self._results: Dict[str, Optional[Dict]] = {}
+
+    def prime(self, cow_ids: Iterable[Optional[str]]) -> "CowLoader":
+        """조회할 cow_id 등록 (중복/빈 값 제거)"""
+        for cow_id in cow_ids:
+            if cow_id and cow_id not in self._results and cow_id not in self._pending:
+                self._pending.append(cow_id)
+        return self
+
+    def load(self) -> None:
+        """등록된 cow_id를 배치 multi-get으로 한 번에 조회"""
+        if not self._pending:
+            return
+
+        db = self._db or get_firestore_client()
+        pending, self._pending = self._pending, []
+
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            chunk = pending[start:start + self.BATCH_SIZE]
+            refs = [db.collection('cows').document(cow_id) for cow_id in chunk]
+
+            # get_all은 요청 순서를 보장하지 않으므로 문서 ID로 매핑
+            for cow_id in chunk:
+                self._results[cow_id] = None
+            try:
+                for cow_doc in db.get_all(refs):
+                    if cow_doc.exists:
+                        self._results[cow_doc.id] = cow_doc.to_dict()
+            except Exception as e:
+                # 조회 실패 시 해당 젖소들은 정보 없음으로 처리 (목록 조회는 계속 진행)
+                print(f"[WARNING] 젖소 정보 배치 조회 실패 ({len(chunk)}건): {str(e)}")
+
+    def get(self, cow_id: Optional[str]) -> Optional[Dict]:
+        """
+        젖소 정보 반환
+
+        존재하지 않거나, 다른 농장 소속이거나, 비활성화된 젖소는 None
+        """
+        if not cow_id:
+            return None
+
+        if cow_id not in self._results:
+            self.prime([cow_id])
+            self.load()
+
+        cow_data = self._results.get(cow_id)
+        if cow_data is None:
+            return None
+        if self.farm_id and cow_data.get("farm_id") != self.farm_id:
+            return None
+        if not cow_data.get("is_active", True):
+            return None
+        return cow_data
+
+    def load_many(self, cow_ids: Iterable[Optional[str]]) -> Dict[str, Optional[Dict]]:
+        """여러 cow_id를 한 번에 조회해 {cow_id: 젖소 정보 또는 None} 반환"""
+        cow_ids = [cow_id for cow_id in cow_ids if cow_id]
+        self.prime(cow_ids)
+        self.load()
+        return {cow_id: self.get(cow_id) for cow_id in cow_ids}
@@ -1,12 +1,79 @@
 # services/detailed_record_service.py
 
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from fastapi import HTTPException, status
 from config.firebase_config import get_firestore_client
+from services.cow_directory_cache import cow_directory_cache
+from services.farm_stats_service import FarmStatsService
+from services.pagination import paginate_query
 from schemas.detailed_record import *
 import uuid
 
+# 목록(DetailedRecordSummary) 조회 시 읽는 기본 필드 - record_data 전체는 내려받지 않는다
+SUMMARY_BASE_FIELDS = [
+    "id", "cow_id", "record_type", "record_date", "title", "description", "created_at", "updated_at"
+]
+
+# 기록 유형별로 _extract_key_values가 읽는 record_data 하위 필드
+# (_extract_key_values에 항목을 추가하면 이 표에도 함께 추가해야 목록에 표시된다)
+SUMMARY_KEY_VALUE_FIELDS: Dict[str, List[str]] = {
+    DetailedRecordType.MILKING.value: ["milk_yield", "milking_session", "fat_percentage"],
+    DetailedRecordType.WEIGHT.value: [
+        "weight", "body_condition_score", "measurement_method", "measurement_time",
+        "height_withers", "body_length", "chest_girth", "growth_rate", "target_weight",
+        "weight_category", "measurer", "notes"
+    ],
+    DetailedRecordType.ESTRUS.value: [
+        "estrus_intensity", "estrus_duration", "visual_signs", "next_expected_estrus", "breeding_planned"
+    ],
+    DetailedRecordType.PREGNANCY_CHECK.value: ["check_result", "pregnancy_stage"],
+    DetailedRecordType.CALVING.value: ["calf_count", "calving_difficulty"],
+    DetailedRecordType.FEED.value: ["feed_amount", "feed_type"],
+    DetailedRecordType.VACCINATION.value: [
+        "vaccination_time", "vaccine_name", "vaccine_type", "vaccine_batch", "dosage",
+        "injection_site", "injection_method", "administrator", "vaccine_manufacturer",
+        "expiry_date", "adverse_reaction", "reaction_details", "next_vaccination_due", "cost", "notes"
+    ],
+    DetailedRecordType.TREATMENT.value: [
+        "diagnosis", "treatment_cost", "treatment_method", "veterinarian", "medication_used",
+        "treatment_duration", "follow_up_date", "withdrawal_period", "side_effects",
+        "treatment_response", "notes"
+    ],
+    DetailedRecordType.HEALTH_CHECK.value: [
+        "body_temperature", "body_condition_score", "heart_rate", "respiratory_rate",
+        "mobility_score", "appetite_level", "activity_level", "remarks", "check_time",
+        "examiner", "eye_condition", "nose_condition", "coat_condition", "hoof_condition",
+        "udder_condition", "abnormal_symptoms", "next_check_date"
+    ],
+    DetailedRecordType.INSEMINATION.value: [
+        "insemination_time", "bull_id", "bull_breed", "semen_batch", "semen_quality",
+        "technician_name", "insemination_method", "cervix_condition", "success_probability",
+        "cost", "pregnancy_check_scheduled", "notes"
+    ],
+}
+
+
+def summary_fields(*record_types, with_key_values: bool = True) -> List[str]:
+    """
+    목록 조회용 select() 필드 목록
+
+    record_types를 생략하면 모든 기록 유형의 주요 수치 필드를 포함한다.
+    with_key_values=False이면 기본 필드만 반환한다.
+    """
+    fields = list(SUMMARY_BASE_FIELDS)
+    if not with_key_values:
+        return fields
+
+    types = [getattr(t, "value", t) for t in record_types if t] or list(SUMMARY_KEY_VALUE_FIELDS)
+    for record_type in types:
+        for field in SUMMARY_KEY_VALUE_FIELDS.get(record_type, []):
+            path = f"record_data.{field}"
+            if path not in fields:
+                fields.append(path)
+    return fields
+
+
 class DetailedRecordService:
     
     @staticmethod
@@ -103,8 +170,13 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            # Firestore에 저장
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            # Firestore에 저장 (농장 통계 카운터와 함께 커밋)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -174,7 +246,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             print("🔥 저장될 record_data:", estrus_data)
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -247,7 +324,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -319,7 +401,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -396,7 +483,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -470,7 +562,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -546,7 +643,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -621,7 +723,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -693,7 +800,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -771,7 +883,12 @@ class DetailedRecordService:
                 "is_active": True
             }
             
-            db.collection('cow_detailed_records').document(record_id).set(record_document)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_detailed_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("detailed_records", record_document)
+            )
             
             return DetailedRecordResponse(
                 id=record_id,
@@ -801,6 +918,17 @@ class DetailedRecordService:
     @staticmethod
     def get_detailed_records_by_cow(cow_id: str, farm_id: str, record_type: Optional[DetailedRecordType] = None, limit: int = 100) -> List[DetailedRecordSummary]:
         """특정 젖소의 상세 기록 목록 조회 (500 오류 해결)"""
+        return DetailedRecordService.get_detailed_records_page(cow_id, farm_id, record_type, limit)[0]
+    
+    @staticmethod
+    def get_detailed_records_page(
+        cow_id: str,
+        farm_id: str,
+        record_type: Optional[DetailedRecordType] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[DetailedRecordSummary], Optional[str]]:
+        """특정 젖소의 상세 기록 목록 페이지 조회 (record_date 내림차순 커서 페이지네이션)"""
         try:
             db = get_firestore_client()
             
@@ -825,8 +953,11 @@ class DetailedRecordService:
             if record_type:
                 query = query.where('record_type', '==', record_type.value)
             
-            # 정렬 및 제한 적용
-            records_query = query.order_by('record_date', direction='DESCENDING').limit(limit).get()
+            # 요약에 필요한 필드만 조회
+            query = query.select(summary_fields(record_type))
+            
+            # 정렬 및 커서/제한 적용
+            records_query, next_cursor = paginate_query(query, 'record_date', 'DESCENDING', limit, cursor)
             
             records = []
             for record_doc in records_query:
@@ -857,7 +988,7 @@ class DetailedRecordService:
                     print(f"[WARNING] 기록 처리 실패 (ID: {record_doc.id}): {str(record_error)}")
                     continue
             
-            return records
+            return records, next_cursor
             
         except Exception as e:
             if isinstance(e, HTTPException):
@@ -924,11 +1055,11 @@ class DetailedRecordService:
             
             existing_record = DetailedRecordService.get_detailed_record_by_id(record_id, farm_id)
             
-            db.collection('cow_detailed_records').document(record_id).update({
+            FarmStatsService.update_record_with_stats('cow_detailed_records', "detailed_records", record_id, {
                 "is_active": False,
                 "updated_at": datetime.utcnow(),
                 "deleted_at": datetime.utcnow()
-            })
+            }, farm_id)
             
             return {
                 "message": f"기록 '{existing_record.title}'이 삭제되었습니다",
@@ -991,18 +1122,10 @@ class DetailedRecordService:
     def _get_cow_info(cow_id: str, farm_id: str) -> Dict:
         """젖소 정보 조회 (내부 사용) - 안전한 오류 처리"""
         try:
-            db = get_firestore_client()
-            cow_doc = db.collection('cows').document(cow_id).get()
-            
-            if not cow_doc.exists:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="젖소를 찾을 수 없습니다"
-                )
-            
-            cow_data = cow_doc.to_dict()
+            # 농장별 디렉터리 캐시에서 조회 (다른 농장 젖소는 조회되지 않음)
+            cow_data = cow_directory_cache.get(farm_id, cow_id)
             
-            if cow_data.get("farm_id") != farm_id or not cow_data.get("is_active", True):
+            if not cow_data or not cow_data.get("is_active", True):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="젖소를 찾을 수 없습니다"
@@ -0,0 +1,59 @@
+# services/ekape_xml.py
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Union
+import xml.etree.ElementTree as ET
+
+# 응답 item에서 실제로 사용하는 필드 (routers/livestock_trace.py, services/livestock_cow_service.py 파서 기준)
+MAPPED_FIELDS: FrozenSet[str] = frozenset({
+    # 기본 개체정보 (optionNo=1)
+    "cattleNo", "birthYmd", "lsTypeNm", "sexNm", "monthDiff", "nationNm", "farmUniqueNo", "farmNo", "lsdYmd",
+    # 농장 등록 정보 (optionNo=2)
+    "farmAddr", "farmerNm", "regType", "regYmd",
+    # 도축 / 포장 정보 (optionNo=3, 4)
+    "butcheryPlaceAddr", "butcheryPlaceNm", "butcheryYmd", "gradeNm", "insfat", "inspectPassYn",
+    "processPlaceAddr", "processPlaceNm",
+    # 구제역 백신 / 질병 / 브루셀라·결핵 (optionNo=5, 6, 7)
+    "injectionDayCnt", "injectionYmd", "vaccineorder", "inspectDesc", "inspectDt", "inspectYn",
+    "tbcInspectYmd", "tbcInspectRsltNm",
+})
+
+
+def parse_trace_items(
+    body: Union[bytes, Iterable[bytes]],
+    fields: Optional[FrozenSet[str]] = MAPPED_FIELDS
+) -> Optional[List[Dict[str, str]]]:
+    """
+    축산물이력제 XML 응답 파싱 (응답 바이트를 조금씩 넣으면서 처리)
+
+    - 응답을 문자열로 디코딩하지 않고 바이트(또는 스트리밍 청크)를 그대로 넣는다
+    - 트리 전체를 유지하지 않고 item이 완성될 때마다 필드를 꺼낸 뒤 비운다
+    - resultCode와 fields에 포함된 item 필드만 추출한다 (fields=None이면 모든 필드)
+
+    Returns:
+        아이템 목록, 정상 응답이지만 데이터가 없으면 빈 목록, 결과코드 오류/XML 오류면 None
+    """
+    chunks = (body,) if isinstance(body, (bytes, bytearray)) else body
+    parser = ET.XMLPullParser(events=("end",))
+    items: List[Dict[str, str]] = []
+
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                tag = element.tag
+                if tag == "item":
+                    item_data = {}
+                    for child in element:
+                        if child.text and (fields is None or child.tag in fields):
+                            item_data[child.tag] = child.text.strip()
+                    items.append(item_data)
+                    # 처리한 item은 바로 비워 트리가 응답 크기만큼 커지지 않도록 함
+                    element.clear()
+                elif tag == "resultCode" and (element.text or "").strip() != "00":
+                    return None
+        parser.close()
+    except ET.ParseError as e:
+        print(f"[WARNING] 축산물이력제 응답 XML 파싱 오류: {str(e)}")
+        return None
+
+    return items
@@ -0,0 +1,317 @@
+# services/farm_stats_service.py
+
+from datetime import datetime
+from typing import Dict, Optional
+from firebase_admin import firestore
+from config.firebase_config import get_firestore_client
+from schemas.cow import HealthStatus, BreedingStatus
+from schemas.detailed_record import DetailedRecordType
+from schemas.record import RecordType
+from services.firestore_aggregation import count_queries
+
+# 농장별 통계 카운터 문서 컬렉션 (문서 ID = farm_id)
+FARM_STATS_COLLECTION = 'farm_stats'
+# 재계산 중 카운터가 바뀌었을 때 다시 집계할 최대 횟수
+REBUILD_MAX_ATTEMPTS = 3
+
+
+class FarmStatsService:
+    """
+    농장별 통계 카운터 (farm_stats/{farm_id})
+
+    젖소/기록 생성·수정·삭제 시 같은 트랜잭션(또는 배치) 안에서 카운터를 증감하여
+    통계 조회를 문서 한 번 읽기로 처리한다. 카운터가 어긋나면 rebuild_farm_stats로 재계산한다.
+
+    문서 구조:
+        cows.total / cows.health.{상태} / cows.breeding.{상태} / cows.livestock_trace
+        detailed_records.{기록유형} / basic_records.{기록유형}
+    """
+
+    # ===== 카운터 변화량 계산 =====
+
+    @staticmethod
+    def cow_deltas(cow_data: Optional[Dict], sign: int = 1) -> Dict:
+        """젖소 문서 하나가 카운터에 기여하는 변화량 (활성 젖소만 집계)"""
+        if not cow_data or not cow_data.get("is_active", True):
+            return {}
+
+        deltas = {("cows", "total"): sign}
+        if cow_data.get("health_status"):
+            deltas[("cows", "health", cow_data["health_status"])] = sign
+        if cow_data.get("breeding_status"):
+            deltas[("cows", "breeding", cow_data["breeding_status"])] = sign
+        if cow_data.get("registered_from_livestock_trace"):
+            deltas[("cows", "livestock_trace")] = sign
+        return deltas
+
+    @staticmethod
+    def record_deltas(section: str, record_data: Optional[Dict], sign: int = 1) -> Dict:
+        """기록 문서 하나가 카운터에 기여하는 변화량 (section: detailed_records / basic_records)"""
+        if not record_data or not record_data.get("is_active", True) or not record_data.get("record_type"):
+            return {}
+        return {(section, record_data["record_type"]): sign}
+
+    @staticmethod
+    def merge_deltas(*delta_list: Dict) -> Dict:
+        """여러 변화량을 합치고 0이 된 항목은 제거"""
+        merged = {}
+        for deltas in delta_list:
+            for path, value in deltas.items():
+                merged[path] = merged.get(path, 0) + value
+        return {path: value for path, value in merged.items() if value != 0}
+
+    @staticmethod
+    def _increment_payload(farm_id: str, deltas: Dict) -> Dict:
+        """변화량을 set(merge=True)용 중첩 Increment 문서로 변환"""
+        payload = {"farm_id": farm_id, "updated_at": datetime.utcnow()}
+        for path, value in deltas.items():
+            node = payload
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = firestore.Increment(value)
+        return payload
+
+    # ===== 카운터 기록 =====
+
+    @staticmethod
+    def stats_ref(farm_id: str, db=None):
+        """farm_stats 문서 참조"""
+        db = db or get_firestore_client()
+        return db.collection(FARM_STATS_COLLECTION).document(farm_id)
+
+    @staticmethod
+    def add_to_batch(batch, farm_id: str, deltas: Dict, db=None) -> None:
+        """배치/트랜잭션에 카운터 증감 추가 (엔티티 쓰기와 함께 원자적으로 커밋됨)"""
+        if not farm_id or not deltas:
+            return
+        batch.set(
+            FarmStatsService.stats_ref(farm_id, db),
+            FarmStatsService._increment_payload(farm_id, deltas),
+            merge=True
+        )
+
+    @staticmethod
+    def set_with_stats(doc_ref, document: Dict, farm_id: str, deltas: Dict) -> None:
+        """문서 생성과 카운터 증가를 하나의 배치로 커밋"""
+        db = get_firestore_client()
+        batch = db.batch()
+        batch.set(doc_ref, document)
+        FarmStatsService.add_to_batch(batch, farm_id, deltas, db)
+        batch.commit()
+
+    @staticmethod
+    def update_with_stats(doc_ref, update_data: Dict, farm_id: str, delta_fn) -> Dict:
+        """
+        트랜잭션으로 문서를 수정하고 카운터 반영
+
+        delta_fn(before, after)로 수정 전/후 문서의 카운터 변화량을 계산한다.
+        수정 전 문서 내용을 반환 (문서가 없으면 빈 dict, 수정하지 않음)
+        """
+        db = get_firestore_client()
+        transaction = db.transaction()
+
+        @firestore.transactional
+        def _update(transaction):
+            snapshot = doc_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return {}
+            before = snapshot.to_dict()
+            after = {**before, **update_data}
+            transaction.update(doc_ref, update_data)
+            FarmStatsService.add_to_batch(transaction, farm_id, delta_fn(before, after), db)
+            return before
+
+        return _update(transaction)
+
+    @staticmethod
+    def update_cow_with_stats(cow_id: str, update_data: Dict, farm_id: str) -> Dict:
+        """젖소 정보 수정 + 상태별 카운터 이동"""
+        db = get_firestore_client()
+        return FarmStatsService.update_with_stats(
+            db.collection('cows').document(cow_id),
+            update_data,
+            farm_id,
+            lambda before, after: FarmStatsService.merge_deltas(
+                FarmStatsService.cow_deltas(before, -1),
+                FarmStatsService.cow_deltas(after, 1)
+            )
+        )
+
+    @staticmethod
+    def update_record_with_stats(collection: str, section: str, record_id: str, update_data: Dict, farm_id: str) -> Dict:
+        """기록 수정(소프트 삭제 포함) + 기록 유형별 카운터 반영"""
+        db = get_firestore_client()
+        return FarmStatsService.update_with_stats(
+            db.collection(collection).document(record_id),
+            update_data,
+            farm_id,
+            lambda before, after: FarmStatsService.merge_deltas(
+                FarmStatsService.record_deltas(section, before, -1),
+                FarmStatsService.record_deltas(section, after, 1)
+            )
+        )
+
+    @staticmethod
+    def delete_cow_with_stats(cow_id: str, farm_id: str, extra_deltas: Optional[Dict] = None) -> Dict:
+        """
+        트랜잭션으로 젖소 문서를 삭제하고 카운터 감소
+
+        extra_deltas: 함께 삭제된 기록들의 카운터 변화량
+        삭제 전 젖소 문서 내용을 반환 (문서가 없으면 빈 dict)
+        """
+        db = get_firestore_client()
+        cow_ref = db.collection('cows').document(cow_id)
+        transaction = db.transaction()
+
+        @firestore.transactional
+        def _delete(transaction):
+            snapshot = cow_ref.get(transaction=transaction)
+            before = snapshot.to_dict() if snapshot.exists else {}
+            transaction.delete(cow_ref)
+            FarmStatsService.add_to_batch(
+                transaction,
+                farm_id,
+                FarmStatsService.merge_deltas(FarmStatsService.cow_deltas(before, -1), extra_deltas or {}),
+                db
+            )
+            return before
+
+        return _delete(transaction)
+
+    @staticmethod
+    def apply_deltas(farm_id: str, deltas: Dict) -> None:
+        """카운터 증감만 단독으로 반영"""
+        if not farm_id or not deltas:
+            return
+        FarmStatsService.stats_ref(farm_id).set(
+            FarmStatsService._increment_payload(farm_id, deltas),
+            merge=True
+        )
+
+    @staticmethod
+    def delete_farm_stats(farm_id: str) -> None:
+        """농장 통계 문서 삭제 (계정 삭제 시)"""
+        if farm_id:
+            FarmStatsService.stats_ref(farm_id).delete()
+
+    # ===== 조회 / 재계산 =====
+
+    @staticmethod
+    def get_farm_stats(farm_id: str) -> Dict:
+        """농장 통계 조회 - 문서 한 번 읽기 (한 번도 재계산되지 않았으면 재계산 후 반환)"""
+        stats_doc = FarmStatsService.stats_ref(farm_id).get()
+        stats = stats_doc.to_dict() if stats_doc.exists else None
+        # 기능 도입 이전 데이터가 있는 농장은 증감분만 쌓여 있을 수 있으므로 최초 1회 재계산
+        if stats and stats.get("rebuilt_at"):
+            return stats
+        return FarmStatsService.rebuild_farm_stats(farm_id)
+
+    @staticmethod
+    def rebuild_farm_stats(farm_id: str) -> Dict:
+        """
+        카운터를 처음부터 다시 계산하여 덮어쓰기 (카운터 어긋남 복구용)
+
+        - 집계 쿼리가 하나라도 실패하면 아무것도 쓰지 않고 예외를 발생시킨다
+        - 집계하는 동안 카운터 문서가 바뀌면(다른 요청의 Increment) 덮어쓰지 않고 다시 집계한다.
+          마지막 확인과 쓰기는 트랜잭션으로 묶어 그 사이의 증감도 놓치지 않는다
+        """
+        db = get_firestore_client()
+        stats_ref = FarmStatsService.stats_ref(farm_id, db)
+        queries = FarmStatsService._rebuild_queries(db, farm_id)
+
+        for attempt in range(1, REBUILD_MAX_ATTEMPTS + 1):
+            before = stats_ref.get()
+            counts = count_queries(queries, strict=True)
+            stats = FarmStatsService._stats_from_counts(farm_id, counts)
+
+            transaction = db.transaction()
+
+            @firestore.transactional
+            def _write_if_unchanged(transaction):
+                current = stats_ref.get(transaction=transaction)
+                if current.exists != before.exists or (current.exists and current.update_time != before.update_time):
+                    return False
+                transaction.set(stats_ref, stats)
+                return True
+
+            if _write_if_unchanged(transaction):
+                print(f"[INFO] 농장 통계 재계산 완료 (farm_id: {farm_id})")
+                return stats
+            print(f"[INFO] 농장 통계 재계산 중 카운터 변경 감지, 다시 집계 (farm_id: {farm_id}, 시도: {attempt})")
+
+        raise RuntimeError(f"농장 통계 재계산 중 카운터가 계속 변경되어 저장하지 못했습니다 (farm_id: {farm_id})")
+
+    @staticmethod
+    def _rebuild_queries(db, farm_id: str) -> Dict:
+        """재계산용 count() 쿼리 목록 (키 = 카운터 경로)"""
+        active_cows = (db.collection('cows')
+                      .where('farm_id', '==', farm_id)
+                      .where('is_active', '==', True))
+        detailed_records = (db.collection('cow_detailed_records')
+                           .where('farm_id', '==', farm_id)
+                           .where('is_active', '==', True))
+        basic_records = (db.collection('cow_records')
+                        .where('farm_id', '==', farm_id)
+                        .where('is_active', '==', True))
+
+        queries = {
+            "cows.total": active_cows,
+            "cows.livestock_trace": active_cows.where('registered_from_livestock_trace', '==', True)
+        }
+        for health_status in HealthStatus:
+            queries[f"cows.health.{health_status.value}"] = active_cows.where('health_status', '==', health_status.value)
+        for breeding_status in BreedingStatus:
+            queries[f"cows.breeding.{breeding_status.value}"] = active_cows.where('breeding_status', '==', breeding_status.value)
+        for record_type in DetailedRecordType:
+            queries[f"detailed_records.{record_type.value}"] = detailed_records.where('record_type', '==', record_type.value)
+        for record_type in RecordType:
+            queries[f"basic_records.{record_type.value}"] = basic_records.where('record_type', '==', record_type.value)
+        return queries
+
+    @staticmethod
+    def _stats_from_counts(farm_id: str, counts: Dict[str, int]) -> Dict:
+        """집계 결과를 farm_stats 문서 형태로 변환"""
+        return {
+            "farm_id": farm_id,
+            "cows": {
+                "total": counts["cows.total"],
+                "health": {s.value: counts[f"cows.health.{s.value}"] for s in HealthStatus},
+                "breeding": {s.value: counts[f"cows.breeding.{s.value}"] for s in BreedingStatus},
+                "livestock_trace": counts["cows.livestock_trace"]
+            },
+            "detailed_records": {t.value: counts[f"detailed_records.{t.value}"] for t in DetailedRecordType},
+            "basic_records": {t.value: counts[f"basic_records.{t.value}"] for t in RecordType},
+            "updated_at": datetime.utcnow(),
+            "rebuilt_at": datetime.utcnow()
+        }
+
+    @staticmethod
+    def rebuild_all_farm_stats() -> Dict:
+        """모든 농장의 카운터 재계산"""
+        db = get_firestore_client()
+        rebuilt, failed = 0, 0
+        for farm_doc in db.collection('farms').select(["farm_id"]).stream():
+            farm_id = farm_doc.to_dict().get("farm_id") or farm_doc.id
+            try:
+                FarmStatsService.rebuild_farm_stats(farm_id)
+                rebuilt += 1
+            except Exception as e:
+                print(f"[ERROR] 농장 통계 재계산 실패 (farm_id: {farm_id}): {str(e)}")
+                failed += 1
+        return {"rebuilt_farms": rebuilt, "failed_farms": failed}
+
+
+if __name__ == "__main__":
+    # 카운터 재계산 명령
+    #   python -m services.farm_stats_service <farm_id>   # 특정 농장
+    #   python -m services.farm_stats_service --all       # 전체 농장
+    import sys
+
+    if len(sys.argv) != 2:
+        print("사용법: python -m services.farm_stats_service <farm_id | --all>")
+        sys.exit(1)
+
+    if sys.argv[1] == "--all":
+        print(FarmStatsService.rebuild_all_farm_stats())
+    else:
+        print(FarmStatsService.rebuild_farm_stats(sys.argv[1]))
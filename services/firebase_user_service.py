@@ -3,19 +3,23 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple, List
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
-from config.firebase_config import get_firestore_client
+from config.firebase_config import get_firestore_client, run_blocking
 from schemas.user import AuthType, SocialLoginRequest, SocialUserInfo
 from services.social_auth_service import SocialAuthService
+from services.cow_directory_cache import cow_directory_cache
+from services.farm_stats_service import FarmStatsService
+from services.bulk_delete import delete_query
+from services.token_cleanup import TokenCountCleanup
+from services.firestore_aggregation import count_queries
+from services.auth_user_cache import auth_user_cache
+from services.password_hasher import password_hasher
 import uuid
 import os
+import time
 
 # ===== 설정 및 초기화 =====
 
-# 비밀번호 해싱 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT 설정
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 if not SECRET_KEY:
@@ -25,23 +29,29 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
+# 관리자 통계 스냅샷 유효 시간 (초)
+ADMIN_STATS_SNAPSHOT_TTL = int(os.getenv("ADMIN_STATS_SNAPSHOT_TTL", "600"))
+
 # Firestore 클라이언트
 db = get_firestore_client()
 
+# 관리자 통계 스냅샷 (이름 → (갱신 시각, 통계))
+_stats_snapshots: Dict[str, Tuple[float, Dict]] = {}
+
 class FirebaseUserService:
     """Firebase 기반 사용자 서비스"""
     
     # ===== 비밀번호 관련 메서드 =====
     
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """비밀번호 검증"""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        """비밀번호 검증 (bcrypt 전용 작업 풀에서 실행)"""
+        return await password_hasher.verify(plain_password, hashed_password)
     
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        """비밀번호 해싱"""
-        return pwd_context.hash(password)
+    async def get_password_hash(password: str) -> str:
+        """비밀번호 해싱 (bcrypt 전용 작업 풀에서 실행)"""
+        return await password_hasher.hash(password)
     
     # ===== 사용자 생성 및 관리 =====
     
@@ -50,12 +60,16 @@ class FirebaseUserService:
         username: str, 
         user_id: str, 
         email: str, 
-        password: Optional[str] = None, 
+        hashed_password: Optional[str] = None, 
         farm_nickname: Optional[str] = None,
         auth_type: AuthType = AuthType.EMAIL,
         social_id: Optional[str] = None
     ) -> Dict:
-        """Firestore에 새 사용자 생성"""
+        """
+        Firestore에 새 사용자 생성
+
+        비밀번호는 호출 측에서 get_password_hash()로 미리 해싱해서 전달 (SNS 로그인은 None)
+        """
         try:
             from google.cloud.firestore_v1.base_query import FieldFilter
             user_id_query = db.collection('users').where('user_id', '==', user_id).get()
@@ -95,9 +109,8 @@ class FirebaseUserService:
             current_time = datetime.utcnow()
             
             # 비밀번호 처리 (SNS 로그인은 비밀번호 없음)
-            hashed_password = None
-            if auth_type == AuthType.EMAIL and password:
-                hashed_password = FirebaseUserService.get_password_hash(password)
+            if auth_type != AuthType.EMAIL:
+                hashed_password = None
             
             # 기본 목장 별명 생성
             if not farm_nickname:
@@ -157,54 +170,20 @@ class FirebaseUserService:
     # ===== 인증 관련 메서드 =====
     
     @staticmethod
-    def authenticate_user(user_id: str, password: str) -> Optional[Dict]:
-        """일반 사용자 인증 (이메일 가입 사용자만)"""
+    async def authenticate_user(user_id: str, password: str) -> Optional[Dict]:
+        """
+        일반 사용자 인증 (이메일 가입 사용자만)
+
+        Firestore 조회/갱신은 스레드에서 실행하고, bcrypt 검증은 전용 작업 풀 결과를 await로 기다린다
+        """
         try:
             print(f"[DEBUG] 인증 시도 - user_id: '{user_id}', password_length: {len(password)}")
             
-            # Firestore에서 사용자 검색
-            users_ref = db.collection('users')
-            query = users_ref.where('user_id', '==', user_id).limit(1).get()
-            
-            if not query:
-                print(f"[DEBUG] 인증 실패 - 사용자를 찾을 수 없음: '{user_id}'")
-                return None
-            
-            user_doc = query[0]
-            user_data = user_doc.to_dict()
-            print(f"[DEBUG] 사용자 발견 - auth_type: '{user_data.get('auth_type')}', is_active: {user_data.get('is_active')}")
-            
-            # 이메일 인증 유형만 비밀번호 확인
-            user_auth_type = user_data.get("auth_type")
-            
-            # 기존 사용자 호환성: auth_type이 없거나 null이면 email로 간주
-            if user_auth_type is None or user_auth_type == "":
-                print(f"[DEBUG] 기존 사용자 - auth_type이 없음, email로 간주")
-                user_auth_type = AuthType.EMAIL.value
-                
-                # DB에 auth_type 업데이트 (한 번만)
-                try:
-                    db.collection('users').document(user_data["id"]).update({
-                        "auth_type": AuthType.EMAIL.value,
-                        "updated_at": datetime.utcnow()
-                    })
-                    print(f"[DEBUG] 기존 사용자 auth_type 업데이트 완료")
-                except Exception as update_error:
-                    print(f"[WARNING] auth_type 업데이트 실패: {str(update_error)}")
-            
-            if user_auth_type != AuthType.EMAIL.value:
-                print(f"[DEBUG] 인증 실패 - SNS 로그인 사용자 (auth_type: {user_auth_type})")
-                return None  # SNS 로그인 사용자는 일반 로그인 불가
-            
-            # 비밀번호 확인
-            has_password = bool(user_data.get("hashed_password"))
-            print(f"[DEBUG] 비밀번호 체크 - has_hashed_password: {has_password}")
-            
-            if not has_password:
-                print(f"[DEBUG] 인증 실패 - 저장된 비밀번호가 없음")
+            user_data = await run_blocking(FirebaseUserService._find_email_login_user, user_id)
+            if not user_data:
                 return None
                 
-            password_valid = FirebaseUserService.verify_password(password, user_data["hashed_password"])
+            password_valid, new_hash = await password_hasher.verify_and_update(password, user_data["hashed_password"])
             print(f"[DEBUG] 비밀번호 검증 결과: {password_valid}")
             
             if not password_valid:
@@ -218,27 +197,88 @@ class FirebaseUserService:
 
             print(f"[DEBUG] 인증 성공 - user_id: '{user_id}'")
             
-            # 메모리상의 user_data도 auth_type 업데이트 (DB는 이미 위에서 업데이트함)
-            if user_auth_type != user_data.get("auth_type"):
-                user_data["auth_type"] = user_auth_type
-            
-            # 최근 로그인 시간 업데이트
-            current_time = datetime.utcnow()
-            db.collection('users').document(user_data["id"]).update({
-                "last_login": current_time,
-                "updated_at": current_time
-            })
-
-            # 업데이트된 last_login 시간 반영
-            user_data["last_login"] = current_time
-            user_data["updated_at"] = current_time
-
+            await run_blocking(FirebaseUserService._record_login, user_data, new_hash)
             return user_data
 
+        except HTTPException:
+            # bcrypt 대기열 초과(503) 등은 그대로 전달
+            raise
         except Exception as e:
             print(f"[ERROR] 사용자 인증 실패: {str(e)}")
             return None
     
+    @staticmethod
+    def _find_email_login_user(user_id: str) -> Optional[Dict]:
+        """로그인 대상 사용자 조회 (이메일 가입 + 비밀번호가 있는 사용자만, 없으면 None)"""
+        # Firestore에서 사용자 검색
+        users_ref = db.collection('users')
+        query = users_ref.where('user_id', '==', user_id).limit(1).get()
+        
+        if not query:
+            print(f"[DEBUG] 인증 실패 - 사용자를 찾을 수 없음: '{user_id}'")
+            return None
+        
+        user_doc = query[0]
+        user_data = user_doc.to_dict()
+        print(f"[DEBUG] 사용자 발견 - auth_type: '{user_data.get('auth_type')}', is_active: {user_data.get('is_active')}")
+        
+        # 이메일 인증 유형만 비밀번호 확인
+        user_auth_type = user_data.get("auth_type")
+        
+        # 기존 사용자 호환성: auth_type이 없거나 null이면 email로 간주
+        if user_auth_type is None or user_auth_type == "":
+            print(f"[DEBUG] 기존 사용자 - auth_type이 없음, email로 간주")
+            user_auth_type = AuthType.EMAIL.value
+            
+            # DB에 auth_type 업데이트 (한 번만)
+            try:
+                db.collection('users').document(user_data["id"]).update({
+                    "auth_type": AuthType.EMAIL.value,
+                    "updated_at": datetime.utcnow()
+                })
+                print(f"[DEBUG] 기존 사용자 auth_type 업데이트 완료")
+            except Exception as update_error:
+                print(f"[WARNING] auth_type 업데이트 실패: {str(update_error)}")
+        
+        if user_auth_type != AuthType.EMAIL.value:
+            print(f"[DEBUG] 인증 실패 - SNS 로그인 사용자 (auth_type: {user_auth_type})")
+            return None  # SNS 로그인 사용자는 일반 로그인 불가
+        
+        # 비밀번호 확인
+        has_password = bool(user_data.get("hashed_password"))
+        print(f"[DEBUG] 비밀번호 체크 - has_hashed_password: {has_password}")
+        
+        if not has_password:
+            print(f"[DEBUG] 인증 실패 - 저장된 비밀번호가 없음")
+            return None
+        
+        # 메모리상의 user_data도 auth_type 업데이트 (DB는 이미 위에서 업데이트함)
+        if user_auth_type != user_data.get("auth_type"):
+            user_data["auth_type"] = user_auth_type
+        return user_data
+    
+    @staticmethod
+    def _record_login(user_data: Dict, new_hash: Optional[str]) -> None:
+        """최근 로그인 시간 기록 (필요 시 재해싱한 비밀번호도 함께 저장)"""
+        current_time = datetime.utcnow()
+        login_update = {
+            "last_login": current_time,
+            "updated_at": current_time
+        }
+        
+        # bcrypt 비용 인자가 바뀐 경우 로그인 시 재해싱 (별도 마이그레이션 불필요)
+        if new_hash:
+            login_update["hashed_password"] = new_hash
+            user_data["hashed_password"] = new_hash
+            print(f"[INFO] 비밀번호 해시 재생성 (user_id: {user_data['user_id']})")
+        
+        db.collection('users').document(user_data["id"]).update(login_update)
+
+        # 업데이트된 last_login 시간 반영
+        user_data["last_login"] = current_time
+        user_data["updated_at"] = current_time
+        auth_user_cache.invalidate_user(user_data)
+    
     @staticmethod
     async def social_login_or_register(login_request: SocialLoginRequest) -> Tuple[Dict, bool]:
         """
@@ -262,7 +302,8 @@ class FirebaseUserService:
                 )
             
             # 2. 기존 사용자 확인 (social_id + auth_type으로)
-            existing_user = FirebaseUserService._find_user_by_social_id(
+            existing_user = await run_blocking(
+                FirebaseUserService._find_user_by_social_id,
                 social_info.social_id, 
                 login_request.auth_type
             )
@@ -274,13 +315,14 @@ class FirebaseUserService:
                 print(f"[INFO] 기존 SNS 사용자 로그인: {existing_user['user_id']}")
                 
                 # 최근 로그인 시간 업데이트
-                db.collection('users').document(existing_user["id"]).update({
+                await run_blocking(db.collection('users').document(existing_user["id"]).update, {
                     "last_login": current_time,
                     "updated_at": current_time
                 })
                 
                 existing_user["last_login"] = current_time
                 existing_user["updated_at"] = current_time
+                auth_user_cache.invalidate_user(existing_user)
                 return existing_user, False  # 기존 사용자
             
             else:
@@ -289,7 +331,7 @@ class FirebaseUserService:
                 
                 # 이메일 중복 확인 (다른 인증 방식으로 가입된 계정)
                 if social_info.email:
-                    email_user = FirebaseUserService._find_user_by_email(social_info.email)
+                    email_user = await run_blocking(FirebaseUserService._find_user_by_email, social_info.email)
                     if email_user:
                         raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
@@ -305,11 +347,12 @@ class FirebaseUserService:
                 )
                 
                 # 회원가입 처리
-                new_user = FirebaseUserService.create_user(
+                new_user = await run_blocking(
+                    FirebaseUserService.create_user,
                     username=username,
                     user_id=user_id,
                     email=email,
-                    password=None,  # SNS 로그인은 비밀번호 없음
+                    hashed_password=None,  # SNS 로그인은 비밀번호 없음
                     farm_nickname=farm_nickname,
                     auth_type=login_request.auth_type,
                     social_id=social_info.social_id
@@ -500,8 +543,12 @@ class FirebaseUserService:
                     headers={"WWW-Authenticate": "Bearer"},
                 )
             
-            # Firestore에서 사용자 정보 조회 (user_id로 검색)
-            user = FirebaseUserService.get_user_by_user_id(user_id)
+            # 캐시 확인 후 Firestore에서 사용자 정보 조회 (user_id로 검색)
+            user = auth_user_cache.get(user_id)
+            if user is None:
+                user = FirebaseUserService.get_user_by_user_id(user_id)
+                if user is not None:
+                    auth_user_cache.put(user)
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -703,25 +750,30 @@ class FirebaseUserService:
     # ===== 계정 관리 메서드 =====
     
     @staticmethod
-    def delete_user_account(user: Dict, password: str, confirmation: str) -> Dict:
-        """사용자 계정 완전 삭제 - 모든 관련 데이터 삭제"""
-        try:
-            # 1. 삭제 확인 문구 검증
-            if confirmation != "DELETE":
+    async def delete_user_account(user: Dict, password: str, confirmation: str) -> Dict:
+        """사용자 계정 완전 삭제 - 확인 문구/비밀번호 검증 후 모든 관련 데이터 삭제"""
+        # 1. 삭제 확인 문구 검증
+        if confirmation != "DELETE":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="삭제 확인 문구가 올바르지 않습니다. 'DELETE'를 정확히 입력해주세요."
+            )
+        
+        # 2. 비밀번호 확인 (이메일 계정만)
+        if user.get("auth_type") == AuthType.EMAIL.value:
+            if not user.get("hashed_password") or not await FirebaseUserService.verify_password(password, user["hashed_password"]):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="삭제 확인 문구가 올바르지 않습니다. 'DELETE'를 정확히 입력해주세요."
+                    detail="비밀번호가 올바르지 않습니다"
                 )
-            
-            # 2. 비밀번호 확인 (이메일 계정만)
-            if user.get("auth_type") == AuthType.EMAIL.value:
-                if not user.get("hashed_password") or not FirebaseUserService.verify_password(password, user["hashed_password"]):
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="비밀번호가 올바르지 않습니다"
-                    )
-            # SNS 계정의 경우 비밀번호 확인 생략
-            
+        # SNS 계정의 경우 비밀번호 확인 생략
+        
+        return await run_blocking(FirebaseUserService._delete_user_data, user)
+    
+    @staticmethod
+    def _delete_user_data(user: Dict) -> Dict:
+        """사용자 계정 관련 데이터 삭제 (확인 절차는 delete_user_account에서 처리)"""
+        try:
             user_uuid = user["id"]
             farm_id = user["farm_id"]
             
@@ -730,46 +782,49 @@ class FirebaseUserService:
             # 3. 관련 데이터 삭제 (순서 중요)
             
             # 3-1. 할일(Tasks) 삭제
-            tasks = db.collection('tasks').where('farm_id', '==', farm_id).get()
-            task_count = len(tasks)
-            for task in tasks:
-                db.collection('tasks').document(task.id).delete()
+            task_count = delete_query(
+                db.collection('tasks').where('farm_id', '==', farm_id), label="tasks"
+            )["deleted"]
             
-            # 3-2. 채팅방 삭제
-            chat_rooms = db.collection('chat_rooms').where('farm_id', '==', farm_id).get()
-            chat_count = len(chat_rooms)
-            for chat in chat_rooms:
-                db.collection('chat_rooms').document(chat.id).delete()
+            # 3-2. 채팅방 삭제 (채팅방별 메시지 하위 컬렉션 포함)
+            def _delete_chat_messages(chat_docs):
+                for chat in chat_docs:
+                    delete_query(chat.reference.collection('messages'), label=f"chat_rooms/{chat.id}/messages")
+            
+            chat_count = delete_query(
+                db.collection('chat_rooms').where('farm_id', '==', farm_id),
+                label="chat_rooms",
+                on_page=_delete_chat_messages
+            )["deleted"]
             
             # 3-3. 상세기록 삭제
-            detailed_records = db.collection('cow_detailed_records').where('farm_id', '==', farm_id).get()
-            detailed_count = len(detailed_records)
-            for record in detailed_records:
-                db.collection('cow_detailed_records').document(record.id).delete()
+            detailed_count = delete_query(
+                db.collection('cow_detailed_records').where('farm_id', '==', farm_id), label="cow_detailed_records"
+            )["deleted"]
             
             # 3-4. 기록 삭제  
-            records = db.collection('cow_records').where('farm_id', '==', farm_id).get()
-            record_count = len(records)
-            for record in records:
-                db.collection('cow_records').document(record.id).delete()
+            record_count = delete_query(
+                db.collection('cow_records').where('farm_id', '==', farm_id), label="cow_records"
+            )["deleted"]
             
             # 3-5. 소 정보 삭제
-            cows = db.collection('cows').where('farm_id', '==', farm_id).get()
-            cow_count = len(cows)
-            for cow in cows:
-                db.collection('cows').document(cow.id).delete()
+            cow_count = delete_query(
+                db.collection('cows').where('farm_id', '==', farm_id), label="cows"
+            )["deleted"]
             
             # 3-6. 리프레시 토큰 삭제 (해당 사용자의 모든 토큰)
-            refresh_tokens = db.collection('refresh_tokens').where('user_id', '==', user_uuid).get()
-            token_count = len(refresh_tokens)
-            for token in refresh_tokens:
-                db.collection('refresh_tokens').document(token.id).delete()
+            token_count = delete_query(
+                db.collection('refresh_tokens').where('user_id', '==', user_uuid), label="refresh_tokens"
+            )["deleted"]
             
             # 3-7. 농장 정보 삭제
             db.collection('farms').document(farm_id).delete()
+            cow_directory_cache.invalidate(farm_id)
+            FarmStatsService.delete_farm_stats(farm_id)
             
             # 3-8. 사용자 정보 삭제 (마지막)
             db.collection('users').document(user_uuid).delete()
+            auth_user_cache.invalidate_user(user)
             
             print(f"[INFO] 계정 삭제 완료: 젖소 {cow_count}마리, 기록 {record_count + detailed_count}개, 할일 {task_count}개, 채팅 {chat_count}개, 토큰 {token_count}개")
             
@@ -836,6 +891,7 @@ class FirebaseUserService:
             
             # 사용자 정보 업데이트
             db.collection('users').document(user_id).update(update_data)
+            auth_user_cache.invalidate_user(user)
             
             # 업데이트된 사용자 정보 반환
             updated_user = FirebaseUserService.get_user_by_id(user_id)
@@ -942,18 +998,21 @@ class FirebaseUserService:
             return []
     
     @staticmethod
-    def get_user_count_by_auth_type() -> Dict[str, int]:
-        """인증 타입별 사용자 수 조회"""
+    def get_user_count_by_auth_type(use_snapshot: bool = True) -> Dict[str, int]:
+        """인증 타입별 활성 사용자 수 조회 (count() 집계, 스케줄러가 갱신한 스냅샷 우선)"""
         try:
-            stats = {}
-            
-            for auth_type in AuthType:
-                count = len(db.collection('users')
-                           .where('auth_type', '==', auth_type.value)
-                           .where('is_active', '==', True)
-                           .get())
-                stats[auth_type.value] = count
-            
+            snapshot = FirebaseUserService._get_stats_snapshot("users") if use_snapshot else None
+            if snapshot is not None:
+                return snapshot
+            
+            # 실패한 집계를 0으로 스냅샷에 남기지 않도록 strict로 실행 (실패 시 캐시하지 않음)
+            active_users = db.collection('users').where('is_active', '==', True)
+            stats = count_queries({
+                auth_type.value: active_users.where('auth_type', '==', auth_type.value)
+                for auth_type in AuthType
+            }, strict=True)
+            
+            _stats_snapshots["users"] = (time.monotonic(), stats)
             return stats
             
         except Exception as e:
@@ -968,20 +1027,11 @@ class FirebaseUserService:
         try:
             current_time = datetime.utcnow()
             
-            # 만료된 토큰 조회 (단순 쿼리)
-            expired_tokens = db.collection('refresh_tokens')\
-                .where('expires_at', '<', current_time)\
-                .get()
-            
-            deleted_count = 0
-            
-            # 배치 삭제 (효율성을 위해)
-            for token in expired_tokens:
-                try:
-                    db.collection('refresh_tokens').document(token.id).delete()
-                    deleted_count += 1
-                except Exception as e:
-                    print(f"[WARNING] 토큰 삭제 실패 (ID: {token.id}): {str(e)}")
+            # 만료된 토큰 일괄 삭제 (500건 단위 배치)
+            deleted_count = delete_query(
+                db.collection('refresh_tokens').where('expires_at', '<', current_time),
+                label="expired refresh_tokens"
+            )["deleted"]
             
             print(f"[INFO] 만료된 토큰 {deleted_count}개 정리 완료")
             return deleted_count
@@ -991,61 +1041,26 @@ class FirebaseUserService:
             return 0
     
     @staticmethod
-    def cleanup_old_tokens_by_count():
-        """사용자별 오래된 토큰 정리 (각 사용자당 최대 5개만 유지)"""
+    def cleanup_old_tokens_by_count(resume: bool = True) -> Dict:
+        """
+        사용자별 오래된 토큰 정리 (각 사용자당 최대 5개만 유지)
+
+        refresh_tokens를 user_id 순으로 한 번만 훑으며 정리하고, 중단되면 체크포인트부터 재개한다
+        """
         try:
-            # 모든 활성 사용자 조회
-            users = db.collection('users').where('is_active', '==', True).get()
-            total_deleted = 0
-            
-            for user_doc in users:
-                user_id = user_doc.id
-                
-                try:
-                    # 사용자의 모든 토큰 조회 (간단한 쿼리)
-                    user_tokens = db.collection('refresh_tokens')\
-                        .where('user_id', '==', user_id)\
-                        .get()
-                    
-                    # 토큰을 생성일 기준으로 정렬 (메모리에서)
-                    token_list = []
-                    for token_doc in user_tokens:
-                        token_data = token_doc.to_dict()
-                        token_data['doc_id'] = token_doc.id
-                        if token_data.get('is_active', True):  # 활성 토큰만
-                            token_list.append(token_data)
-                    
-                    # 생성일 기준 내림차순 정렬
-                    token_list.sort(key=lambda x: x.get('created_at', datetime.min), reverse=True)
-                    
-                    # 5개 이상이면 오래된 것들 삭제
-                    if len(token_list) > 5:
-                        tokens_to_delete = token_list[5:]  # 6번째부터 끝까지
-                        
-                        for token in tokens_to_delete:
-                            try:
-                                db.collection('refresh_tokens').document(token['doc_id']).delete()
-                                total_deleted += 1
-                            except Exception as e:
-                                print(f"[WARNING] 토큰 삭제 실패: {str(e)}")
-                                
-                except Exception as e:
-                    print(f"[WARNING] 사용자 {user_id} 토큰 정리 실패: {str(e)}")
-                    continue
-            
-            print(f"[INFO] 오래된 토큰 {total_deleted}개 정리 완료 (사용자당 최대 5개 유지)")
-            return total_deleted
+            return TokenCountCleanup().run(resume=resume)
             
         except Exception as e:
             print(f"[ERROR] 오래된 토큰 정리 실패: {str(e)}")
-            return 0
+            return {"deleted": 0, "error": str(e)}
     
     @staticmethod
     def auto_cleanup_tokens():
         """자동 토큰 정리 (만료된 것 + 개수 제한)"""
         try:
             expired_deleted = FirebaseUserService.cleanup_expired_tokens()
-            old_deleted = FirebaseUserService.cleanup_old_tokens_by_count()
+            old_cleanup = FirebaseUserService.cleanup_old_tokens_by_count()
+            old_deleted = old_cleanup.get("deleted", 0)
             
             total_deleted = expired_deleted + old_deleted
             print(f"[INFO] 자동 토큰 정리 완료: 총 {total_deleted}개 삭제")
@@ -1054,6 +1069,7 @@ class FirebaseUserService:
                 "total_deleted": total_deleted,
                 "expired_deleted": expired_deleted,
                 "old_deleted": old_deleted,
+                "old_cleanup": old_cleanup,
                 "cleanup_time": datetime.utcnow().isoformat()
             }
             
@@ -1062,38 +1078,56 @@ class FirebaseUserService:
             return {"error": str(e)}
     
     @staticmethod
-    def get_token_statistics():
-        """토큰 통계 조회"""
+    def get_token_statistics(use_snapshot: bool = True):
+        """토큰 통계 조회 (count() 집계, 스케줄러가 갱신한 스냅샷 우선)"""
         try:
-            current_time = datetime.utcnow()
-            
-            # 전체 토큰 수
-            all_tokens = db.collection('refresh_tokens').get()
-            total_count = len(all_tokens)
-            
-            # 활성 토큰 수
-            active_tokens = db.collection('refresh_tokens').where('is_active', '==', True).get()
-            active_count = len(active_tokens)
-            
-            # 만료된 토큰 수
-            expired_tokens = db.collection('refresh_tokens')\
-                .where('expires_at', '<', current_time)\
-                .get()
-            expired_count = len(expired_tokens)
+            snapshot = FirebaseUserService._get_stats_snapshot("tokens") if use_snapshot else None
+            if snapshot is not None:
+                return snapshot
             
-            return {
-                "total_tokens": total_count,
-                "active_tokens": active_count,
-                "expired_tokens": expired_count,
-                "inactive_tokens": total_count - active_count,
-                "cleanup_needed": expired_count > 0,
+            current_time = datetime.utcnow()
+            tokens = db.collection('refresh_tokens')
+            
+            # 전체 / 활성 / 만료 토큰 수를 동시에 집계 (실패 시 캐시하지 않음)
+            counts = count_queries({
+                "total": tokens,
+                "active": tokens.where('is_active', '==', True),
+                "expired": tokens.where('expires_at', '<', current_time)
+            }, strict=True)
+            
+            stats = {
+                "total_tokens": counts["total"],
+                "active_tokens": counts["active"],
+                "expired_tokens": counts["expired"],
+                # 각 집계의 읽기 시점이 달라 잠깐 음수가 될 수 있음
+                "inactive_tokens": max(0, counts["total"] - counts["active"]),
+                "cleanup_needed": counts["expired"] > 0,
                 "statistics_time": current_time.isoformat()
             }
             
+            _stats_snapshots["tokens"] = (time.monotonic(), stats)
+            return stats
+            
         except Exception as e:
             print(f"[ERROR] 토큰 통계 조회 실패: {str(e)}")
             return {"error": str(e)}
     
+    @staticmethod
+    def refresh_admin_statistics() -> Dict:
+        """관리자 통계 스냅샷 갱신 (스케줄러에서 주기적으로 호출)"""
+        return {
+            "tokens": FirebaseUserService.get_token_statistics(use_snapshot=False),
+            "users": FirebaseUserService.get_user_count_by_auth_type(use_snapshot=False)
+        }
+    
+    @staticmethod
+    def _get_stats_snapshot(name: str) -> Optional[Dict]:
+        """유효한 통계 스냅샷 조회 (없거나 만료되면 None)"""
+        entry = _stats_snapshots.get(name)
+        if entry and time.monotonic() - entry[0] < ADMIN_STATS_SNAPSHOT_TTL:
+            return entry[1]
+        return None
+    
     @staticmethod
     def revoke_all_user_tokens(user_id: str):
         """특정 사용자의 모든 토큰 무효화"""
@@ -1109,6 +1143,13 @@ class FirebaseUserService:
                 })
                 revoked_count += 1
             
+            # 캐시 키는 로그인 아이디이고 uuid 역색인은 이 워커가 적재한 사용자만 있으므로 사용자 문서에서 찾아 무효화
+            auth_user_cache.invalidate(user_uuid=user_id)
+            try:
+                user_doc = db.collection('users').document(user_id).get()
+                auth_user_cache.invalidate_user(user_doc.to_dict() if user_doc.exists else None)
+            except Exception as e:
+                print(f"[WARNING] 인증 사용자 캐시 무효화용 사용자 조회 실패 (최대 캐시 TTL 동안 유지): {str(e)}")
             print(f"[INFO] 사용자 {user_id}의 토큰 {revoked_count}개 무효화 완료")
             return revoked_count
             
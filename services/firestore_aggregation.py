@@ -0,0 +1,43 @@
+# services/firestore_aggregation.py
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+# 통계 집계 쿼리를 동시에 실행할 최대 스레드 수
+MAX_CONCURRENT_AGGREGATIONS = 8
+
+
+def count_query(query) -> int:
+    """
+    Firestore count() 집계 쿼리로 문서 수 조회
+
+    문서를 내려받지 않고 서버에서 개수만 계산한다
+    """
+    result = query.count(alias="count").get()
+    # 결과 형태: [[AggregationResult(alias, value, read_time)]]
+    return int(result[0][0].value) if result and result[0] else 0
+
+
+def count_queries(queries: Dict[str, object], strict: bool = False) -> Dict[str, int]:
+    """
+    여러 count() 집계 쿼리를 동시에 실행
+
+    개별 쿼리가 실패하면 해당 항목만 0으로 처리하고 나머지 결과는 그대로 반환한다.
+    strict=True이면 실패한 쿼리의 예외를 그대로 발생시킨다 (결과를 저장/캐시하는 경우)
+    """
+    if not queries:
+        return {}
+
+    def _run(item):
+        key, query = item
+        try:
+            return key, count_query(query)
+        except Exception as e:
+            print(f"[WARNING] 집계 쿼리 실패 ({key}): {str(e)}")
+            if strict:
+                raise
+            return key, 0
+
+    max_workers = min(MAX_CONCURRENT_AGGREGATIONS, len(queries))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(_run, queries.items()))
@@ -0,0 +1,212 @@
+# services/http_clients.py
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+from services.circuit_breaker import AdaptiveTimeout, CircuitBreaker, CircuitOpenError
+import httpx
+import os
+import threading
+import time
+
+try:
+    import h2  # noqa: F401  (HTTP/2 지원 여부 확인용)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass
+class UpstreamConfig:
+    """외부 API별 연결 설정"""
+    max_connections: int
+    max_keepalive_connections: int
+    timeout: float
+    connect_timeout: float = 3.0
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    # 차단기 (연속 실패 횟수, 복구 대기 시간) - failure_threshold가 0이면 사용하지 않음
+    failure_threshold: int = 0
+    recovery_seconds: float = 30.0
+    # 응답 시간 기반 타임아웃 하한 - 0이면 timeout 고정값 사용 (timeout이 상한)
+    min_timeout: float = 0.0
+
+
+# 외부 API별 연결 풀 설정
+UPSTREAMS: Dict[str, UpstreamConfig] = {
+    # 축산물이력제 (data.ekape.or.kr) - HTTP 전용이라 HTTP/2 미사용, 장애가 잦아 차단기/적응형 타임아웃 적용
+    "ekape": UpstreamConfig(
+        max_connections=int(os.getenv("EKAPE_MAX_CONNECTIONS", "10")),
+        max_keepalive_connections=5,
+        timeout=float(os.getenv("EKAPE_TIMEOUT", "10.0")),
+        failure_threshold=int(os.getenv("EKAPE_CIRCUIT_FAILURES", "5")),
+        recovery_seconds=float(os.getenv("EKAPE_CIRCUIT_RECOVERY_SECONDS", "30")),
+        min_timeout=float(os.getenv("EKAPE_MIN_TIMEOUT", "1.5"))
+    ),
+    # 구글 사용자 정보 API
+    "google": UpstreamConfig(
+        max_connections=20,
+        max_keepalive_connections=10,
+        timeout=10.0,
+        http2=True
+    ),
+}
+
+
+class HttpClientRegistry:
+    """
+    외부 API용 공용 httpx.AsyncClient 모음
+
+    - 앱 시작 시 생성하고 종료 시 닫아 TCP/TLS 연결과 DNS 결과를 재사용한다
+    - 외부 API별로 연결 수 제한, keep-alive, 타임아웃을 따로 둔다
+    - 요청 수/오류/지연 시간과 연결 풀 사용량을 stats()로 제공한다
+    - 설정된 외부 API는 차단기로 장애 시 바로 실패(CircuitOpenError)하고,
+      타임아웃을 최근 응답 시간 분포에 맞춰 조정한다
+    """
+
+    def __init__(self, upstreams: Dict[str, UpstreamConfig]):
+        self.upstreams = upstreams
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+        self._metrics = {
+            name: {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0, "total_seconds": 0.0}
+            for name in upstreams
+        }
+        self._breakers = {
+            name: CircuitBreaker(name, config.failure_threshold, config.recovery_seconds)
+            for name, config in upstreams.items() if config.failure_threshold > 0
+        }
+        self._timeouts = {
+            name: AdaptiveTimeout(minimum=config.min_timeout, maximum=config.timeout)
+            for name, config in upstreams.items() if config.min_timeout > 0
+        }
+
+    def start(self) -> None:
+        """모든 외부 API 클라이언트 생성 (앱 시작 시)"""
+        for name in self.upstreams:
+            self.client(name)
+        print(f"[INFO] 외부 API 클라이언트 준비 완료: {', '.join(self.upstreams)} (HTTP/2: {HTTP2_AVAILABLE})")
+
+    async def aclose(self) -> None:
+        """모든 클라이언트 종료 (앱 종료 시)"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        """외부 API 클라이언트 조회 (아직 없으면 생성)"""
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None or client.is_closed:
+                config = self.upstreams[name]
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=config.max_connections,
+                        max_keepalive_connections=config.max_keepalive_connections,
+                        keepalive_expiry=config.keepalive_expiry
+                    ),
+                    timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+                    http2=config.http2 and HTTP2_AVAILABLE
+                )
+                self._clients[name] = client
+            return client
+
+    def available(self, name: str) -> bool:
+        """외부 API 호출 가능 여부 (차단기가 열려 있으면 False)"""
+        breaker = self._breakers.get(name)
+        return breaker is None or not breaker.is_open()
+
+    async def get(self, name: str, url: str, **kwargs) -> httpx.Response:
+        """외부 API GET 요청 (요청 수/지연 시간 집계)"""
+        return await self.request(name, "GET", url, **kwargs)
+
+    async def request(self, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """외부 API 요청 (요청 수/지연 시간 집계, 차단기/적응형 타임아웃 적용)"""
+        metrics = self._metrics[name]
+        breaker = self._breakers.get(name)
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError(name)
+        # half_open 시험 호출은 학습된 타임아웃이 아니라 설정된 최대 타임아웃으로 실행 (느려진 외부 API도 복구 확인 가능)
+        probing = breaker is not None and breaker.state == "half_open"
+        adaptive = self._timeouts.get(name)
+        applied_timeout = None
+        if adaptive is not None and "timeout" not in kwargs:
+            applied_timeout = self.upstreams[name].timeout if probing else adaptive.current()
+            kwargs["timeout"] = httpx.Timeout(
+                applied_timeout, connect=min(self.upstreams[name].connect_timeout, applied_timeout)
+            )
+
+        with self._lock:
+            metrics["requests"] += 1
+            metrics["in_flight"] += 1
+            metrics["max_in_flight"] = max(metrics["max_in_flight"], metrics["in_flight"])
+        started = time.monotonic()
+        recorded = False
+        try:
+            response = await self.client(name).request(method, url, **kwargs)
+            # 5xx는 외부 API 장애로 보고 차단기 실패로 기록 (응답 자체는 호출 측에서 처리)
+            if response.status_code >= 500:
+                if breaker is not None:
+                    breaker.record_failure()
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                if adaptive is not None:
+                    adaptive.observe(time.monotonic() - started)
+            recorded = True
+            return response
+        except Exception as e:
+            with self._lock:
+                metrics["errors"] += 1
+            # 타임아웃도 응답 시간 분포에 반영 (짧게 학습된 타임아웃에 갇히지 않도록)
+            if applied_timeout is not None and isinstance(e, httpx.TimeoutException):
+                adaptive.observe_timeout(applied_timeout)
+            if breaker is not None:
+                breaker.record_failure()
+            recorded = True
+            raise
+        finally:
+            if breaker is not None and not recorded:
+                breaker.release()
+            with self._lock:
+                metrics["in_flight"] -= 1
+                metrics["total_seconds"] += time.monotonic() - started
+
+    def stats(self) -> Dict:
+        """외부 API별 요청/연결 풀 사용량 통계"""
+        with self._lock:
+            result = {}
+            for name, config in self.upstreams.items():
+                metrics = self._metrics[name]
+                result[name] = {
+                    "requests": metrics["requests"],
+                    "errors": metrics["errors"],
+                    "in_flight": metrics["in_flight"],
+                    "max_in_flight": metrics["max_in_flight"],
+                    "avg_latency_ms": round(metrics["total_seconds"] / metrics["requests"] * 1000, 2) if metrics["requests"] else 0.0,
+                    "max_connections": config.max_connections,
+                    "http2": config.http2 and HTTP2_AVAILABLE,
+                    "pool": self._pool_usage(self._clients.get(name))
+                }
+        for name, breaker in self._breakers.items():
+            result[name]["circuit_breaker"] = breaker.stats()
+        for name, adaptive in self._timeouts.items():
+            result[name]["adaptive_timeout"] = adaptive.stats()
+        return result
+
+    @staticmethod
+    def _pool_usage(client: Optional[httpx.AsyncClient]) -> Optional[Dict]:
+        """연결 풀의 열린/유휴 연결 수 (httpx 내부 구조에 의존하므로 실패 시 None)"""
+        if client is None:
+            return None
+        try:
+            connections = client._transport._pool.connections
+            idle = sum(1 for connection in connections if connection.is_idle())
+            return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+        except Exception:
+            return None
+
+
+# 전역 클라이언트 모음
+http_clients = HttpClientRegistry(UPSTREAMS)
@@ -0,0 +1,497 @@
+# services/jobs.py
+
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from fastapi.encoders import jsonable_encoder
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+# 완료/실패한 작업 결과 보관 시간 (초)
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))
+# 프로세스당 동시에 실행할 백그라운드 작업 수
+JOB_MAX_CONCURRENCY = int(os.getenv("JOB_MAX_CONCURRENCY", "8"))
+# 작업 저장소 종류 (sqlite / memory)
+JOB_STORE = os.getenv("JOB_STORE", "sqlite")
+# 같은 서버의 uvicorn 워커 간에 공유하는 작업 저장소 파일
+DEFAULT_JOB_DB_PATH = os.path.join(tempfile.gettempdir(), "blackcows_jobs.sqlite3")
+# 만료 작업 정리 주기 (쓰기 횟수 기준)
+PURGE_EVERY_WRITES = 200
+# 진행 상황을 저장소에 기록하는 최소 간격 (초) - 그 사이의 갱신은 모아서 한 번에 기록
+JOB_PERSIST_INTERVAL = float(os.getenv("JOB_PERSIST_INTERVAL", "0.5"))
+# 실행 중인 작업의 생존 신호(heartbeat) 기록 간격 / 이 시간 동안 신호가 없으면 중단된 작업으로 처리 (초)
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "60"))
+# 작업을 처리하던 프로세스가 사라졌을 때 기록하는 메시지
+ORPHANED_JOB_MESSAGE = "작업을 처리하던 서버가 종료되어 작업이 중단되었습니다. 다시 시도해주세요"
+
+# 더 이상 상태가 바뀌지 않는 작업 상태
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _read_boot_id() -> str:
+    """서버 부팅 ID (재부팅 후 같은 pid가 재사용되어도 구분하기 위함)"""
+    try:
+        with open("/proc/sys/kernel/random/boot_id", encoding="utf-8") as boot_id:
+            return boot_id.read().strip()
+    except OSError:
+        return "unknown"
+
+
+# 작업을 실행하는 현재 프로세스 식별자 (부팅 ID:pid:프로세스별 난수)
+# 컨테이너 재시작 후 같은 pid를 다시 받아도 이전 프로세스와 구분되도록 난수를 붙임
+WORKER_ID = f"{_read_boot_id()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _worker_alive(worker: Optional[str]) -> bool:
+    """작업 소유 프로세스가 살아 있는지 확인 (같은 부팅의 같은 서버에서만 판단 가능)"""
+    if not worker:
+        return False
+    if worker == WORKER_ID:
+        return True
+    boot_id, _, rest = worker.partition(":")
+    pid = rest.partition(":")[0]
+    if boot_id != WORKER_ID.partition(":")[0]:
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except PermissionError:
+        return True
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _orphaned(job: Dict) -> Dict:
+    return {
+        **job,
+        "success": False,
+        "status": "failed",
+        "message": ORPHANED_JOB_MESSAGE,
+        "error": "worker_lost",
+        "finished_at": datetime.utcnow().isoformat()
+    }
+
+
+class MemoryJobStore:
+    """프로세스 메모리 작업 저장소 (단일 워커/개발용)"""
+
+    def __init__(self):
+        self._jobs: Dict[str, tuple] = {}  # job_id → (만료 시각, 작업 상태)
+        self._cancel_requested = set()
+        self._lock = threading.Lock()
+
+    def put(self, job: Dict, ttl: int) -> None:
+        self.put_many([job], ttl)
+
+    def put_many(self, jobs: List[Dict], ttl: int) -> None:
+        with self._lock:
+            for job in jobs:
+                self._jobs[job["job_id"]] = (time.time() + ttl, dict(job))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if not entry or entry[0] <= time.time():
+                return None
+            return dict(entry[1])
+
+    def request_cancel(self, job_id: str) -> None:
+        with self._lock:
+            self._cancel_requested.add(job_id)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancel_requested
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, (expires_at, _) in self._jobs.items() if expires_at <= now]
+            for job_id in expired:
+                del self._jobs[job_id]
+                self._cancel_requested.discard(job_id)
+            return len(expired)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def fail_orphaned(self) -> int:
+        # 프로세스 메모리 저장소는 프로세스와 함께 사라지므로 중단된 작업이 남지 않음
+        return 0
+
+
+class SQLiteJobStore:
+    """
+    SQLite 파일 작업 저장소 (기본값)
+
+    재시작 후에도 완료된 결과가 남고 같은 서버의 다른 워커에서도 상태를 조회할 수 있다.
+    작업 상태는 JSON으로 저장하며 Pydantic 모델 등은 jsonable_encoder로 변환한다.
+    각 작업에는 실행 프로세스(worker)와 마지막 생존 신호 시각(heartbeat_at)을 함께 기록하여,
+    처리하던 프로세스가 죽은 작업은 조회 시점 또는 시작 시점에 failed로 바꾼다.
+    모든 메서드는 블로킹 I/O이므로 이벤트 루프에서는 스레드로 호출해야 한다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_JOB_DB_PATH, stale_seconds: float = 60.0):
+        self.db_path = db_path
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, kind TEXT, owner TEXT, status TEXT NOT NULL, data TEXT NOT NULL, "
+            "cancel_requested INTEGER NOT NULL DEFAULT 0, updated_at REAL NOT NULL, expires_at REAL NOT NULL, "
+            "worker TEXT, heartbeat_at REAL)"
+        )
+        # 이전 버전에서 만든 테이블에는 worker / heartbeat_at 컬럼이 없음
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (("worker", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+        self._conn.commit()
+
+    def put(self, job: Dict, ttl: int) -> None:
+        self.put_many([job], ttl)
+
+    def put_many(self, jobs: List[Dict], ttl: int) -> None:
+        """여러 작업 상태를 한 번의 커밋으로 기록 (기록 시각을 생존 신호로 사용)"""
+        now = time.time()
+        rows = [
+            (job["job_id"], job.get("kind"), job.get("owner"), job["status"],
+             json.dumps(jsonable_encoder(job), ensure_ascii=False), now, now + ttl, WORKER_ID, now)
+            for job in jobs
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO jobs (job_id, kind, owner, status, data, updated_at, expires_at, worker, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET status = excluded.status, data = excluded.data, "
+                "updated_at = excluded.updated_at, expires_at = excluded.expires_at, "
+                "worker = excluded.worker, heartbeat_at = excluded.heartbeat_at",
+                rows
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 조회 (생존 신호가 끊긴 미완료 작업은 failed로 바꿔서 반환)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, status, worker, heartbeat_at FROM jobs WHERE job_id = ? AND expires_at > ?",
+                (job_id, time.time())
+            ).fetchone()
+            if not row:
+                return None
+            job = json.loads(row[0])
+            if row[1] not in FINISHED_STATUSES and self._is_stale(row[2], row[3]):
+                job = _orphaned(job)
+                self._mark_failed(job)
+                self._conn.commit()
+        return job
+
+    def fail_orphaned(self) -> int:
+        """처리하던 프로세스가 없거나 생존 신호가 끊긴 미완료 작업을 모두 failed로 변경 (시작 시 호출)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, worker, heartbeat_at FROM jobs WHERE status NOT IN (?, ?, ?) AND expires_at > ?",
+                (*FINISHED_STATUSES, time.time())
+            ).fetchall()
+            orphaned = [
+                _orphaned(json.loads(data)) for data, worker, heartbeat_at in rows
+                if not _worker_alive(worker) or self._is_stale(worker, heartbeat_at)
+            ]
+            for job in orphaned:
+                self._mark_failed(job)
+            self._conn.commit()
+        return len(orphaned)
+
+    def request_cancel(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+    def _is_stale(self, worker: Optional[str], heartbeat_at: Optional[float]) -> bool:
+        if worker == WORKER_ID:
+            return False
+        return heartbeat_at is None or heartbeat_at < time.time() - self.stale_seconds
+
+    def _mark_failed(self, job: Dict) -> None:
+        """락을 잡은 상태에서 호출 (커밋은 호출 측에서)"""
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, data = ?, updated_at = ? WHERE job_id = ?",
+            (job["status"], json.dumps(jsonable_encoder(job), ensure_ascii=False), time.time(), job["job_id"])
+        )
+
+
+class JobManager:
+    """
+    백그라운드 작업 실행/상태 관리
+
+    - submit()으로 작업을 등록하면 즉시 job_id를 돌려주고 이벤트 루프에서 실행한다
+    - 동시에 실행되는 작업 수는 max_concurrency로 제한한다 (초과분은 pending 상태로 대기)
+    - 작업 상태는 저장소에 기록하고 ttl이 지나면 만료된다
+    - update()는 메모리 상태만 바꾸고, 저장소 기록은 persist_interval마다 모아서 스레드에서 수행한다
+      (저장소 I/O가 이벤트 루프를 막지 않도록 함). 실행 중인 작업은 heartbeat 간격마다 다시 기록된다
+    - cancel()은 취소 요청을 저장소에 남기고, 작업이 이 프로세스에서 실행 중이면 바로 취소한다
+      (다른 워커에서 실행 중인 작업은 해당 워커의 다음 저장 시점에 취소된다)
+
+    작업 함수는 async fn(job_id, *args) 형태이며 update(job_id, ...)로 진행률/결과를 기록한다.
+    """
+
+    def __init__(self, store, max_concurrency: int = 8, ttl: int = 3600,
+                 persist_interval: float = 0.5, heartbeat_seconds: float = 10.0):
+        self.store = store
+        self.max_concurrency = max_concurrency
+        self.ttl = ttl
+        self.persist_interval = persist_interval
+        self.heartbeat_seconds = heartbeat_seconds
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: Dict[str, Dict] = {}           # 이 프로세스에서 실행 중(또는 기록 대기 중)인 작업 상태
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._dirty = set()                         # 저장소 기록이 필요한 job_id
+        self._wakeup: Optional[asyncio.Event] = None
+        self._persister: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.persist_batches = 0
+        self.orphaned = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    async def submit(self, kind: str, fn: Callable[..., Awaitable[Any]], *args, owner: Optional[str] = None,
+                     initial: Optional[Dict] = None) -> Dict:
+        """작업 등록 및 실행 시작 (다른 워커에서도 바로 조회되도록 첫 상태는 기록 후 반환)"""
+        job_id = str(uuid.uuid4())
+        job = {
+            "success": True,
+            "status": "pending",
+            "message": "작업 대기 중입니다",
+            "progress": 0,
+            **(initial or {}),
+            "job_id": job_id,
+            "kind": kind,
+            "owner": owner,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        self._jobs[job_id] = job
+        await self._store_call(self.store.put, dict(job), self.ttl)
+        self._ensure_persister()
+        self._tasks[job_id] = asyncio.ensure_future(self._run(job_id, fn, args))
+        self.submitted += 1
+        return dict(job)
+
+    def update(self, job_id: str, **fields) -> None:
+        """진행률/결과 기록 (저장소에는 다음 기록 주기에 반영)"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        job.update(fields)
+        self._mark_dirty(job_id)
+
+    async def get(self, job_id: str, owner: Optional[str] = None) -> Optional[Dict]:
+        """작업 상태 조회 (owner가 주어지면 다른 사용자의 작업은 None)"""
+        job = self._jobs.get(job_id)
+        job = dict(job) if job is not None else await self._store_call(self.store.get, job_id)
+        if job is None or (owner is not None and job.get("owner") != owner):
+            return None
+        return job
+
+    async def cancel(self, job_id: str, owner: Optional[str] = None) -> Optional[Dict]:
+        """작업 취소 요청 (없는 작업이면 None, 이미 끝난 작업은 그대로 반환)"""
+        job = await self.get(job_id, owner)
+        if job is None or job["status"] in FINISHED_STATUSES:
+            return job
+        await self._store_call(self.store.request_cancel, job_id)
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            return dict(self._jobs.get(job_id, job), status="cancelling")
+        return dict(job, status="cancelling")
+
+    def fail_orphaned(self) -> int:
+        """처리하던 프로세스가 사라진 미완료 작업을 failed로 정리 (시작 시 호출)"""
+        try:
+            count = self.store.fail_orphaned()
+        except Exception as e:
+            print(f"[WARNING] 중단된 작업 정리 실패: {str(e)}")
+            return 0
+        self.orphaned += count
+        if count:
+            print(f"[INFO] 처리하던 프로세스가 종료된 작업 {count}건을 실패로 처리했습니다")
+        return count
+
+    def stats(self) -> Dict:
+        """작업 실행 통계"""
+        return {
+            "store": type(self.store).__name__,
+            "worker": WORKER_ID,
+            "max_concurrency": self.max_concurrency,
+            "ttl_seconds": self.ttl,
+            "persist_interval_seconds": self.persist_interval,
+            "running": sum(1 for job in self._jobs.values() if job["status"] == "processing"),
+            "pending": sum(1 for job in self._jobs.values() if job["status"] == "pending"),
+            "unsaved_updates": len(self._dirty),
+            "persist_batches": self.persist_batches,
+            "stored_jobs": self.store.count(),
+            "orphaned_jobs_failed": self.orphaned,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled
+        }
+
+    async def shutdown(self) -> None:
+        """실행 중인 작업 취소 후 남은 상태 기록 (앱 종료 시)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._persister is not None:
+            self._persister.cancel()
+            await asyncio.gather(self._persister, return_exceptions=True)
+            self._persister = None
+        await self._persist()
+
+    # ===== 내부 처리 =====
+
+    async def _run(self, job_id: str, fn: Callable[..., Awaitable[Any]], args: tuple) -> None:
+        """동시 실행 수 제한 안에서 작업 실행 후 최종 상태 기록"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with self._semaphore:
+                self.update(job_id, status="processing", started_at=datetime.utcnow().isoformat())
+                await fn(job_id, *args)
+            job = self._jobs[job_id]
+            if job["status"] not in FINISHED_STATUSES:
+                self.update(job_id, status="completed", progress=100)
+            if job["status"] == "failed":
+                self.failed += 1
+            else:
+                self.completed += 1
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            self.update(job_id, success=False, status="cancelled", message="작업이 취소되었습니다")
+        except Exception as e:
+            print(f"[ERROR] 백그라운드 작업 실패 (job_id={job_id}): {str(e)}")
+            self.failed += 1
+            self.update(job_id, success=False, status="failed", message=f"오류가 발생했습니다: {str(e)}", error=str(e))
+        finally:
+            # 최종 상태가 저장소에 기록될 때까지 메모리에 남겨 두어 이 프로세스의 조회는 항상 최신 상태를 본다
+            self.update(job_id, finished_at=datetime.utcnow().isoformat())
+            self._tasks.pop(job_id, None)
+
+    def _mark_dirty(self, job_id: str) -> None:
+        self._dirty.add(job_id)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_persister(self) -> None:
+        if self._persister is None or self._persister.done():
+            self._wakeup = asyncio.Event()
+            self._persister = asyncio.ensure_future(self._persist_loop())
+
+    async def _persist_loop(self) -> None:
+        """변경된 작업 상태를 persist_interval마다 모아서 기록 (실행 중인 작업은 heartbeat 간격마다 재기록)"""
+        last_heartbeat = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.heartbeat_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if time.monotonic() - last_heartbeat >= self.heartbeat_seconds:
+                self._dirty.update(self._jobs)
+                last_heartbeat = time.monotonic()
+            await self._persist()
+            await asyncio.sleep(self.persist_interval)
+
+    async def _persist(self) -> None:
+        """기록 대기 중인 작업 상태를 스레드에서 한 번에 저장하고, 다른 워커의 취소 요청을 반영"""
+        if not self._dirty:
+            return
+        job_ids, self._dirty = self._dirty, set()
+        snapshots = [dict(self._jobs[job_id]) for job_id in job_ids if job_id in self._jobs]
+        if not snapshots:
+            return
+
+        try:
+            cancel_ids = await asyncio.to_thread(self._write_snapshots, snapshots)
+        except Exception as e:
+            print(f"[WARNING] 작업 상태 저장 실패 ({len(snapshots)}건): {str(e)}")
+            self._dirty.update(job["job_id"] for job in snapshots)
+            return
+
+        self.persist_batches += 1
+        for job in snapshots:
+            job_id = job["job_id"]
+            # 저장한 최종 상태 이후로 바뀐 것이 없으면 메모리에서 제거
+            if job["status"] in FINISHED_STATUSES and job_id not in self._tasks and job_id not in self._dirty:
+                self._jobs.pop(job_id, None)
+        for job_id in cancel_ids:
+            task = self._tasks.get(job_id)
+            if task is not None:
+                task.cancel()
+
+    def _write_snapshots(self, snapshots: List[Dict]) -> List[str]:
+        """저장소 기록 + 취소 요청 확인 (스레드에서 실행, 주기적으로 만료 작업 정리)"""
+        self.store.put_many(snapshots, self.ttl)
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % PURGE_EVERY_WRITES == 0
+        if purge:
+            self.store.purge_expired()
+        return [
+            job["job_id"] for job in snapshots
+            if job["status"] not in FINISHED_STATUSES and self.store.is_cancel_requested(job["job_id"])
+        ]
+
+    async def _store_call(self, func, *args):
+        """저장소 I/O를 스레드에서 실행 (SQLite 잠금 대기가 이벤트 루프를 막지 않도록)"""
+        return await asyncio.to_thread(func, *args)
+
+
+def _create_store():
+    """JOB_STORE 설정에 맞는 저장소 생성 (SQLite를 쓸 수 없으면 메모리 저장소)"""
+    if JOB_STORE == "sqlite":
+        db_path = os.getenv("JOB_STORE_DB", DEFAULT_JOB_DB_PATH)
+        try:
+            return SQLiteJobStore(db_path, stale_seconds=JOB_STALE_SECONDS)
+        except Exception as e:
+            print(f"[WARNING] 작업 저장소 사용 불가 ({db_path}), 메모리 저장소로 대체: {str(e)}")
+    return MemoryJobStore()
+
+
+# 전역 작업 관리자
+job_manager = JobManager(
+    _create_store(),
+    max_concurrency=JOB_MAX_CONCURRENCY,
+    ttl=JOB_RESULT_TTL,
+    persist_interval=JOB_PERSIST_INTERVAL,
+    heartbeat_seconds=JOB_HEARTBEAT_SECONDS
+)
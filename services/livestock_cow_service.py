@@ -3,17 +3,21 @@
 from datetime import datetime
 from typing import Dict, Optional
 from fastapi import HTTPException, status
-from config.firebase_config import get_firestore_client
+from config.firebase_config import get_async_firestore_client
+from services.cow_directory_cache import cow_directory_cache
+from services.farm_stats_service import FarmStatsService
 from schemas.cow import HealthStatus, BreedingStatus
+from services.ekape_xml import parse_trace_items
+from services.http_clients import http_clients
+from services.livestock_trace_cache import livestock_trace_cache
+from services.singleflight import livestock_trace_flight
 import uuid
-import httpx
-import xml.etree.ElementTree as ET
 import os
 
+# 축산물이력제 차단기가 열려 있을 때 안내 문구 (수동 등록 유도)
+TRACE_UNAVAILABLE_MESSAGE = "축산물이력제 서비스가 일시적으로 응답하지 않습니다. 잠시 후 다시 시도하거나 수동으로 등록해주세요"
+
 class LivestockCowService:
-    # 메모리 캐싱 
-    _cache = {}  # 결과 저장
-    _cache_time = {}  # 언제 저장했는지 기록
     
     @staticmethod
     async def check_registration_status(ear_tag_number: str, farm_id: str) -> Dict:
@@ -25,10 +29,10 @@ class LivestockCowService:
         3. 상태에 따른 응답 반환
         """
         try:
-            db = get_firestore_client()
+            db = get_async_firestore_client()
             
             # 1. 이미 등록된 젖소인지 확인 (전체 시스템에서)
-            existing_cow_query = (db.collection('cows')
+            existing_cow_query = await (db.collection('cows')
                                 .where('ear_tag_number', '==', ear_tag_number)
                                 .where('is_active', '==', True)
                                 .get())
@@ -68,6 +72,13 @@ class LivestockCowService:
                     "message": "축산물이력제에서 젖소 정보를 찾았습니다",
                     "livestock_trace_data": livestock_data
                 }
+            elif not http_clients.available("ekape"):
+                # 축산물이력제 장애 중 - 대기하지 않고 바로 수동 등록 안내
+                return {
+                    "status": "manual_registration_required",
+                    "ear_tag_number": ear_tag_number,
+                    "message": TRACE_UNAVAILABLE_MESSAGE
+                }
             else:
                 return {
                     "status": "manual_registration_required", 
@@ -99,11 +110,11 @@ class LivestockCowService:
         3. Firebase에 젖소 정보 저장
         """
         try:
-            db = get_firestore_client()
+            db = get_async_firestore_client()
             farm_id = user.get("farm_id")
             
             # 1. 중복 확인 (전체 시스템에서)
-            existing_cow_query = (db.collection('cows')
+            existing_cow_query = await (db.collection('cows')
                                 .where('ear_tag_number', '==', ear_tag_number)
                                 .where('is_active', '==', True)
                                 .get())
@@ -124,7 +135,7 @@ class LivestockCowService:
             
             # 2. 센서 번호 중복 확인 (제공된 경우)
             if sensor_number:
-                existing_sensor_query = (db.collection('cows')
+                existing_sensor_query = await (db.collection('cows')
                                        .where('farm_id', '==', farm_id)
                                        .where('sensor_number', '==', sensor_number)
                                        .where('is_active', '==', True)
@@ -140,6 +151,11 @@ class LivestockCowService:
             livestock_data = await LivestockCowService._fetch_livestock_trace_data(ear_tag_number)
             
             if not livestock_data or not livestock_data.get("basic_info"):
+                if not http_clients.available("ekape"):
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=TRACE_UNAVAILABLE_MESSAGE
+                    )
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="축산물이력제에서 젖소 정보를 찾을 수 없습니다"
@@ -172,8 +188,12 @@ class LivestockCowService:
                 "livestock_trace_registered_at": current_time
             }
             
-            # 6. Firebase에 저장
-            db.collection('cows').document(cow_id).set(cow_document)
+            # 6. Firebase에 저장 (농장 통계 카운터와 함께 커밋)
+            batch = db.batch()
+            batch.set(db.collection('cows').document(cow_id), cow_document)
+            FarmStatsService.add_to_batch(batch, farm_id, FarmStatsService.cow_deltas(cow_document), db)
+            await batch.commit()
+            cow_directory_cache.invalidate(farm_id)
             
             # 7. 성공 응답
             return {
@@ -205,21 +225,7 @@ class LivestockCowService:
     async def _fetch_livestock_trace_data(ear_tag_number: str) -> Optional[Dict]:
         """축산물이력제 API에서 젖소 정보 조회"""
         try:
-            # 캐시 확인 (5분간 유효)
             current_time = datetime.utcnow()
-            if ear_tag_number in LivestockCowService._cache:
-                cached_time = LivestockCowService._cache_time[ear_tag_number]
-                time_diff = (current_time - cached_time).total_seconds()
-                
-                if time_diff < 300:  # 5분
-                    print(f"[캐시 사용] 이표번호 {ear_tag_number}")
-                    return LivestockCowService._cache[ear_tag_number]
-                else:
-                    # 오래된 캐시 삭제
-                    del LivestockCowService._cache[ear_tag_number]
-                    del LivestockCowService._cache_time[ear_tag_number]
-            
-            print(f"[API 호출] 이표번호 {ear_tag_number}")
             
             service_key = os.getenv("LIVESTOCK_TRACE_API_DECODING_KEY")
             if not service_key:
@@ -245,11 +251,6 @@ class LivestockCowService:
                 "api_response_time": current_time.isoformat()
             }
             
-            # 캐시에 저장
-            LivestockCowService._cache[ear_tag_number] = result
-            LivestockCowService._cache_time[ear_tag_number] = current_time
-            print(f"[캐시 저장] 이표번호 {ear_tag_number}")
-            
             return result
             
         except Exception as e:
@@ -258,7 +259,32 @@ class LivestockCowService:
     
     @staticmethod
     async def _fetch_livestock_api(base_url: str, service_key: str, ear_tag_number: str, option_no: str):
-        """축산물이력제 API 호출"""
+        """축산물이력제 API 호출 - (이표번호, optionNo) 단위 캐시 + 동시 요청 합치기 적용"""
+        cached, items = await livestock_trace_cache.aget(ear_tag_number, option_no)
+        if cached:
+            print(f"[캐시 사용] 이표번호 {ear_tag_number} (optionNo={option_no})")
+            return items or None
+        
+        # 차단기가 열려 있으면 대기하지 않고 바로 실패 (캐시된 정보만 사용)
+        if not http_clients.available("ekape"):
+            return None
+        
+        async def _load():
+            print(f"[API 호출] 이표번호 {ear_tag_number} (optionNo={option_no})")
+            items = await LivestockCowService._request_livestock_api(base_url, service_key, ear_tag_number, option_no)
+            
+            # 정상 응답만 캐시 (데이터 없음은 짧은 TTL로 캐시, 오류 응답은 캐시하지 않음)
+            if items is not None:
+                await livestock_trace_cache.aset(ear_tag_number, option_no, items)
+            return items
+        
+        # 라우터 조회와 같은 키를 사용하므로 등록 상태 확인/등록/이력 조회가 동시에 들어와도 한 번만 호출
+        items = await livestock_trace_flight.do((ear_tag_number, option_no), _load)
+        return items or None
+    
+    @staticmethod
+    async def _request_livestock_api(base_url: str, service_key: str, ear_tag_number: str, option_no: str):
+        """축산물이력제 API 단건 호출 (아이템 목록, 데이터 없음이면 빈 목록, 오류면 None)"""
         try:
             import urllib.parse
             
@@ -273,42 +299,12 @@ class LivestockCowService:
                 "optionNo": option_no
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(base_url, params=params, timeout=30.0)
-                
-                if response.status_code != 200:
-                    return None
-                
-                try:
-                    root = ET.fromstring(response.text)
-                except ET.ParseError:
-                    return None
-                
-                # 응답 상태 확인
-                header = root.find('header')
-                if header is not None:
-                    result_code = header.find('resultCode')
-                    if result_code is not None and result_code.text != "00":
-                        return None
-                
-                # 데이터 추출
-                items = root.find('.//items')
-                if items is None:
-                    return None
-                    
-                item_elements = items.findall('item')
-                if len(item_elements) == 0:
-                    return None
-                
-                item_list = []
-                for item in item_elements:
-                    item_data = {}
-                    for element in item:
-                        if element.text:
-                            item_data[element.tag] = element.text.strip()
-                    item_list.append(item_data)
-                    
-                return item_list
+            response = await http_clients.get("ekape", base_url, params=params)
+            
+            if response.status_code != 200:
+                return None
+            
+            return parse_trace_items(response.content)
                 
         except Exception as e:
             print(f"[ERROR] API 호출 오류: {str(e)}")
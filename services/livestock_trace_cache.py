@@ -0,0 +1,272 @@
+# services/livestock_trace_cache.py
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# 옵션별 캐시 유효 시간 (초) - 출생/기본 정보는 거의 바뀌지 않고 백신/검사 정보는 자주 갱신됨
+OPTION_TTLS = {
+    "1": 7 * 24 * 3600,   # 기본 개체정보
+    "2": 24 * 3600,       # 출생 등 신고정보 (농장 이동)
+    "3": 24 * 3600,       # 도축정보
+    "4": 24 * 3600,       # 포장정보
+    "5": 6 * 3600,        # 구제역백신
+    "6": 6 * 3600,        # 질병정보
+    "7": 6 * 3600         # 브루셀라/결핵 검사
+}
+DEFAULT_TTL = 3600
+# 조회 결과가 없는 경우(정상 응답 + 데이터 없음)의 캐시 유효 시간
+NEGATIVE_TTL = int(os.getenv("LIVESTOCK_TRACE_NEGATIVE_TTL", "600"))
+
+# 워커 간에 공유하는 로컬 디스크 캐시 파일
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), "blackcows_livestock_trace_cache.sqlite3")
+# 만료 항목 정리 / 최대 행 수 확인 주기 (쓰기 횟수 기준)
+PURGE_EVERY_WRITES = 100
+# 디스크 캐시 최대 행 수 (넘으면 오래 전에 저장된 항목부터 90%까지 줄임)
+DEFAULT_DISK_MAX_ROWS = 50000
+
+
+class LivestockTraceCache:
+    """
+    축산물이력제 응답 캐시 ((이표번호, optionNo) → 아이템 목록)
+
+    - 메모리 LRU(프로세스별) + SQLite 파일(같은 서버의 uvicorn 워커 간 공유) 2단계
+    - 옵션별 TTL 적용, 데이터 없음 응답은 NEGATIVE_TTL 동안만 보관
+    - 오류 응답(HTTP 오류, 타임아웃, 결과코드 오류)은 캐시하지 않는다 (호출 측에서 set하지 않음)
+    - 비동기 호출 측은 aget()/aset()을 사용한다 (디스크 I/O는 스레드에서 실행)
+    - 디스크 캐시는 disk_max_rows를 넘지 않도록 오래된 항목부터 지운다
+      (워커별로 PURGE_EVERY_WRITES회 쓰기마다 확인)
+    """
+
+    def __init__(self, max_entries: int = 2048, db_path: Optional[str] = DEFAULT_DB_PATH,
+                 disk_max_rows: int = DEFAULT_DISK_MAX_ROWS):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.disk_max_rows = disk_max_rows
+        self._entries: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()  # 키 → (만료 시각, 아이템 목록)
+        self._lock = threading.Lock()        # 메모리 LRU / 통계
+        self._disk_lock = threading.Lock()   # SQLite 연결 (스레드에서만 잡음)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+    def get(self, ear_tag_number: str, option_no: str) -> Tuple[bool, Optional[List[Dict]]]:
+        """
+        캐시 조회 (동기 - 스레드에서 호출)
+
+        Returns:
+            (캐시 적중 여부, 아이템 목록 - 데이터 없음으로 캐시된 경우 빈 목록)
+        """
+        key = (ear_tag_number, option_no)
+        now = time.time()
+        entry = self._memory_get(key, now)
+        if entry is None:
+            entry = self._disk_lookup(key, now)
+        return (True, entry[1]) if entry else (False, None)
+
+    async def aget(self, ear_tag_number: str, option_no: str) -> Tuple[bool, Optional[List[Dict]]]:
+        """캐시 조회 (메모리 적중은 바로 반환, 디스크 조회는 스레드에서 실행)"""
+        key = (ear_tag_number, option_no)
+        now = time.time()
+        entry = self._memory_get(key, now)
+        if entry is None:
+            entry = await asyncio.to_thread(self._disk_lookup, key, now)
+        return (True, entry[1]) if entry else (False, None)
+
+    def set(self, ear_tag_number: str, option_no: str, items: List[Dict]) -> None:
+        """정상 응답 저장 (빈 목록이면 데이터 없음으로 짧게 보관) - 동기"""
+        key, entry = self._entry(ear_tag_number, option_no, items)
+        with self._lock:
+            self._remember(key, entry)
+        self._disk_set(key, entry)
+
+    async def aset(self, ear_tag_number: str, option_no: str, items: List[Dict]) -> None:
+        """정상 응답 저장 (디스크 쓰기는 스레드에서 실행)"""
+        key, entry = self._entry(ear_tag_number, option_no, items)
+        with self._lock:
+            self._remember(key, entry)
+        await asyncio.to_thread(self._disk_set, key, entry)
+
+    def invalidate(self, ear_tag_number: str) -> None:
+        """이표번호의 모든 옵션 캐시 삭제"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == ear_tag_number]:
+                del self._entries[key]
+        self._disk_execute("DELETE FROM livestock_trace_cache WHERE ear_tag = ?", (ear_tag_number,))
+
+    def clear(self) -> None:
+        """전체 캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+        self._disk_execute("DELETE FROM livestock_trace_cache")
+
+    def stats(self) -> Dict:
+        """캐시 크기 산정용 통계"""
+        with self._lock:
+            total = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries_cached": len(self._entries),
+                "max_entries": self.max_entries,
+                "db_path": self.db_path,
+                "disk_max_rows": self.disk_max_rows,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions
+            }
+
+    # ===== 내부 처리 =====
+
+    @staticmethod
+    def _entry(ear_tag_number: str, option_no: str, items: List[Dict]) -> Tuple[Tuple[str, str], tuple]:
+        ttl = OPTION_TTLS.get(option_no, DEFAULT_TTL) if items else NEGATIVE_TTL
+        return (ear_tag_number, option_no), (time.time() + ttl, list(items))
+
+    def _memory_get(self, key: Tuple[str, str], now: float) -> Optional[tuple]:
+        """메모리 LRU 조회 (만료 항목은 삭제)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                if not entry[1]:
+                    self.negative_hits += 1
+                return entry
+            if entry:
+                del self._entries[key]
+            return None
+
+    def _disk_lookup(self, key: Tuple[str, str], now: float) -> Optional[tuple]:
+        """디스크 캐시 조회 후 메모리에 올림 (적중/미적중 집계)"""
+        entry = self._disk_get(key, now)
+        with self._lock:
+            if entry:
+                self._remember(key, entry)
+                self.disk_hits += 1
+                if not entry[1]:
+                    self.negative_hits += 1
+            else:
+                self.misses += 1
+        return entry
+
+    def _remember(self, key: Tuple[str, str], entry: tuple) -> None:
+        """메모리 LRU에 저장 (락을 잡은 상태에서 호출)"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """SQLite 연결 (최초 사용 시 테이블 생성, 실패하면 메모리 캐시만 사용) - _disk_lock을 잡은 상태에서 호출"""
+        if self._conn is None and self.db_path:
+            try:
+                conn = sqlite3.connect(self.db_path, timeout=1.0, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS livestock_trace_cache ("
+                    "ear_tag TEXT NOT NULL, option_no TEXT NOT NULL, items TEXT NOT NULL, "
+                    "expires_at REAL NOT NULL, stored_at REAL NOT NULL DEFAULT 0, "
+                    "PRIMARY KEY (ear_tag, option_no))"
+                )
+                # 이전 버전에서 만든 파일에는 stored_at 컬럼이 없음
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(livestock_trace_cache)")}
+                if "stored_at" not in columns:
+                    conn.execute("ALTER TABLE livestock_trace_cache ADD COLUMN stored_at REAL NOT NULL DEFAULT 0")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_livestock_trace_cache_stored_at "
+                    "ON livestock_trace_cache (stored_at)"
+                )
+                conn.commit()
+                self._conn = conn
+            except Exception as e:
+                print(f"[WARNING] 축산물이력제 디스크 캐시 사용 불가 ({self.db_path}): {str(e)}")
+                self.db_path = None
+        return self._conn
+
+    def _disk_get(self, key: Tuple[str, str], now: float) -> Optional[tuple]:
+        """디스크 캐시 조회 (만료되었거나 오류면 None)"""
+        with self._disk_lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT items, expires_at FROM livestock_trace_cache WHERE ear_tag = ? AND option_no = ?",
+                    key
+                ).fetchone()
+                if row and row[1] > now:
+                    return row[1], json.loads(row[0])
+            except Exception as e:
+                print(f"[WARNING] 축산물이력제 디스크 캐시 조회 실패: {str(e)}")
+            return None
+
+    def _disk_set(self, key: Tuple[str, str], entry: tuple) -> None:
+        """디스크 캐시 저장 (주기적으로 만료 항목 정리 + 최대 행 수 유지)"""
+        self._disk_execute(
+            "INSERT OR REPLACE INTO livestock_trace_cache (ear_tag, option_no, items, expires_at, stored_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key[0], key[1], json.dumps(entry[1], ensure_ascii=False), entry[0], time.time())
+        )
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % PURGE_EVERY_WRITES == 0
+        if purge:
+            self._disk_purge()
+
+    def _disk_purge(self) -> None:
+        """만료 항목 삭제 후 최대 행 수를 넘으면 오래 전에 저장된 항목부터 삭제"""
+        with self._disk_lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM livestock_trace_cache WHERE expires_at <= ?", (time.time(),))
+                rows = conn.execute("SELECT COUNT(*) FROM livestock_trace_cache").fetchone()[0]
+                excess = rows - int(self.disk_max_rows * 0.9) if rows > self.disk_max_rows else 0
+                if excess > 0:
+                    conn.execute(
+                        "DELETE FROM livestock_trace_cache WHERE rowid IN ("
+                        "SELECT rowid FROM livestock_trace_cache ORDER BY stored_at LIMIT ?)",
+                        (excess,)
+                    )
+                conn.commit()
+                if excess > 0:
+                    with self._lock:
+                        self.disk_evictions += excess
+            except Exception as e:
+                print(f"[WARNING] 축산물이력제 디스크 캐시 정리 실패: {str(e)}")
+
+    def _disk_execute(self, sql: str, params: tuple = ()) -> None:
+        """디스크 캐시 쓰기 (실패해도 메모리 캐시는 계속 사용)"""
+        with self._disk_lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(sql, params)
+                conn.commit()
+            except Exception as e:
+                print(f"[WARNING] 축산물이력제 디스크 캐시 쓰기 실패: {str(e)}")
+
+
+# 전역 캐시 인스턴스
+livestock_trace_cache = LivestockTraceCache(
+    max_entries=int(os.getenv("LIVESTOCK_TRACE_CACHE_MAX_ENTRIES", "2048")),
+    db_path=os.getenv("LIVESTOCK_TRACE_CACHE_DB", DEFAULT_DB_PATH) or None,
+    disk_max_rows=int(os.getenv("LIVESTOCK_TRACE_CACHE_DISK_MAX_ROWS", str(DEFAULT_DISK_MAX_ROWS)))
+)
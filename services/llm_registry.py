@@ -0,0 +1,210 @@
+# services/llm_registry.py
+
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import BasePromptTemplate
+from langchain_openai import ChatOpenAI
+import asyncio
+import httpx
+import os
+import threading
+import time
+
+# 챗봇 LLM 모델 / 동시 호출 수 / 연결 풀 크기
+CHATBOT_LLM_MODEL = os.getenv("CHATBOT_LLM_MODEL", "gpt-4o-mini")
+CHATBOT_LLM_MAX_CONCURRENCY = int(os.getenv("CHATBOT_LLM_MAX_CONCURRENCY", "8"))
+CHATBOT_LLM_MAX_CONNECTIONS = int(os.getenv("CHATBOT_LLM_MAX_CONNECTIONS", "20"))
+CHATBOT_LLM_TIMEOUT = float(os.getenv("CHATBOT_LLM_TIMEOUT", "60.0"))
+# 스트리밍 호출이 슬롯을 기다릴 때 재확인 간격 상한 (초)
+ASYNC_ACQUIRE_MAX_DELAY = 0.05
+
+# 용도별 LLM 설정
+LLM_PROFILES: Dict[str, Dict[str, Any]] = {
+    "classifier": {"temperature": 0},
+    "general": {"temperature": 0.5},
+    "rag": {"temperature": 0.3, "streaming": True},
+}
+
+
+class ChatbotLLMRegistry:
+    """
+    챗봇 LLM 클라이언트 / 체인 모음
+
+    - 프롬프트 템플릿과 체인(prompt | llm | StrOutputParser)은 처음 사용할 때 한 번만 만든다
+    - 모든 ChatOpenAI가 같은 httpx 클라이언트(연결 풀)를 공유한다
+    - 동시 LLM 호출 수는 max_concurrency로 제한한다
+    - use_llm_factory() / use_fake_llm()으로 LLM을 바꿔 끼울 수 있다 (테스트/로컬 실행용)
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_connections: int = 20):
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._chain_specs: Dict[str, tuple] = {}   # 체인 이름 → (프롬프트, LLM 용도)
+        self._chains: Dict[str, Any] = {}
+        self._llms: Dict[str, BaseChatModel] = {}
+        self._llm_factory: Callable[[str, Dict[str, Any]], BaseChatModel] = self._openai_llm
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def register_chain(self, name: str, prompt: BasePromptTemplate, profile: str) -> None:
+        """체인 등록 (실제 생성은 처음 사용할 때)"""
+        with self._lock:
+            self._chain_specs[name] = (prompt, profile)
+            self._chains.pop(name, None)
+            self._metrics.setdefault(name, {"calls": 0, "errors": 0, "total_seconds": 0.0,
+                                            "streams": 0, "first_token_seconds": 0.0})
+
+    def llm(self, profile: str) -> BaseChatModel:
+        """용도별 LLM (프로세스당 한 번 생성)"""
+        with self._lock:
+            return self._get_llm(profile)
+
+    def chain(self, name: str):
+        """등록된 체인 (프로세스당 한 번 생성)"""
+        with self._lock:
+            chain = self._chains.get(name)
+            if chain is None:
+                prompt, profile = self._chain_specs[name]
+                chain = prompt | self._get_llm(profile) | StrOutputParser()
+                self._chains[name] = chain
+            return chain
+
+    def invoke(self, name: str, inputs: Dict[str, Any]) -> str:
+        """체인 실행 (동시 호출 수 제한, 호출 수/지연 시간 집계)"""
+        chain = self.chain(name)
+        metrics = self._metrics[name]
+        with self._semaphore:
+            started = time.monotonic()
+            try:
+                return chain.invoke(inputs)
+            except Exception:
+                with self._lock:
+                    metrics["errors"] += 1
+                raise
+            finally:
+                with self._lock:
+                    metrics["calls"] += 1
+                    metrics["total_seconds"] += time.monotonic() - started
+
+    async def astream(self, name: str, inputs: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        체인 스트리밍 실행 (생성되는 토큰을 바로 전달)
+
+        invoke()와 같은 동시 호출 제한을 사용하며, 첫 토큰까지 걸린 시간을 함께 집계한다.
+        """
+        chain = self.chain(name)
+        metrics = self._metrics[name]
+        await self._acquire_async()
+        started = time.monotonic()
+        first_token_at = None
+        try:
+            async for token in chain.astream(inputs):
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
+                yield token
+        except Exception:
+            with self._lock:
+                metrics["errors"] += 1
+            raise
+        finally:
+            self._semaphore.release()
+            with self._lock:
+                metrics["calls"] += 1
+                metrics["total_seconds"] += time.monotonic() - started
+                if first_token_at is not None:
+                    metrics["streams"] += 1
+                    metrics["first_token_seconds"] += first_token_at - started
+
+    def use_llm_factory(self, factory: Optional[Callable[[str, Dict[str, Any]], BaseChatModel]]) -> None:
+        """LLM 생성 함수 교체 (None이면 OpenAI로 복원) - 만들어 둔 LLM/체인은 버림"""
+        with self._lock:
+            self._llm_factory = factory or self._openai_llm
+            self._llms.clear()
+            self._chains.clear()
+
+    def use_fake_llm(self, responses: List[str]) -> None:
+        """정해진 응답을 순서대로 돌려주는 로컬 가짜 LLM 사용 (OpenAI 호출 없음)"""
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+        self.use_llm_factory(lambda profile, options: FakeListChatModel(responses=list(responses)))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "model": CHATBOT_LLM_MODEL,
+                "max_concurrency": self.max_concurrency,
+                "max_connections": self.max_connections,
+                "llms_created": sorted(self._llms),
+                "chains": {
+                    name: {
+                        "calls": int(metrics["calls"]),
+                        "errors": int(metrics["errors"]),
+                        "avg_latency_ms": round(metrics["total_seconds"] / metrics["calls"] * 1000, 1) if metrics["calls"] else 0.0,
+                        "streams": int(metrics["streams"]),
+                        "avg_first_token_ms": round(metrics["first_token_seconds"] / metrics["streams"] * 1000, 1) if metrics["streams"] else None
+                    }
+                    for name, metrics in self._metrics.items()
+                }
+            }
+
+    def close(self) -> None:
+        """공유 연결 풀 종료 (앱 종료 시)"""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            self._llms.clear()
+            self._chains.clear()
+
+    async def aclose(self) -> None:
+        """공유 비동기 연결 풀 종료 (앱 종료 시)"""
+        self.close()
+        client, self._http_async_client = self._http_async_client, None
+        if client is not None:
+            await client.aclose()
+
+    async def _acquire_async(self) -> None:
+        """
+        동시 호출 슬롯 대기 (이벤트 루프에서 비차단 획득을 반복)
+
+        invoke()와 같은 세마포어를 쓰되 대기용 스레드를 점유하지 않는다.
+        """
+        delay = 0.005
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, ASYNC_ACQUIRE_MAX_DELAY)
+
+    # ===== 내부 처리 (락을 잡은 상태에서 호출) =====
+
+    def _get_llm(self, profile: str) -> BaseChatModel:
+        llm = self._llms.get(profile)
+        if llm is None:
+            llm = self._llm_factory(profile, LLM_PROFILES[profile])
+            self._llms[profile] = llm
+        return llm
+
+    def _openai_llm(self, profile: str, options: Dict[str, Any]) -> BaseChatModel:
+        """공유 연결 풀을 사용하는 ChatOpenAI 생성"""
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        if self._http_client is None:
+            self._http_client = httpx.Client(limits=limits, timeout=CHATBOT_LLM_TIMEOUT)
+        if self._http_async_client is None:
+            self._http_async_client = httpx.AsyncClient(limits=limits, timeout=CHATBOT_LLM_TIMEOUT)
+        return ChatOpenAI(
+            model=CHATBOT_LLM_MODEL,
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=self._http_client,
+            http_async_client=self._http_async_client,
+            **options
+        )
+
+
+# 전역 레지스트리
+llm_registry = ChatbotLLMRegistry(
+    max_concurrency=CHATBOT_LLM_MAX_CONCURRENCY,
+    max_connections=CHATBOT_LLM_MAX_CONNECTIONS
+)
@@ -0,0 +1,69 @@
+# services/pagination.py
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+import base64
+import json
+
+# 다음 페이지 커서를 전달하는 응답 헤더 (목록(JSON 배열) 응답용)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(order_value, doc_id: str) -> str:
+    """정렬 키 값 + 문서 ID를 불투명 커서 문자열로 인코딩"""
+    if isinstance(order_value, datetime):
+        value = {"dt": order_value.isoformat()}
+    else:
+        value = {"v": order_value}
+    payload = json.dumps({**value, "id": doc_id}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[object, str]:
+    """커서 문자열을 (정렬 키 값, 문서 ID)로 디코딩"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        order_value = datetime.fromisoformat(payload["dt"]) if "dt" in payload else payload["v"]
+        return order_value, payload["id"]
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 페이지 커서입니다"
+        )
+
+
+def paginate_query(
+    query,
+    order_field: str,
+    direction: str = "DESCENDING",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Tuple[List, Optional[str]]:
+    """
+    커서 기반 페이지 조회
+
+    정렬 키 + 문서 ID(__name__) 순으로 정렬하고 커서 위치 다음부터 limit건을 읽는다.
+    limit이 없으면 (커서 위치 이후) 전체를 반환한다.
+
+    Returns:
+        (문서 스냅샷 목록, 다음 페이지 커서 또는 None)
+    """
+    query = query.order_by(order_field, direction=direction).order_by("__name__", direction=direction)
+
+    if cursor:
+        order_value, doc_id = decode_cursor(cursor)
+        query = query.start_after({order_field: order_value, "__name__": doc_id})
+
+    if not limit:
+        return list(query.stream()), None
+
+    # 한 건 더 읽어 다음 페이지 존재 여부 판단
+    docs = list(query.limit(limit + 1).stream())
+    if len(docs) <= limit:
+        return docs, None
+
+    docs = docs[:limit]
+    last_doc = docs[-1]
+    return docs, encode_cursor(last_doc.get(order_field), last_doc.id)
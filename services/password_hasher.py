@@ -0,0 +1,128 @@
+# services/password_hasher.py
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+import asyncio
+import os
+import threading
+import time
+
+# bcrypt 비용 인자 (변경하면 기존 해시는 다음 로그인 시 자동으로 재해싱됨)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# 동시에 bcrypt 연산을 수행할 최대 스레드 수
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+# 대기열 최대 길이 (초과 시 503 응답)
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "200"))
+
+# 비밀번호 해싱 설정 (min/max_rounds를 같게 두면 다른 비용 인자의 해시는 needs_update 대상이 됨)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+
+class PasswordHasher:
+    """
+    bcrypt 전용 작업 풀
+
+    - bcrypt 연산을 공용 스레드풀/이벤트 루프가 아닌 전용 풀에서 수행하여
+      로그인이 몰려도 다른 API 처리가 밀리지 않도록 한다
+    - 호출 측은 결과를 await로 기다리므로 대기 중에 요청 스레드를 점유하지 않는다
+    - 동시 실행 수는 워커 수로, 대기열은 max_queue로 제한한다
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 200):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.max_queued = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _submit(self, func, *args):
+        """작업 대기열에 추가 (대기열이 가득 차면 503)"""
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요"
+                )
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        submitted = time.monotonic()
+
+        def _run():
+            started = time.monotonic()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.total_wait_seconds += started - submitted
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.total_run_seconds += time.monotonic() - started
+
+        return self._executor.submit(_run)
+
+    async def hash(self, password: str) -> str:
+        """비밀번호 해싱"""
+        return await asyncio.wrap_future(self._submit(pwd_context.hash, password))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """비밀번호 검증"""
+        return await asyncio.wrap_future(self._submit(pwd_context.verify, plain_password, hashed_password))
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        비밀번호 검증 + 필요 시 재해싱
+
+        비용 인자가 바뀌었거나 폐기된 방식의 해시면 (True, 새 해시)를 반환한다
+        """
+        valid, new_hash = await asyncio.wrap_future(
+            self._submit(pwd_context.verify_and_update, plain_password, hashed_password)
+        )
+        if valid and new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict:
+        """대기열/처리 시간 통계"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                "queued": self.queued,
+                "running": self.running,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_wait_ms": round(self.total_wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+                "avg_run_ms": round(self.total_run_seconds / self.completed * 1000, 2) if self.completed else 0.0
+            }
+
+    def shutdown(self) -> None:
+        """작업 풀 종료"""
+        self._executor.shutdown(wait=False)
+
+
+# 전역 인스턴스
+password_hasher = PasswordHasher(max_workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE)
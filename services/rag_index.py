@@ -0,0 +1,322 @@
+# services/rag_index.py
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from langchain_openai import OpenAIEmbeddings
+from langchain_community.vectorstores import Chroma
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.document_loaders import TextLoader
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 개발 환경 - 워커 간 잠금 없이 진행
+    fcntl = None
+
+# 챗봇 RAG 원문 / 벡터 DB 저장 위치
+RAG_CORPUS_PATH = os.getenv("RAG_CORPUS_PATH", "dairy_farming_wiki.txt")
+RAG_PERSIST_DIR = os.getenv("RAG_PERSIST_DIR", "./chroma_dairy_knowledge")
+# 색인 설정 (바뀌면 색인 지문이 달라져 해당 청크를 다시 임베딩함)
+RAG_CHUNK_SIZE = 500
+RAG_CHUNK_OVERLAP = 50
+RAG_EMBEDDING_MODEL = os.getenv("RAG_EMBEDDING_MODEL", "text-embedding-ada-002")
+RAG_COLLECTION_NAME = "langchain"
+# 색인 지문/통계 기록 파일 (RAG_PERSIST_DIR 안에 저장)
+MANIFEST_FILE = "index_manifest.json"
+# 워커 간 색인 갱신 잠금 파일 (RAG_PERSIST_DIR 안에 생성)
+BUILD_LOCK_FILE = ".build.lock"
+# 한 번에 임베딩/저장할 청크 수
+ADD_BATCH_SIZE = 256
+# 질문당 참고 문서 수 / 질문 임베딩·검색 결과 캐시 크기
+RAG_TOP_K = 3
+RAG_RETRIEVAL_CACHE_SIZE = int(os.getenv("RAG_RETRIEVAL_CACHE_SIZE", "512"))
+
+
+class RagIndex:
+    """
+    낙농 위키 Chroma 색인 (원문 + 분할/임베딩 설정의 해시로 관리)
+
+    - 저장된 색인의 지문이 현재 원문/설정과 같으면 임베딩 없이 바로 불러온다
+    - 다르면 원문을 다시 분할하고, 청크 내용 해시를 ID로 써서 바뀐 청크만 임베딩/삭제한다
+    - 질문 임베딩과 검색 결과는 정규화한 질문 기준 LRU 캐시에 보관한다
+    - 색인 생성 시간과 첫 질문 응답 시간을 stats()로 제공한다
+    """
+
+    def __init__(self, corpus_path: str, persist_dir: str, openai_api_key: Optional[str] = None,
+                 cache_size: int = 512):
+        self.corpus_path = corpus_path
+        self.persist_dir = persist_dir
+        self.openai_api_key = openai_api_key
+        self.cache_size = cache_size
+        self._vectordb = None
+        self._embedding = None
+        self._lock = threading.Lock()
+        self._stats: Dict = {"status": "not_loaded"}
+        self._cache_lock = threading.Lock()
+        self._query_vectors: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._retrievals: "OrderedDict[tuple, list]" = OrderedDict()
+        self.embedding_hits = 0
+        self.embedding_misses = 0
+        self.retrieval_hits = 0
+        self.retrieval_misses = 0
+
+    def config(self) -> Dict:
+        """색인 지문에 포함되는 분할/임베딩 설정"""
+        return {
+            "splitter": "RecursiveCharacterTextSplitter",
+            "chunk_size": RAG_CHUNK_SIZE,
+            "chunk_overlap": RAG_CHUNK_OVERLAP,
+            "embedding_model": RAG_EMBEDDING_MODEL
+        }
+
+    def fingerprint(self) -> str:
+        """원문 내용 + 설정 해시"""
+        digest = hashlib.sha256(json.dumps(self.config(), sort_keys=True).encode("utf-8"))
+        with open(self.corpus_path, "rb") as corpus:
+            digest.update(corpus.read())
+        return digest.hexdigest()
+
+    def get(self):
+        """벡터 DB (최초 호출 시 불러오거나 갱신)"""
+        if self._vectordb is not None:
+            return self._vectordb
+        with self._lock:
+            if self._vectordb is None:
+                self._vectordb = self._load_or_update()
+        return self._vectordb
+
+    def retrieve(self, question: str, k: int = RAG_TOP_K) -> list:
+        """
+        질문과 가까운 청크 검색 (질문당 임베딩 1회 + 검색 1회)
+
+        같은 질문(공백/대소문자 정규화 기준)이 다시 들어오면 캐시된 결과를 사용한다.
+        """
+        key = normalize_question(question)
+        with self._cache_lock:
+            docs = self._retrievals.get((key, k))
+            if docs is not None:
+                self._retrievals.move_to_end((key, k))
+                self.retrieval_hits += 1
+                return docs
+            self.retrieval_misses += 1
+
+        vectordb = self.get()
+        docs = vectordb.similarity_search_by_vector(self._embed_query(key), k=k)
+        with self._cache_lock:
+            self._remember(self._retrievals, (key, k), docs)
+        return docs
+
+    def record_first_question(self, seconds: float) -> None:
+        """프로세스의 첫 RAG 질문 처리 시간 기록 (색인 로딩 포함)"""
+        with self._lock:
+            if "first_question_ms" not in self._stats:
+                self._stats["first_question_ms"] = round(seconds * 1000, 1)
+                print(f"[INFO] 첫 RAG 질문 처리 시간: {self._stats['first_question_ms']}ms")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        with self._cache_lock:
+            stats["query_cache"] = {
+                "max_entries": self.cache_size,
+                "embeddings_cached": len(self._query_vectors),
+                "embedding_hits": self.embedding_hits,
+                "embedding_misses": self.embedding_misses,
+                "retrievals_cached": len(self._retrievals),
+                "retrieval_hits": self.retrieval_hits,
+                "retrieval_misses": self.retrieval_misses
+            }
+        return stats
+
+    # ===== 내부 처리 =====
+
+    def _load_or_update(self):
+        """지문이 같으면 그대로 불러오고, 다르면 (워커 간 파일 잠금 아래에서) 바뀐 청크만 반영"""
+        started = time.monotonic()
+        fingerprint = self.fingerprint()
+        embedding = OpenAIEmbeddings(
+            model=RAG_EMBEDDING_MODEL,
+            openai_api_key=self.openai_api_key or os.getenv("OPENAI_API_KEY")
+        )
+        self._embedding = embedding
+
+        manifest = self._read_manifest()
+        if manifest.get("fingerprint") != fingerprint:
+            with self._build_lock():
+                # 잠금을 기다리는 동안 다른 워커가 갱신을 마쳤으면 그대로 사용
+                manifest = self._read_manifest()
+                if manifest.get("fingerprint") != fingerprint:
+                    return self._update(self._open(embedding), fingerprint, started)
+
+        vectordb = self._open(embedding)
+        self._stats = {
+            "status": "loaded",
+            "fingerprint": fingerprint,
+            "chunks": manifest.get("chunks"),
+            "built_at": manifest.get("built_at"),
+            "last_build_seconds": manifest.get("build_seconds"),
+            "load_seconds": round(time.monotonic() - started, 3)
+        }
+        print(f"[INFO] RAG 색인 불러옴 ({manifest.get('chunks')}개 청크, {self._stats['load_seconds']}초)")
+        return vectordb
+
+    def _open(self, embedding):
+        return Chroma(
+            collection_name=RAG_COLLECTION_NAME,
+            embedding_function=embedding,
+            persist_directory=self.persist_dir
+        )
+
+    def _update(self, vectordb, fingerprint: str, started: float):
+        """원문 분할 후 청크 ID(설정 + 내용 해시)로 기존 색인과 비교하여 바뀐 청크만 반영"""
+        documents = TextLoader(self.corpus_path, encoding="utf-8").load()
+        splitter = RecursiveCharacterTextSplitter(chunk_size=RAG_CHUNK_SIZE, chunk_overlap=RAG_CHUNK_OVERLAP)
+        chunks = splitter.split_documents(documents)
+        chunk_ids = self._chunk_ids([chunk.page_content for chunk in chunks])
+
+        existing_ids = set(vectordb.get(include=[])["ids"])
+        wanted = dict(zip(chunk_ids, chunks))
+        stale_ids = [chunk_id for chunk_id in existing_ids if chunk_id not in wanted]
+        new_ids = [chunk_id for chunk_id in chunk_ids if chunk_id not in existing_ids]
+
+        # 내용이 같은 기존 청크(이전 방식의 임의 ID 색인 포함)의 임베딩은 다시 계산하지 않고 옮겨 담음
+        reused = self._reuse_embeddings(vectordb, stale_ids, new_ids, wanted) if stale_ids and new_ids else set()
+        new_ids = [chunk_id for chunk_id in new_ids if chunk_id not in reused]
+
+        if stale_ids:
+            vectordb.delete(ids=stale_ids)
+        for start in range(0, len(new_ids), ADD_BATCH_SIZE):
+            batch_ids = new_ids[start:start + ADD_BATCH_SIZE]
+            vectordb.add_documents([wanted[chunk_id] for chunk_id in batch_ids], ids=batch_ids)
+
+        build_seconds = round(time.monotonic() - started, 3)
+        self._write_manifest({
+            "fingerprint": fingerprint,
+            "config": self.config(),
+            "chunks": len(chunk_ids),
+            "built_at": datetime.utcnow().isoformat(),
+            "build_seconds": build_seconds
+        })
+        self._stats = {
+            "status": "built" if not existing_ids else "updated",
+            "fingerprint": fingerprint,
+            "chunks": len(chunk_ids),
+            "embedded_chunks": len(new_ids),
+            "reused_chunks": len(reused),
+            "deleted_chunks": len(stale_ids),
+            "build_seconds": build_seconds
+        }
+        print(f"[INFO] RAG 색인 갱신: 청크 {len(chunk_ids)}개 중 {len(new_ids)}개 임베딩, "
+              f"{len(reused)}개 재사용, {len(stale_ids)}개 삭제 ({build_seconds}초)")
+        return vectordb
+
+    def _reuse_embeddings(self, vectordb, stale_ids: List[str], new_ids: List[str], wanted: Dict) -> set:
+        """삭제 대상 청크 중 내용이 같은 것의 임베딩을 새 ID로 저장 (옮겨 담은 새 ID 집합 반환)"""
+        existing = vectordb.get(ids=stale_ids, include=["documents", "embeddings"])
+        vectors = {}
+        for text, vector in zip(existing["documents"], existing["embeddings"]):
+            vectors.setdefault(text, vector)
+
+        reusable = [chunk_id for chunk_id in new_ids if wanted[chunk_id].page_content in vectors]
+        for start in range(0, len(reusable), ADD_BATCH_SIZE):
+            batch_ids = reusable[start:start + ADD_BATCH_SIZE]
+            vectordb._collection.add(
+                ids=batch_ids,
+                embeddings=[vectors[wanted[chunk_id].page_content] for chunk_id in batch_ids],
+                documents=[wanted[chunk_id].page_content for chunk_id in batch_ids],
+                metadatas=[wanted[chunk_id].metadata or None for chunk_id in batch_ids]
+            )
+        return set(reusable)
+
+    @contextmanager
+    def _build_lock(self):
+        """색인 갱신 파일 잠금 (같은 서버의 uvicorn 워커가 동시에 임베딩하지 않도록)"""
+        os.makedirs(self.persist_dir, exist_ok=True)
+        with open(os.path.join(self.persist_dir, BUILD_LOCK_FILE), "w") as lock_file:
+            if fcntl is None:
+                yield
+                return
+            waited = time.monotonic()
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if time.monotonic() - waited > 1:
+                print(f"[INFO] RAG 색인 갱신 잠금 대기 {round(time.monotonic() - waited, 1)}초")
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _embed_query(self, key: str) -> List[float]:
+        """정규화한 질문 임베딩 (LRU 캐시)"""
+        with self._cache_lock:
+            vector = self._query_vectors.get(key)
+            if vector is not None:
+                self._query_vectors.move_to_end(key)
+                self.embedding_hits += 1
+                return vector
+            self.embedding_misses += 1
+
+        vector = self._embedding.embed_query(key)
+        with self._cache_lock:
+            self._remember(self._query_vectors, key, vector)
+        return vector
+
+    def _remember(self, cache: OrderedDict, key, value) -> None:
+        """LRU 저장 (캐시 락을 잡은 상태에서 호출)"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def _chunk_ids(self, texts: List[str]) -> List[str]:
+        """설정 + 청크 내용 해시 ID (같은 내용의 청크가 여러 개면 순번을 붙여 구분)"""
+        config_key = json.dumps(self.config(), sort_keys=True)
+        seen: Dict[str, int] = {}
+        ids = []
+        for text in texts:
+            digest = hashlib.sha256(f"{config_key}\n{text}".encode("utf-8")).hexdigest()
+            seen[digest] = seen.get(digest, 0) + 1
+            ids.append(digest if seen[digest] == 1 else f"{digest}-{seen[digest]}")
+        return ids
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(os.path.join(self.persist_dir, MANIFEST_FILE), encoding="utf-8") as manifest:
+                return json.load(manifest)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        """색인 반영이 끝난 뒤에만 기록 (중간에 실패하면 다음 실행 때 다시 비교)"""
+        try:
+            os.makedirs(self.persist_dir, exist_ok=True)
+            path = os.path.join(self.persist_dir, MANIFEST_FILE)
+            with open(path + ".tmp", "w", encoding="utf-8") as manifest_file:
+                json.dump(manifest, manifest_file, ensure_ascii=False, indent=2)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"[WARNING] RAG 색인 정보 기록 실패: {str(e)}")
+
+
+def normalize_question(question: str) -> str:
+    """캐시 키용 질문 정규화 (앞뒤 공백 제거, 연속 공백 축약, 소문자)"""
+    return re.sub(r"\s+", " ", question).strip().lower()
+
+
+# 전역 색인 인스턴스
+rag_index = RagIndex(RAG_CORPUS_PATH, RAG_PERSIST_DIR, cache_size=RAG_RETRIEVAL_CACHE_SIZE)
+
+
+if __name__ == "__main__":
+    # 배포 시 서버 시작 전에 색인을 미리 만들어 둠: python -m services.rag_index
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    rag_index.get()
+    print(json.dumps(rag_index.stats(), ensure_ascii=False, indent=2))
@@ -1,8 +1,12 @@
 # 기록 관리 서비스
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from fastapi import HTTPException, status
 from config.firebase_config import get_firestore_client
+from services.cow_loader import CowLoader
+from services.cow_directory_cache import cow_directory_cache
+from services.farm_stats_service import FarmStatsService
+from services.pagination import paginate_query
 from schemas.record import (
     RecordResponse, RecordSummary, RecordUpdate, RecordType,
     BreedingRecordCreate, DiseaseRecordCreate, StatusChangeRecordCreate, OtherRecordCreate
@@ -51,8 +55,13 @@ class RecordFirebaseService:
                 "is_active": True
             }
             
-            # Firestore에 저장
-            db.collection('cow_records').document(record_id).set(record_document)
+            # Firestore에 저장 (농장 통계 카운터와 함께 커밋)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("basic_records", record_document)
+            )
             
             return RecordResponse(
                 id=record_id,
@@ -121,8 +130,13 @@ class RecordFirebaseService:
                 "is_active": True
             }
             
-            # Firestore에 저장
-            db.collection('cow_records').document(record_id).set(record_document)
+            # Firestore에 저장 (농장 통계 카운터와 함께 커밋)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("basic_records", record_document)
+            )
             
             return RecordResponse(
                 id=record_id,
@@ -186,8 +200,13 @@ class RecordFirebaseService:
                 "is_active": True
             }
             
-            # Firestore에 저장
-            db.collection('cow_records').document(record_id).set(record_document)
+            # Firestore에 저장 (농장 통계 카운터와 함께 커밋)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("basic_records", record_document)
+            )
             
             return RecordResponse(
                 id=record_id,
@@ -250,8 +269,13 @@ class RecordFirebaseService:
                 "is_active": True
             }
             
-            # Firestore에 저장
-            db.collection('cow_records').document(record_id).set(record_document)
+            # Firestore에 저장 (농장 통계 카운터와 함께 커밋)
+            FarmStatsService.set_with_stats(
+                db.collection('cow_records').document(record_id),
+                record_document,
+                farm_id,
+                FarmStatsService.record_deltas("basic_records", record_document)
+            )
             
             return RecordResponse(
                 id=record_id,
@@ -279,8 +303,20 @@ class RecordFirebaseService:
             )
     
     @staticmethod
-    def get_records_by_cow(cow_id: str, farm_id: str, record_type: Optional[RecordType] = None) -> List[RecordSummary]:
+    def get_records_by_cow(cow_id: str, farm_id: str, record_type: Optional[RecordType] = None, limit: int = 50) -> List[RecordSummary]:
         """특정 젖소의 기록 목록 조회 - 500 오류 해결"""
+        return RecordFirebaseService.get_records_page_by_cow(cow_id, farm_id, record_type, limit)[0]
+    
+    @staticmethod
+    def get_records_page_by_cow(
+        cow_id: str,
+        farm_id: str,
+        record_type: Optional[RecordType] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[RecordSummary], Optional[str]]:
+        """특정 젖소의 기록 목록 페이지 조회 (record_date 내림차순 커서 페이지네이션)"""
+        next_cursor = None
         try:
             db = get_firestore_client()
             
@@ -302,8 +338,8 @@ class RecordFirebaseService:
             if record_type:
                 query = query.where('record_type', '==', record_type.value)
             
-            # 날짜 순으로 정렬 (최신순)
-            records_query = query.order_by('record_date', direction='DESCENDING').get()
+            # 날짜 순으로 정렬 (최신순)하고 커서/제한 적용
+            records_query, next_cursor = paginate_query(query, 'record_date', 'DESCENDING', limit, cursor)
             
             records = []
             for record_doc in records_query:
@@ -324,12 +360,15 @@ class RecordFirebaseService:
                     print(f"[WARNING] 기록 처리 실패 (ID: {record_doc.id}): {str(record_error)}")
                     continue
             
-            return records
+            return records, next_cursor
             
+        except HTTPException:
+            # 잘못된 커서 등 요청 오류는 그대로 전달
+            raise
         except Exception as e:
             # 전체 실패 시에도 빈 배열 반환 (500 오류 방지)
             print(f"[ERROR] 젖소 기록 목록 조회 전체 실패 (cow_id: {cow_id}): {str(e)}")
-            return []
+            return [], None
     
     @staticmethod
     def get_record_detail(record_id: str, farm_id: str) -> RecordResponse:
@@ -384,6 +423,17 @@ class RecordFirebaseService:
     @staticmethod
     def get_all_records_by_farm(farm_id: str, record_type: Optional[RecordType] = None, limit: int = 50) -> List[RecordSummary]:
         """농장의 모든 기록 조회 - 500 오류 해결"""
+        return RecordFirebaseService.get_records_page_by_farm(farm_id, record_type, limit)[0]
+    
+    @staticmethod
+    def get_records_page_by_farm(
+        farm_id: str,
+        record_type: Optional[RecordType] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[RecordSummary], Optional[str]]:
+        """농장 기록 목록 페이지 조회 (record_date 내림차순 커서 페이지네이션)"""
+        next_cursor = None
         try:
             db = get_firestore_client()
             
@@ -394,24 +444,24 @@ class RecordFirebaseService:
             if record_type:
                 query = query.where('record_type', '==', record_type.value)
             
-            # 날짜 순으로 정렬하고 제한
-            records_query = query.order_by('record_date', direction='DESCENDING').limit(limit).get()
+            # 날짜 순으로 정렬하고 커서/제한 적용
+            records_query, next_cursor = paginate_query(query, 'record_date', 'DESCENDING', limit, cursor)
+            
+            # 젖소 정보는 한 번의 배치 조회로 가져옴
+            cow_loader = CowLoader(farm_id, db).prime(
+                record_doc.to_dict().get("cow_id") for record_doc in records_query
+            )
             
             records = []
             for record_doc in records_query:
                 try:
                     record_data = record_doc.to_dict()
                     
-                    # 젖소 정보 안전하게 조회
-                    cow_info = None
-                    try:
-                        cow_info = RecordFirebaseService._get_cow_info(record_data.get("cow_id", ""), farm_id)
-                    except:
-                        # 젖소 정보 조회 실패 시 기본값 사용
-                        cow_info = {
-                            "name": "알 수 없음",
-                            "ear_tag_number": "N/A"
-                        }
+                    # 젖소 정보 안전하게 조회 (실패 시 기본값 사용)
+                    cow_info = cow_loader.get(record_data.get("cow_id", "")) or {
+                        "name": "알 수 없음",
+                        "ear_tag_number": "N/A"
+                    }
                     
                     records.append(RecordSummary(
                         id=record_data.get("id", ""),
@@ -428,12 +478,15 @@ class RecordFirebaseService:
                     print(f"[WARNING] 농장 기록 처리 실패 (ID: {record_doc.id}): {str(record_error)}")
                     continue
             
-            return records
+            return records, next_cursor
             
+        except HTTPException:
+            # 잘못된 커서 등 요청 오류는 그대로 전달
+            raise
         except Exception as e:
             # 전체 실패 시에도 빈 배열 반환 (500 오류 방지)
             print(f"[ERROR] 농장 기록 목록 조회 전체 실패 (farm_id: {farm_id}): {str(e)}")
-            return []
+            return [], None
     
     @staticmethod
     def update_record(record_id: str, record_update: RecordUpdate, user: Dict) -> RecordResponse:
@@ -485,11 +538,11 @@ class RecordFirebaseService:
             existing_record = RecordFirebaseService.get_record_detail(record_id, farm_id)
             
             # 소프트 삭제
-            db.collection('cow_records').document(record_id).update({
+            FarmStatsService.update_record_with_stats('cow_records', "basic_records", record_id, {
                 "is_active": False,
                 "updated_at": datetime.utcnow(),
                 "deleted_at": datetime.utcnow()
-            })
+            }, farm_id)
             
             return {
                 "message": f"기록 '{existing_record.title}'이 삭제되었습니다",
@@ -507,19 +560,10 @@ class RecordFirebaseService:
     @staticmethod
     def _get_cow_info(cow_id: str, farm_id: str) -> Dict:
         """젖소 정보 조회 (내부 사용)"""
-        db = get_firestore_client()
-        cow_doc = db.collection('cows').document(cow_id).get()
-        
-        if not cow_doc.exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="젖소를 찾을 수 없습니다"
-            )
-        
-        cow_data = cow_doc.to_dict()
+        # 농장별 디렉터리 캐시에서 조회 (다른 농장 젖소는 조회되지 않음)
+        cow_data = cow_directory_cache.get(farm_id, cow_id)
         
-        # 농장 ID 확인 (보안)
-        if cow_data.get("farm_id") != farm_id or not cow_data.get("is_active", True):
+        if not cow_data or not cow_data.get("is_active", True):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="젖소를 찾을 수 없습니다"
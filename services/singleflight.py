@@ -0,0 +1,48 @@
+# services/singleflight.py
+
+from typing import Awaitable, Callable, Dict, Hashable
+import asyncio
+
+
+class SingleFlight:
+    """
+    동일 키 동시 요청 합치기 (singleflight)
+
+    - 같은 키로 진행 중인 요청이 있으면 새로 호출하지 않고 그 결과를 함께 기다린다
+    - 요청은 별도 태스크로 실행되므로 먼저 호출한 쪽이 취소되어도 나머지는 결과를 받는다
+    - 결과는 보관하지 않는다 (완료 즉시 키 제거, 캐시는 호출 측에서 처리)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """키 단위로 fn()을 한 번만 실행하고 결과를 공유"""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict:
+        """합쳐진 요청 수 통계"""
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / self.calls, 4) if self.calls else 0.0
+        }
+
+
+# 축산물이력제 (이표번호, optionNo) 조회용
+livestock_trace_flight = SingleFlight("livestock_trace")
@@ -8,6 +8,10 @@ from datetime import datetime
 import firebase_admin
 from firebase_admin import auth, credentials
 from config.firebase_config import get_firestore_client
+from services.cow_directory_cache import cow_directory_cache
+from services.farm_stats_service import FarmStatsService
+from services.bulk_delete import delete_query
+from services.auth_user_cache import auth_user_cache
 import uuid
 
 class SNSAuthService:
@@ -121,16 +125,21 @@ class SNSAuthService:
                 'cow_records', 'cow_detailed_records', 'cows', 'refresh_tokens'
             ]
             
+            deleted_counts = {}
             for collection_name in collections_to_delete:
-                docs = db.collection(collection_name).where('farm_id', '==', farm_id).get()
-                for doc in docs:
-                    doc.reference.delete()
+                deleted_counts[collection_name] = delete_query(
+                    db.collection(collection_name).where('farm_id', '==', farm_id),
+                    label=collection_name
+                )["deleted"]
             
             # 사용자 문서 삭제
             db.collection('users').document(user_id).delete()
+            auth_user_cache.invalidate_user(user)
             
             # 목장 문서 삭제
             db.collection('farms').document(farm_id).delete()
+            cow_directory_cache.invalidate(farm_id)
+            FarmStatsService.delete_farm_stats(farm_id)
             
             return {
                 "success": True,
@@ -139,7 +148,8 @@ class SNSAuthService:
                 "deleted_data": {
                     "user_id": user_id,
                     "farm_id": farm_id,
-                    "sns_provider": sns_provider
+                    "sns_provider": sns_provider,
+                    "deleted_counts": deleted_counts
                 }
             }
             
@@ -5,6 +5,7 @@ import json
 from typing import Optional, Dict, List
 from fastapi import HTTPException, status
 from schemas.user import AuthType, SocialUserInfo
+from services.http_clients import http_clients
 import os
 
 class SocialAuthService:
@@ -15,29 +16,28 @@ class SocialAuthService:
         """구글 사용자 정보 조회"""
         try:
             # Google People API 사용
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://www.googleapis.com/oauth2/v2/userinfo",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    timeout=10.0
-                )
-                
-                if response.status_code != 200:
-                    print(f"[ERROR] 구글 API 응답 오류: {response.status_code} - {response.text}")
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="구글 액세스 토큰이 유효하지 않습니다"
-                    )
-                
-                user_data = response.json()
-                
-                print(f"[INFO] 구글 사용자 정보 조회 성공: {user_data.get('email')}")
-                
-                return SocialUserInfo(
-                    social_id=user_data.get("id"),
-                    email=user_data.get("email"),
-                    name=user_data.get("name")
+            response = await http_clients.get(
+                "google",
+                "https://www.googleapis.com/oauth2/v2/userinfo",
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            
+            if response.status_code != 200:
+                print(f"[ERROR] 구글 API 응답 오류: {response.status_code} - {response.text}")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="구글 액세스 토큰이 유효하지 않습니다"
                 )
+            
+            user_data = response.json()
+            
+            print(f"[INFO] 구글 사용자 정보 조회 성공: {user_data.get('email')}")
+            
+            return SocialUserInfo(
+                social_id=user_data.get("id"),
+                email=user_data.get("email"),
+                name=user_data.get("name")
+            )
                 
         except httpx.TimeoutException:
             print("[ERROR] 구글 API 호출 타임아웃")
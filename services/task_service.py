@@ -1,9 +1,12 @@
 # services/task_service.py
 
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from fastapi import HTTPException, status
 from config.firebase_config import get_firestore_client
+from services.cow_loader import CowLoader
+from services.cow_directory_cache import cow_directory_cache
+from services.pagination import paginate_query
 from schemas.task import *
 import uuid
 
@@ -89,17 +92,41 @@ class TaskService:
         limit: int = 50
     ) -> List[TaskSummary]:
         """할일 목록 조회"""
+        return TaskService.get_tasks_page(
+            user, status_filter, priority_filter, category_filter, cow_id_filter, limit
+        )[0]
+    
+    @staticmethod
+    def get_tasks_page(
+        user: Dict, 
+        status_filter: Optional[TaskStatus] = None,
+        priority_filter: Optional[TaskPriority] = None,
+        category_filter: Optional[TaskCategory] = None,
+        cow_id_filter: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[TaskSummary], Optional[str]]:
+        """
+        할일 목록 페이지 조회 (created_at 내림차순 커서 페이지네이션)
+        
+        필터는 조회한 페이지 안에서 적용되므로 한 페이지의 결과가 limit보다 적을 수 있음
+        """
         try:
             db = get_firestore_client()
             farm_id = user.get("farm_id")
             
             # 기본 쿼리 - 단순화
-            query = (db.collection('tasks')
-                    .where('farm_id', '==', farm_id)
-                    .where('is_active', '==', True)
-                    .order_by('created_at', direction='DESCENDING')
-                    .limit(limit)
-                    .get())
+            query, next_cursor = paginate_query(
+                db.collection('tasks')
+                  .where('farm_id', '==', farm_id)
+                  .where('is_active', '==', True),
+                'created_at', 'DESCENDING', limit, cursor
+            )
+            
+            # 관련 젖소 정보는 한 번의 배치 조회로 가져옴
+            cow_loader = CowLoader(farm_id, db).prime(
+                task_doc.to_dict().get('related_cow_id') for task_doc in query
+            )
             
             tasks = []
             current_time = datetime.utcnow()
@@ -132,11 +159,8 @@ class TaskService:
                 # 젖소 정보 조회
                 cow_name = None
                 if task_data.get('related_cow_id'):
-                    try:
-                        cow_info = TaskService._get_cow_info(task_data['related_cow_id'], farm_id)
-                        cow_name = cow_info['name']
-                    except:
-                        cow_name = "삭제된 젖소"
+                    cow_info = cow_loader.get(task_data['related_cow_id'])
+                    cow_name = cow_info['name'] if cow_info else "삭제된 젖소"
                 
                 tasks.append(TaskSummary(
                     id=task_data["id"],
@@ -152,7 +176,7 @@ class TaskService:
                     created_at=task_data["created_at"]
                 ))
             
-            return tasks
+            return tasks, next_cursor
             
         except Exception as e:
             if isinstance(e, HTTPException):
@@ -177,6 +201,11 @@ class TaskService:
                           .where('is_active', '==', True)
                           .get())
             
+            # 관련 젖소 정보는 한 번의 배치 조회로 가져옴
+            cow_loader = CowLoader(farm_id, db).prime(
+                task_doc.to_dict().get('related_cow_id') for task_doc in tasks_query
+            )
+            
             tasks = []
             for task_doc in tasks_query:
                 task_data = task_doc.to_dict()
@@ -188,11 +217,8 @@ class TaskService:
                 # 젖소 정보 조회
                 cow_name = None
                 if task_data.get('related_cow_id'):
-                    try:
-                        cow_info = TaskService._get_cow_info(task_data['related_cow_id'], farm_id)
-                        cow_name = cow_info['name']
-                    except:
-                        cow_name = "삭제된 젖소"
+                    cow_info = cow_loader.get(task_data['related_cow_id'])
+                    cow_name = cow_info['name'] if cow_info else "삭제된 젖소"
                 
                 tasks.append(TaskSummary(
                     id=task_data["id"],
@@ -232,44 +258,48 @@ class TaskService:
                           .where('is_active', '==', True)
                           .get())
             
-            overdue_tasks = []
+            # 지연 체크 - 클라이언트 사이드에서 필터링
+            overdue_list = []
             for task_doc in tasks_query:
                 task_data = task_doc.to_dict()
-                
-                # 지연 체크 - 클라이언트 사이드에서 필터링
                 if (task_data.get('due_datetime') and 
                     task_data['due_datetime'] < current_time and
                     task_data['status'] in [TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value, TaskStatus.OVERDUE.value]):
-                    
-                    # 상태 업데이트
-                    if task_data['status'] != TaskStatus.OVERDUE.value:
-                        db.collection('tasks').document(task_data['id']).update({
-                            'status': TaskStatus.OVERDUE.value,
-                            'updated_at': current_time
-                        })
-                    
-                    # 젖소 정보 조회
-                    cow_name = None
-                    if task_data.get('related_cow_id'):
-                        try:
-                            cow_info = TaskService._get_cow_info(task_data['related_cow_id'], farm_id)
-                            cow_name = cow_info['name']
-                        except:
-                            cow_name = "삭제된 젖소"
-                    
-                    overdue_tasks.append(TaskSummary(
-                        id=task_data["id"],
-                        title=task_data["title"],
-                        task_type=TaskType(task_data["task_type"]),
-                        priority=TaskPriority(task_data["priority"]),
-                        status=TaskStatus.OVERDUE,
-                        due_date=task_data.get("due_date"),
-                        due_time=task_data.get("due_time"),
-                        category=TaskCategory(task_data["category"]),
-                        related_cow_name=cow_name,
-                        is_overdue=True,
-                        created_at=task_data["created_at"]
-                    ))
+                    overdue_list.append(task_data)
+            
+            # 관련 젖소 정보는 한 번의 배치 조회로 가져옴
+            cow_loader = CowLoader(farm_id, db).prime(
+                task_data.get('related_cow_id') for task_data in overdue_list
+            )
+            
+            overdue_tasks = []
+            for task_data in overdue_list:
+                # 상태 업데이트
+                if task_data['status'] != TaskStatus.OVERDUE.value:
+                    db.collection('tasks').document(task_data['id']).update({
+                        'status': TaskStatus.OVERDUE.value,
+                        'updated_at': current_time
+                    })
+                
+                # 젖소 정보 조회
+                cow_name = None
+                if task_data.get('related_cow_id'):
+                    cow_info = cow_loader.get(task_data['related_cow_id'])
+                    cow_name = cow_info['name'] if cow_info else "삭제된 젖소"
+                
+                overdue_tasks.append(TaskSummary(
+                    id=task_data["id"],
+                    title=task_data["title"],
+                    task_type=TaskType(task_data["task_type"]),
+                    priority=TaskPriority(task_data["priority"]),
+                    status=TaskStatus.OVERDUE,
+                    due_date=task_data.get("due_date"),
+                    due_time=task_data.get("due_time"),
+                    category=TaskCategory(task_data["category"]),
+                    related_cow_name=cow_name,
+                    is_overdue=True,
+                    created_at=task_data["created_at"]
+                ))
             
             # 마감일시 순으로 정렬
             overdue_tasks.sort(key=lambda x: x.due_date or "9999-12-31")
@@ -536,18 +566,10 @@ class TaskService:
     @staticmethod
     def _get_cow_info(cow_id: str, farm_id: str) -> Dict:
         """젖소 정보 조회 (내부 사용)"""
-        db = get_firestore_client()
-        cow_doc = db.collection('cows').document(cow_id).get()
-        
-        if not cow_doc.exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="젖소를 찾을 수 없습니다"
-            )
-        
-        cow_data = cow_doc.to_dict()
+        # 농장별 디렉터리 캐시에서 조회 (다른 농장 젖소는 조회되지 않음)
+        cow_data = cow_directory_cache.get(farm_id, cow_id)
         
-        if cow_data.get("farm_id") != farm_id or not cow_data.get("is_active", True):
+        if not cow_data or not cow_data.get("is_active", True):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="젖소를 찾을 수 없습니다"
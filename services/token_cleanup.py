@@ -0,0 +1,152 @@
+# services/token_cleanup.py
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from config.firebase_config import get_firestore_client
+from services.bulk_delete import BATCH_LIMIT, MAX_PARALLEL_COMMITS, delete_refs
+import time
+
+# 사용자당 유지할 활성 리프레시 토큰 수
+MAX_TOKENS_PER_USER = 5
+# 한 번에 읽는 토큰 수
+SCAN_PAGE_SIZE = 1000
+# 정리 작업 체크포인트 문서 (maintenance_checkpoints/{작업 이름})
+CHECKPOINT_COLLECTION = 'maintenance_checkpoints'
+CHECKPOINT_ID = 'refresh_token_count_cleanup'
+
+
+class TokenCountCleanup:
+    """
+    사용자별 오래된 리프레시 토큰 정리 (사용자당 최신 N개만 유지)
+
+    - 토큰을 user_id 오름차순, created_at 내림차순으로 한 번만 훑으면서
+      사용자별로 활성 토큰이 N개를 넘으면 나머지를 삭제 대상으로 모아 배치로 삭제한다
+      (is_active 필드가 없는 예전 토큰도 활성으로 취급 - is_active == True 필터를 쓰지 않는 이유)
+    - 페이지마다 마지막으로 처리를 마친 user_id를 체크포인트로 기록하여
+      중단되면 다음 실행 때 그 다음 사용자부터 이어서 처리한다
+    - 삭제 배치가 실패하면 그 뒤로는 체크포인트를 앞으로 옮기지 않고 남겨 두어
+      다음 실행 때 실패한 사용자부터 다시 처리한다
+    """
+
+    def __init__(self, keep: int = MAX_TOKENS_PER_USER, page_size: int = SCAN_PAGE_SIZE, db=None):
+        self.keep = keep
+        self.page_size = page_size
+        self.db = db or get_firestore_client()
+        self.checkpoint_ref = self.db.collection(CHECKPOINT_COLLECTION).document(CHECKPOINT_ID)
+
+    def run(self, resume: bool = True) -> Dict:
+        """
+        정리 실행
+
+        Returns:
+            {"scanned", "deleted", "failed", "users", "resumed_from", "elapsed_seconds", "tokens_per_second"}
+        """
+        started = time.monotonic()
+        resumed_from = self._load_checkpoint() if resume else None
+        if resumed_from:
+            print(f"[INFO] 토큰 정리 체크포인트에서 재개 (user_id > {resumed_from})")
+
+        query = self.db.collection('refresh_tokens')
+        if resumed_from:
+            query = query.where('user_id', '>', resumed_from)
+        query = (query.order_by('user_id')
+                 .order_by('created_at', direction='DESCENDING')
+                 .select(['user_id', 'created_at', 'is_active']))
+
+        report = {"scanned": 0, "deleted": 0, "failed": 0, "users": 0, "resumed_from": resumed_from}
+        current_user: Optional[str] = None
+        completed_user: Optional[str] = resumed_from
+        kept = 0
+        pending: List = []
+        last_doc = None
+        # 삭제 실패가 생기면 이후 체크포인트를 옮기지 않음 (실패한 사용자를 건너뛰지 않도록)
+        checkpoint_frozen = False
+
+        while True:
+            page_query = query.start_after(last_doc) if last_doc else query
+            docs = list(page_query.limit(self.page_size).stream())
+            if not docs:
+                break
+
+            for token_doc in docs:
+                user_id = token_doc.get('user_id')
+                if user_id != current_user:
+                    # 사용자 경계: 이전 사용자 처리 완료
+                    if current_user is not None:
+                        completed_user = current_user
+                    current_user = user_id
+                    kept = 0
+                    report["users"] += 1
+
+                # 비활성 토큰은 개수에 넣지 않고 그대로 둠 (필드가 없으면 활성)
+                if token_doc.to_dict().get('is_active', True) is False:
+                    continue
+                kept += 1
+                if kept > self.keep:
+                    pending.append(token_doc.reference)
+
+            report["scanned"] += len(docs)
+            last_doc = docs[-1]
+
+            if len(pending) >= BATCH_LIMIT * MAX_PARALLEL_COMMITS:
+                if not self._flush(pending, report):
+                    checkpoint_frozen = True
+                pending = []
+
+            # 삭제 대상이 모두 커밋된 뒤에만 체크포인트 기록 (재개 시 누락 방지)
+            if not pending and completed_user and not checkpoint_frozen:
+                self._save_checkpoint(completed_user, report)
+
+            if len(docs) < self.page_size:
+                break
+
+        self._flush(pending, report)
+        if report["failed"]:
+            # 마지막으로 모두 커밋된 사용자까지의 체크포인트를 남겨 다음 실행에서 재시도
+            print(f"[WARNING] 토큰 정리 중 {report['failed']}개 삭제 실패 - 체크포인트 유지")
+        else:
+            self._clear_checkpoint()
+
+        elapsed = time.monotonic() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["tokens_per_second"] = round(report["scanned"] / elapsed, 1) if elapsed > 0 else 0.0
+        print(f"[INFO] 토큰 정리 완료: {report['scanned']}개 확인, {report['deleted']}개 삭제, "
+              f"{report['users']}명, {report['tokens_per_second']}개/초")
+        return report
+
+    def _flush(self, refs: List, report: Dict) -> bool:
+        """모아 둔 삭제 대상 배치 삭제 (모두 커밋되었으면 True)"""
+        if not refs:
+            return True
+        result = delete_refs(refs, label="old refresh_tokens", db=self.db)
+        report["deleted"] += result["deleted"]
+        report["failed"] += result["failed"]
+        return result["failed"] == 0
+
+    def _load_checkpoint(self) -> Optional[str]:
+        """중단된 작업의 마지막 처리 완료 user_id"""
+        try:
+            snapshot = self.checkpoint_ref.get()
+            return snapshot.to_dict().get("last_user_id") if snapshot.exists else None
+        except Exception as e:
+            print(f"[WARNING] 토큰 정리 체크포인트 조회 실패: {str(e)}")
+            return None
+
+    def _save_checkpoint(self, last_user_id: str, report: Dict) -> None:
+        """체크포인트 기록 (실패해도 정리는 계속 진행)"""
+        try:
+            self.checkpoint_ref.set({
+                "last_user_id": last_user_id,
+                "scanned": report["scanned"],
+                "deleted": report["deleted"],
+                "updated_at": datetime.utcnow()
+            })
+        except Exception as e:
+            print(f"[WARNING] 토큰 정리 체크포인트 기록 실패: {str(e)}")
+
+    def _clear_checkpoint(self) -> None:
+        """정상 완료 시 체크포인트 삭제"""
+        try:
+            self.checkpoint_ref.delete()
+        except Exception as e:
+            print(f"[WARNING] 토큰 정리 체크포인트 삭제 실패: {str(e)}")